@@ -0,0 +1,153 @@
+"""
+MPFM Monitor - Pool de conexões SQLite
+Conexões reutilizadas entre requests, com PRAGMAs de desempenho e pools
+separados para leitura e escrita.
+
+Com journal_mode=WAL leitores não bloqueiam no escritor (e vice-versa);
+a escrita continua serializada pelo SQLite, e busy_timeout faz o
+escritor concorrente esperar em vez de falhar com "database is locked".
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+DEFAULT_PRAGMAS = {
+    'synchronous': 'NORMAL',        # seguro com WAL; fsync só no checkpoint
+    'cache_size': -64 * 1024,       # KiB (negativo) por conexão
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,           # ms
+    'temp_store': 'MEMORY',
+}
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class ConnectionPool:
+    """
+    Pool limitado de conexões SQLite.
+    
+    Cada thread volta a receber a mesma conexão enquanto ela estiver
+    livre (afinidade), o que mantém o cache de páginas e de statements
+    quente para o threadpool do FastAPI. Sem conexão livre e com o pool
+    no limite, `checkout` espera até `timeout` segundos.
+    
+    Com readonly=True as conexões abrem em mode=ro e query_only, de modo
+    que um endpoint de leitura não consegue escrever por engano.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4, readonly: bool = False,
+                 pragmas: Optional[Dict[str, Any]] = None, timeout: float = 30.0):
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.readonly = readonly
+        self.pragmas = dict(DEFAULT_PRAGMAS, **(pragmas or {}))
+        self.timeout = timeout
+        
+        self._idle: List[sqlite3.Connection] = []
+        self._all: List[sqlite3.Connection] = []
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._closed = False
+        
+        self._checkouts = 0
+        self._affinity_hits = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self.readonly:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA query_only=1")
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def checkout(self) -> sqlite3.Connection:
+        """Obtém uma conexão (devolver com `checkin`)."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Pool de conexões fechado")
+            
+            preferred = getattr(self._local, 'conn', None)
+            if preferred is not None and preferred in self._idle:
+                self._idle.remove(preferred)
+                self._checkouts += 1
+                self._affinity_hits += 1
+                return preferred
+            
+            if not self._idle and len(self._all) >= self.size:
+                self._waits += 1
+                start = time.perf_counter()
+                ready = self._cond.wait_for(lambda: self._idle or self._closed, self.timeout)
+                self._wait_time += time.perf_counter() - start
+                if not ready or self._closed:
+                    self._timeouts += 1
+                    raise TimeoutError(f"Nenhuma conexão livre em {self.timeout}s")
+            
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = self._connect()
+                self._all.append(conn)
+            
+            self._checkouts += 1
+            self._local.conn = conn
+            return conn
+    
+    def checkin(self, conn: sqlite3.Connection):
+        """Devolve a conexão; transação deixada aberta é desfeita."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._cond:
+            if self._closed:
+                conn.close()
+                return
+            self._idle.append(conn)
+            self._cond.notify()
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Métricas do pool (expostas em /api/health)."""
+        with self._cond:
+            return {
+                'mode': 'ro' if self.readonly else 'rw',
+                'size': self.size,
+                'open': len(self._all),
+                'idle': len(self._idle),
+                'in_use': len(self._all) - len(self._idle),
+                'checkouts': self._checkouts,
+                'affinity_hits': self._affinity_hits,
+                'waits': self._waits,
+                'wait_time_ms': round(self._wait_time * 1000, 1),
+                'timeouts': self._timeouts,
+            }
+    
+    def close(self):
+        """Fecha as conexões livres; as em uso fecham ao serem devolvidas."""
+        with self._cond:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._cond.notify_all()
@@ -0,0 +1,167 @@
+"""
+MPFM Monitor - Barramento de eventos (server-sent events)
+Pub/sub em processo que leva alterações de alertas e progresso de uploads
+aos clientes conectados em /api/events, no lugar do polling de
+/api/alerts/active e /api/jobs/{job_id}.
+
+`publish` pode ser chamado de qualquer thread (endpoints síncronos rodam
+no threadpool, os uploads nas threads da fila); cada assinante tem uma
+fila no event loop do seu request e recebe o evento via
+call_soon_threadsafe. Assinante que acumula mais de `max_queue` eventos
+é desconectado: o EventSource reconecta com Last-Event-ID e os eventos
+perdidos são reenviados a partir do histórico (últimos `history`).
+"""
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+# ============================================================================
+# EVENTOS
+# ============================================================================
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: str          # JSON já serializado (uma vez por evento, não por cliente)
+    
+    def encode(self) -> bytes:
+        """Mensagem SSE (id, event, data)."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n".encode('utf-8')
+
+
+def sse_message(event_type: str, content: Any) -> bytes:
+    """Mensagem SSE sem id (não entra no histórico nem no Last-Event-ID)."""
+    data = json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(',', ':'))
+    return f"event: {event_type}\ndata: {data}\n\n".encode('utf-8')
+
+
+# ============================================================================
+# ASSINATURA
+# ============================================================================
+
+class Subscription:
+    """Fila de um cliente SSE, consumida no event loop do request."""
+    
+    def __init__(self, bus: "EventBus", loop: asyncio.AbstractEventLoop, max_queue: int):
+        self._bus = bus
+        self._loop = loop
+        self._queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue()
+        self._max_queue = max_queue
+        self.backlog: List[Event] = []
+        self.gap = False
+        self.overflowed = False
+    
+    def _offer(self, event: Event):
+        # Executa no event loop do assinante
+        if self.overflowed:
+            return
+        if self._queue.qsize() >= self._max_queue:
+            self.overflowed = True
+            self._queue.put_nowait(None)
+            return
+        self._queue.put_nowait(event)
+    
+    def deliver(self, event: Event):
+        """Chamado por `publish`, de qualquer thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            # Event loop já encerrado: o request terminou sem cancelar a assinatura
+            self._bus.unsubscribe(self)
+    
+    async def next(self, timeout: float) -> Optional[Event]:
+        """
+        Próximo evento ou None se nada chegar em `timeout` segundos.
+        
+        Raises:
+            OverflowError: assinante lento, eventos descartados
+        """
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            raise OverflowError("Assinante não acompanhou os eventos")
+        return event
+    
+    def close(self):
+        self._bus.unsubscribe(self)
+
+
+# ============================================================================
+# BARRAMENTO
+# ============================================================================
+
+class EventBus:
+    """Publicação numerada com histórico curto para reenvio (Last-Event-ID)."""
+    
+    def __init__(self, max_queue: int = 256, history: int = 500):
+        self.max_queue = max_queue
+        self._history: "deque[Event]" = deque(maxlen=max(1, history))
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._published = 0
+        self._overflows = 0
+        self._replayed = 0
+    
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+    
+    def publish(self, event_type: str, content: Any) -> int:
+        """Publica um evento para todos os assinantes. Retorna o id."""
+        data = json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, data)
+            self._history.append(event)
+            self._published += 1
+            subscribers = list(self._subscribers)
+        
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event.id
+    
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Registra um assinante no event loop atual.
+        
+        Com `last_event_id`, `backlog` traz os eventos posteriores ainda no
+        histórico; se parte deles já saiu do histórico (ou o id é de outro
+        processo), `gap` indica que o cliente deve recarregar o estado.
+        """
+        subscription = Subscription(self, asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                oldest = self._history[0].id if self._history else self._last_id + 1
+                subscription.gap = last_event_id > self._last_id or last_event_id < oldest - 1
+                if not subscription.gap:
+                    subscription.backlog = [e for e in self._history if e.id > last_event_id]
+                    self._replayed += len(subscription.backlog)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription.overflowed and subscription in self._subscribers:
+                self._overflows += 1
+            self._subscribers.discard(subscription)
+    
+    def stats(self) -> Dict[str, int]:
+        """Métricas do barramento (expostas em /api/health)."""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'last_id': self._last_id,
+                'published': self._published,
+                'history': len(self._history),
+                'replayed': self._replayed,
+                'overflows': self._overflows,
+            }
@@ -0,0 +1,363 @@
+"""
+MPFM Monitor - Exportação em lote
+Exporta períodos de fact_mpfm_production, fact_reconciliation_daily e
+cross_validation como CSV, Parquet ou Arrow IPC, lendo o SQLite em blocos
+de `chunk_rows` linhas: cada bloco vira um pedaço do CSV ou um row group
+(Parquet) / record batch (Arrow) e é descartado antes do próximo, de modo
+que exportações de anos não carregam o resultado inteiro em memória.
+
+Parquet/Arrow exigem pyarrow (opcional, backend/requirements-optional.txt);
+CSV usa só a biblioteca padrão. O schema colunar vem dos tipos declarados
+no SQLite; como o SQLite aceita tipos mistos numa coluna, valores que não
+batem com o tipo declarado são convertidos (ex.: '12.5' numa coluna REAL)
+e, se a conversão não for possível, exportados como nulo.
+
+Uso:
+    python -m backend.exporter range fact_mpfm_production 2024-01-01 2025-12-31 -f parquet -o prod.parquet
+    python -m backend.exporter daily-report 2025-01-15 -f excel -o relatorio.xlsx
+"""
+import io
+import os
+import csv
+import sys
+import sqlite3
+import zipfile
+import argparse
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# ============================================================================
+# CONFIGURAÇÃO
+# ============================================================================
+
+EXPORT_CHUNK_ROWS = int(os.environ.get("EXPORT_CHUNK_ROWS", "10000"))
+
+# Tabela -> (coluna de data, coluna de asset) usadas no filtro e na ordenação
+EXPORT_TABLES = {
+    'fact_mpfm_production': ('business_date', 'asset_tag'),
+    'fact_reconciliation_daily': ('business_date', 'asset_tag'),
+    'cross_validation': ('date_ref', 'asset_tag'),
+}
+
+# Formato -> (media type, extensão)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+
+# Tipo declarado no SQLite -> tipo Arrow (demais: string)
+ARROW_TYPES = {
+    'INTEGER': 'int64',
+    'REAL': 'float64',
+    'DATE': 'date32',
+}
+
+
+class ExportError(Exception):
+    """Parâmetros de exportação inválidos ou dependência ausente."""
+
+
+# ============================================================================
+# LEITURA EM BLOCOS
+# ============================================================================
+
+def range_query(table: str, start: date, end: date,
+                asset_tag: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """SELECT do período, na ordem do índice (data, asset)."""
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"Tabela não exportável: {table}")
+    
+    date_col, asset_col = EXPORT_TABLES[table]
+    query = f"SELECT * FROM {table} WHERE {date_col} BETWEEN ? AND ?"
+    params = [start.isoformat(), end.isoformat()]
+    if asset_tag:
+        query += f" AND {asset_col} = ?"
+        params.append(asset_tag)
+    query += f" ORDER BY {date_col}, {asset_col}, rowid"
+    return query, params
+
+
+def iter_chunks(conn: sqlite3.Connection, query: str, params: List[Any],
+                chunk_rows: int = EXPORT_CHUNK_ROWS) -> Tuple[List[str], Iterator[List[tuple]]]:
+    """Colunas do resultado e gerador de blocos de até `chunk_rows` linhas."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    columns = [d[0] for d in cursor.description]
+    
+    def chunks():
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+    
+    return columns, chunks()
+
+
+# ============================================================================
+# CSV
+# ============================================================================
+
+def iter_csv(columns: List[str], chunks: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """Cabeçalho e depois um pedaço de CSV (UTF-8) por bloco."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+# ============================================================================
+# PARQUET / ARROW
+# ============================================================================
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Destino de escrita drenável para streaming.
+    
+    O escritor Parquet grava offsets absolutos no rodapé, então tell()
+    conta todos os bytes já escritos mesmo depois de `drain`.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self._parts: List[bytes] = []
+        self._written = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._written += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._written
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def arrow_schema(conn: sqlite3.Connection, table: str, columns: List[str]):
+    """Schema Arrow a partir dos tipos declarados da tabela."""
+    declared = {row[1]: (row[2] or '').upper() for row in conn.execute(f"PRAGMA table_info({table})")}
+    fields = []
+    for column in columns:
+        type_name = ARROW_TYPES.get(declared.get(column, ''), 'string')
+        fields.append(pa.field(column, getattr(pa, type_name)()))
+    return pa.schema(fields)
+
+
+def _coerce(value: Any, arrow_type) -> Any:
+    """Valor convertido para o tipo Arrow da coluna, ou None se impossível."""
+    if value is None:
+        return None
+    try:
+        if pa.types.is_integer(arrow_type):
+            number = float(value)
+            return int(number) if number.is_integer() else None
+        if pa.types.is_floating(arrow_type):
+            return float(value)
+        if pa.types.is_date32(arrow_type):
+            return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def _column_array(values: tuple, field):
+    try:
+        if pa.types.is_date32(field.type):
+            return pa.array(values, pa.string()).cast(field.type)
+        return pa.array(values, field.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError, OverflowError):
+        # Tipos mistos na coluna (SQLite): converte valor a valor, sem
+        # interromper uma resposta que já começou a ser enviada
+        return pa.array([_coerce(v, field.type) for v in values], field.type)
+
+
+def _record_batch(schema, rows: List[tuple]):
+    arrays = [_column_array(values, field) for field, values in zip(schema, zip(*rows))]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_columnar(conn: sqlite3.Connection, table: str, columns: List[str],
+                  chunks: Iterator[List[tuple]], format: str) -> Iterator[bytes]:
+    """Parquet (um row group por bloco) ou Arrow IPC (um record batch por bloco)."""
+    if pa is None:
+        raise ExportError("Exportação Parquet/Arrow requer pyarrow (pip install pyarrow)")
+    
+    schema = arrow_schema(conn, table, columns)
+    sink = _ChunkSink()
+    if format == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+        write = writer.write_batch
+    
+    try:
+        for rows in chunks:
+            write(_record_batch(schema, rows))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    
+    yield sink.drain()
+
+
+# ============================================================================
+# EXPORTAÇÃO
+# ============================================================================
+
+def validate_export(table: str, start: date, end: date, format: str):
+    """ExportError se a exportação não puder ser feita."""
+    if table not in EXPORT_TABLES:
+        raise ExportError(f"Tabela não exportável: {table}")
+    if format not in EXPORT_FORMATS:
+        raise ExportError(f"Formato não suportado: {format}")
+    if format != 'csv' and pa is None:
+        raise ExportError("Exportação Parquet/Arrow requer pyarrow (pip install pyarrow)")
+    if start > end:
+        raise ExportError("start_date posterior a end_date")
+
+
+def export_range(conn: sqlite3.Connection, table: str, start: date, end: date,
+                 format: str = 'csv', asset_tag: Optional[str] = None,
+                 chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Exporta um período de `table` no formato pedido, em pedaços de bytes.
+    
+    Valida parâmetros e dependências antes de retornar o gerador, para
+    que o erro chegue a quem chama (e não no meio do streaming).
+    """
+    validate_export(table, start, end, format)
+    query, params = range_query(table, start, end, asset_tag)
+    columns, chunks = iter_chunks(conn, query, params, chunk_rows)
+    
+    if format == 'csv':
+        return iter_csv(columns, chunks)
+    return iter_columnar(conn, table, columns, chunks, format)
+
+
+def daily_report_sections(conn: sqlite3.Connection, date_ref: date) -> Dict[str, Tuple[List[str], List[tuple]]]:
+    """Medições, validações e alertas de um dia: {seção: (colunas, linhas)}."""
+    day = date_ref.isoformat()
+    next_day = date.fromordinal(date_ref.toordinal() + 1).isoformat()
+    queries = {
+        'measurements': ("SELECT * FROM daily_measurement WHERE date = ?", (day,)),
+        'validations': ("SELECT * FROM cross_validation WHERE date_ref = ?", (day,)),
+        'alerts': ("SELECT * FROM alert WHERE timestamp >= ? AND timestamp < ?", (day, next_day)),
+    }
+    
+    sections = {}
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    for name, (query, params) in queries.items():
+        cursor.execute(query, params)
+        sections[name] = ([d[0] for d in cursor.description], cursor.fetchall())
+    return sections
+
+
+def daily_report_file(sections: Dict[str, Tuple[List[str], List[tuple]]], format: str) -> bytes:
+    """Relatório diário como ZIP de CSVs (uma seção por arquivo) ou XLSX (uma aba por seção)."""
+    output = io.BytesIO()
+    
+    if format == 'csv':
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for name, (columns, rows) in sections.items():
+                zf.writestr(f"{name}.csv", b"".join(iter_csv(columns, iter([rows]))))
+    elif format == 'excel':
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        for name, (columns, rows) in sections.items():
+            sheet = workbook.create_sheet(title=name)
+            sheet.append(columns)
+            for row in rows:
+                sheet.append(list(row))
+        workbook.save(output)
+    else:
+        raise ExportError(f"Formato não suportado: {format}")
+    
+    return output.getvalue()
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportação de dados do MPFM Monitor')
+    parser.add_argument('--db', default=os.environ.get("DATABASE_PATH", "data/mpfm_monitor.db"),
+                        help='Banco SQLite')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    p_range = subparsers.add_parser('range', help='Exportar período de uma tabela')
+    p_range.add_argument('table', choices=sorted(EXPORT_TABLES))
+    p_range.add_argument('start', type=date.fromisoformat, help='Data inicial (AAAA-MM-DD)')
+    p_range.add_argument('end', type=date.fromisoformat, help='Data final (AAAA-MM-DD)')
+    p_range.add_argument('--format', '-f', choices=sorted(EXPORT_FORMATS), default='csv')
+    p_range.add_argument('--asset', help='Filtrar por asset_tag')
+    p_range.add_argument('--chunk-rows', type=int, default=EXPORT_CHUNK_ROWS)
+    p_range.add_argument('--output', '-o', required=True, help='Arquivo de saída')
+    
+    p_daily = subparsers.add_parser('daily-report', help='Relatório diário (ZIP de CSVs ou XLSX)')
+    p_daily.add_argument('date', type=date.fromisoformat, help='Data (AAAA-MM-DD)')
+    p_daily.add_argument('--format', '-f', choices=['csv', 'excel'], default='excel')
+    p_daily.add_argument('--output', '-o', required=True, help='Arquivo de saída')
+    
+    args = parser.parse_args()
+    
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    start = datetime.now()
+    
+    try:
+        if args.command == 'range':
+            size = 0
+            with open(args.output, 'wb') as f:
+                for data in export_range(conn, args.table, args.start, args.end, args.format,
+                                         args.asset, args.chunk_rows):
+                    f.write(data)
+                    size += len(data)
+        else:
+            data = daily_report_file(daily_report_sections(conn, args.date), args.format)
+            with open(args.output, 'wb') as f:
+                f.write(data)
+            size = len(data)
+    except ExportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+    
+    elapsed = (datetime.now() - start).total_seconds()
+    print(f"✅ {args.output}: {size / 1024 / 1024:.1f} MB em {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,42 @@ MPFM Monitor - Backend FastAPI
 API REST para integração com frontend React
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Depends, Request, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Tuple
+from collections import OrderedDict
 from datetime import date, datetime
 from enum import Enum
 import sqlite3
 import json
 import os
 import zipfile
-import tempfile
 import hashlib
 from pathlib import Path
 import sys
 import re
+import time
+import uuid
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.migrations import apply_migrations
+from backend.db_pool import ConnectionPool
+from backend.rollups import refresh_measurement_rollup, measurement_summary_query
+from backend.response_cache import ResponseCache
+from backend.event_bus import EventBus, sse_message
+from backend.exporter import (
+    EXPORT_TABLES, EXPORT_FORMATS, ExportError, validate_export, export_range, daily_report_sections, daily_report_file
+)
+from backend.pagination import (
+    Keyset, iter_ndjson, NDJSON_MEDIA_TYPE,
+    MEASUREMENT_KEYSET, CALIBRATION_KEYSET, ALERT_KEYSET, CROSS_VALIDATION_KEYSET
+)
 
 # Adicionar caminho para módulos em docs
 DOCS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../docs"))
@@ -27,11 +47,15 @@ if DOCS_PATH not in sys.path:
 
 try:
     from MPFM_MONITOR.extractors.mpfm_pdf_parser import MPFMPDFParser, MPFMReportType, MPFMProductionData
+    from MPFM_MONITOR.extractors.mpfm_pdf_parser import parse_mpfm_pdf
+    from MPFM_MONITOR.extractors.mpfm_pdf_parser import PARSER_VERSION as MPFM_PARSER_VERSION
+    from MPFM_MONITOR.extractors.parse_cache import ParseCache
 except ImportError:
     # Fallback ou log de erro se não encontrar
     print("AVISO: MPFM_MONITOR.extractors não encontrado em docs/")
     MPFMPDFParser = None
     MPFMReportType = None
+    ParseCache = None
 
 # ============================================================================
 # CONFIGURAÇÃO
@@ -40,11 +64,38 @@ except ImportError:
 DATABASE_PATH = os.environ.get("DATABASE_PATH", "data/mpfm_monitor.db")
 UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", "data/uploads")
 EXPORT_FOLDER = os.environ.get("EXPORT_FOLDER", "data/exports")
+PARSE_CACHE_FOLDER = os.environ.get("PARSE_CACHE_FOLDER", "data/parse_cache")
+PARSE_CACHE_MAX_MB = int(os.environ.get("PARSE_CACHE_MAX_MB", "512"))
+ZIP_COMMIT_FILES = int(os.environ.get("ZIP_COMMIT_FILES", "200"))
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", "2"))
+UPLOAD_QUEUE_SIZE = int(os.environ.get("UPLOAD_QUEUE_SIZE", "16"))
+UPLOAD_JOB_HISTORY = int(os.environ.get("UPLOAD_JOB_HISTORY", "500"))
+# Processos para o parsing de PDFs dos uploads (0 = na própria thread do job)
+UPLOAD_PARSE_PROCESSES = int(os.environ.get("UPLOAD_PARSE_PROCESSES", str(UPLOAD_WORKERS)))
+STATUS_CACHE_TTL = float(os.environ.get("STATUS_CACHE_TTL", "5"))
+VALIDATION_SUMMARY_CACHE_TTL = float(os.environ.get("VALIDATION_SUMMARY_CACHE_TTL", "30"))
+EVENT_BUS_QUEUE = int(os.environ.get("EVENT_BUS_QUEUE", "256"))
+EVENT_BUS_HISTORY = int(os.environ.get("EVENT_BUS_HISTORY", "500"))
+SSE_KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_RETRY_MS = int(os.environ.get("SSE_RETRY_MS", "3000"))
+JOB_EVENT_INTERVAL = float(os.environ.get("JOB_EVENT_INTERVAL", "0.5"))
+DB_READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "8"))
+DB_WRITE_POOL_SIZE = int(os.environ.get("DB_WRITE_POOL_SIZE", "4"))
+DB_PRAGMAS = {
+    'synchronous': os.environ.get("DB_SYNCHRONOUS", "NORMAL"),
+    'cache_size': -int(os.environ.get("DB_CACHE_MB", "64")) * 1024,
+    'mmap_size': int(os.environ.get("DB_MMAP_MB", "256")) * 1024 * 1024,
+    'busy_timeout': int(os.environ.get("DB_BUSY_TIMEOUT_MS", "5000")),
+}
 
 # Criar pastas se não existirem
 Path(UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
 Path(EXPORT_FOLDER).mkdir(parents=True, exist_ok=True)
 
+# Cache de resultados do parser (reenvios do mesmo PDF não passam pelo pdfplumber)
+parse_cache = ParseCache(PARSE_CACHE_FOLDER, PARSE_CACHE_MAX_MB * 1024 * 1024) if ParseCache else None
+
 # ============================================================================
 # APP E CORS
 # ============================================================================
@@ -57,6 +108,28 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+class UploadBackpressureMiddleware:
+    """
+    Com a fila de uploads cheia, responde 503 a POST /api/upload antes de
+    ler o corpo: o FastAPI recebe todo o multipart antes de chamar o
+    endpoint, então recusar lá não evita a transferência do arquivo.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] == "http" and scope["method"] == "POST"
+                and scope["path"] == "/api/upload" and upload_queue.full()):
+            response = JSONResponse(status_code=503, content={"detail": "Fila de processamento cheia"},
+                                    headers={"Retry-After": "30"})
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+# Registrado antes do CORS para que o 503 também leve os headers CORS
+app.add_middleware(UploadBackpressureMiddleware)
+
 # CORS para desenvolvimento
 app.add_middleware(
     CORSMiddleware,
@@ -64,6 +137,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ============================================================================
@@ -93,6 +167,12 @@ class AlertSeverity(str, Enum):
     WARNING = "warning"
     INFO = "info"
 
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
 class ValidationClassification(str, Enum):
     CONSISTENTE = "CONSISTENTE"
     ACEITAVEL = "ACEITAVEL"
@@ -167,6 +247,20 @@ class UploadResponse(BaseModel):
     records_extracted: int
     warnings: List[str]
     errors: List[str]
+    job_id: Optional[str] = None
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: JobStatus
+    file_name: str
+    file_type: FileType
+    files_total: int
+    files_done: int
+    errors: List[str]
+    queued_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
 
 class StatusResponse(BaseModel):
     status: str
@@ -180,19 +274,65 @@ class StatusResponse(BaseModel):
 # ============================================================================
 
 def get_db():
-    """Obtém conexão com banco de dados."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
+    """Obtém conexão de leitura/escrita do pool."""
+    with write_pool.connection() as conn:
         yield conn
-    finally:
-        conn.close()
+
+def get_read_db():
+    """Obtém conexão somente leitura do pool (endpoints GET)."""
+    with read_pool.connection() as conn:
+        yield conn
+
+def list_rows(query: str, params: List[Any], keyset: Keyset, cursor: Optional[str],
+              limit: Optional[int], page_size: int, format: str, response: Response):
+    """
+    Executa uma listagem paginada por cursor (keyset).
+    
+    - json: no máximo `limit` (ou `page_size`) linhas; se a página vier
+      cheia, o cursor da próxima vai no header X-Next-Cursor
+    - ndjson: StreamingResponse com uma linha JSON por registro, lida do
+      banco em blocos; sem `limit`, percorre todo o filtro
+    """
+    params = list(params)
+    if cursor:
+        try:
+            clause, cursor_params = keyset.after(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query += f" AND {clause}"
+        params.extend(cursor_params)
+    
+    if format != "ndjson" and limit is None:
+        limit = page_size
+    
+    query += f" ORDER BY {keyset.order_by()}"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    
+    if format == "ndjson":
+        # Conexão própria: o stream continua depois que o endpoint retorna
+        def stream():
+            with read_pool.connection() as conn:
+                yield from iter_ndjson(conn.execute(query, params))
+        return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
+    
+    with read_pool.connection() as conn:
+        rows = conn.execute(query, params).fetchall()
+    
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = keyset.cursor_for(rows[-1])
+    
+    return [dict(row) for row in rows]
 
 def init_database():
     """Inicializa banco de dados com schema básico."""
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
+    # WAL é persistente no arquivo: leitores não bloqueiam no escritor
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Tabela de medições diárias
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS daily_measurement (
@@ -291,6 +431,22 @@ def init_database():
         )
     """)
 
+    # Tabela de Staging de uploads (staged_file)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS staged_file (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT,
+            file_name TEXT NOT NULL,
+            file_type TEXT,
+            file_size INTEGER,
+            file_hash TEXT,
+            parse_status TEXT DEFAULT 'PENDING',
+            parse_errors TEXT,
+            records_extracted INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
     # Tabela de Ativos (dim_asset_registry)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS dim_asset_registry (
@@ -453,6 +609,9 @@ def init_database():
     """)
     
     conn.commit()
+    
+    # Índices e alterações posteriores ao schema básico
+    apply_migrations(conn)
     conn.close()
 
 def classify_file(filename: str) -> FileType:
@@ -572,12 +731,58 @@ def insert_pvt_calibration(cursor, record, file_id):
         record.accum_mass_water_mpfm, record.accum_mass_water_sep
     ))
 
-def process_pdf_file(file_path: Path, file_id: int, conn: sqlite3.Connection):
+PDF_FILE_TYPES = [FileType.MPFM_DAILY, FileType.MPFM_HOURLY, FileType.PDF_CALIBRATION]
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def extract_pdf(parser: "MPFMPDFParser", file_path: Path, content: Optional[bytes]):
+    """
+    Executa o parser MPFM em um processo do pool de parsing.
+    
+    pdfplumber é CPU-bound e, nas threads da fila de uploads, disputaria
+    o GIL com os requests; a thread do job só espera o resultado. Com
+    UPLOAD_PARSE_PROCESSES=0 o parsing roda na própria thread.
+    """
+    global _parse_pool
+    if UPLOAD_PARSE_PROCESSES <= 0:
+        return parser.extract()
+    
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=UPLOAD_PARSE_PROCESSES)
+        pool = _parse_pool
+    
+    try:
+        return pool.submit(parse_mpfm_pdf, str(file_path), 1, content, parser.file_hash).result()
+    except BrokenProcessPool:
+        # Processo morto (ex.: falta de memória): o próximo job recria o pool
+        with _parse_pool_lock:
+            if _parse_pool is pool:
+                _parse_pool = None
+        raise
+
+def process_pdf_file(file_path: Path, file_id: int, conn: sqlite3.Connection,
+                     content: Optional[bytes] = None, commit: bool = True):
+    """
+    Extrai um PDF MPFM e grava os fatos.
+    
+    Com `content` o PDF é lido da memória (file_path serve só como nome).
+    Com commit=False a transação fica a cargo de quem chama.
+    """
     if not MPFMPDFParser:
         raise Exception("Módulo parser não carregado")
         
-    parser = MPFMPDFParser(str(file_path))
-    result = parser.extract()
+    parser = MPFMPDFParser(str(file_path), content=content)
+    
+    result = None
+    if parse_cache:
+        result = parse_cache.get('mpfm', MPFM_PARSER_VERSION, parser.file_hash, file_path.name)
+    
+    if result is None:
+        result = extract_pdf(parser, file_path, content)
+        if parse_cache and result.success:
+            parse_cache.put('mpfm', MPFM_PARSER_VERSION, parser.file_hash, result, file_path.name)
     
     if not result.success:
         raise Exception(f"Erro no parser: {result.errors}")
@@ -593,64 +798,313 @@ def process_pdf_file(file_path: Path, file_id: int, conn: sqlite3.Connection):
     for rec in result.calibration_records:
         insert_pvt_calibration(cursor, rec, file_id)
 
-    conn.commit()
+    if commit:
+        conn.commit()
 
-def process_zip_upload(zip_path: Path, batch_id: str, conn: sqlite3.Connection):
-    """Processa arquivo ZIP contendo múltiplos relatórios."""
+def process_zip_upload(zip_path: Path, batch_id: str, conn: sqlite3.Connection,
+                       commit_files: int = ZIP_COMMIT_FILES,
+                       progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Processa arquivo ZIP contendo múltiplos relatórios.
+    
+    Os membros vão da memória direto para o parser, sem diretório
+    temporário. Registros em dim_file e fatos são gravados em transações
+    de até `commit_files` arquivos; cada arquivo roda em um SAVEPOINT,
+    de modo que uma falha desfaz apenas as linhas dele.
+    
+    `progress`, se informado, recebe as estatísticas após cada membro.
+    
+    Returns:
+        Contagens por status, erros por arquivo e vazão (arquivos/s)
+    """
+    stats = {'total': 0, 'files': 0, 'success': 0, 'skipped': 0, 'errors': 0, 'error_files': []}
+    start = time.perf_counter()
+    cursor = conn.cursor()
+    pending = 0
+    
     with zipfile.ZipFile(zip_path, 'r') as z:
-        for file_info in z.infolist():
-            if file_info.filename.endswith('/') or file_info.filename.startswith('__MACOSX'):
-                continue
-                
-            with tempfile.TemporaryDirectory() as temp_dir:
-                extracted_path = Path(temp_dir) / Path(file_info.filename).name
-                with open(extracted_path, 'wb') as f_out:
-                    f_out.write(z.read(file_info.filename))
-                
-                f_type = classify_file(extracted_path.name)
-                
-                # Registrar no dim_file
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO dim_file (file_name, file_type, file_size_bytes, source_path)
-                    VALUES (?, ?, ?, ?)
-                """, (extracted_path.name, f_type.value, file_info.file_size, f"{batch_id}/{file_info.filename}"))
-                file_id = cursor.lastrowid
-                
+        members = [
+            file_info for file_info in z.infolist()
+            if not file_info.is_dir() and not file_info.filename.startswith('__MACOSX')
+        ]
+        stats['total'] = len(members)
+        
+        for file_info in members:
+            file_name = Path(file_info.filename).name
+            f_type = classify_file(file_name)
+            
+            # Registrar no dim_file
+            cursor.execute("""
+                INSERT INTO dim_file (file_name, file_type, file_size_bytes, source_path)
+                VALUES (?, ?, ?, ?)
+            """, (file_name, f_type.value, file_info.file_size, f"{batch_id}/{file_info.filename}"))
+            file_id = cursor.lastrowid
+            stats['files'] += 1
+            
+            if f_type in PDF_FILE_TYPES:
+                cursor.execute("SAVEPOINT zip_member")
                 try:
-                    if f_type in [FileType.MPFM_DAILY, FileType.MPFM_HOURLY, FileType.PDF_CALIBRATION]:
-                        process_pdf_file(extracted_path, file_id, conn)
-                        cursor.execute("UPDATE dim_file SET status = 'SUCCESS' WHERE file_id = ?", (file_id,))
-                    else:
-                        cursor.execute("UPDATE dim_file SET status = 'SKIPPED', error_message='Tipo não suportado' WHERE file_id = ?", (file_id,))
+                    process_pdf_file(Path(file_name), file_id, conn,
+                                     content=z.read(file_info), commit=False)
+                    cursor.execute("RELEASE zip_member")
+                    cursor.execute("UPDATE dim_file SET status = 'SUCCESS' WHERE file_id = ?", (file_id,))
+                    stats['success'] += 1
                 except Exception as e:
+                    cursor.execute("ROLLBACK TO zip_member")
+                    cursor.execute("RELEASE zip_member")
                     cursor.execute("UPDATE dim_file SET status = 'ERROR', error_message = ? WHERE file_id = ?", (str(e), file_id))
-                
+                    stats['errors'] += 1
+                    stats['error_files'].append(f"{file_name}: {e}")
+            else:
+                cursor.execute("UPDATE dim_file SET status = 'SKIPPED', error_message='Tipo não suportado' WHERE file_id = ?", (file_id,))
+                stats['skipped'] += 1
+            
+            pending += 1
+            if pending >= commit_files:
                 conn.commit()
+                pending = 0
+            
+            if progress:
+                progress(stats)
+    
+    conn.commit()
+    
+    elapsed = time.perf_counter() - start
+    stats['elapsed_s'] = round(elapsed, 3)
+    stats['files_per_sec'] = round(stats['files'] / elapsed, 1) if elapsed > 0 else 0.0
+    
+    return stats
+
+# ============================================================================
+# FILA DE PROCESSAMENTO DE UPLOADS
+# ============================================================================
+
+def process_upload_job(job: Dict[str, Any], update: Callable[..., None]):
+    """
+    Processa um upload enfileirado (executado em thread de trabalho).
+    
+    Usa conexão própria do pool: a do request já foi devolvida quando o job roda.
+    """
+    with write_pool.connection() as conn:
+        _process_upload_job(job, update, conn)
+
+def _process_upload_job(job: Dict[str, Any], update: Callable[..., None], conn: sqlite3.Connection):
+    cursor = conn.cursor()
+    file_type = job['file_type']
+    
+    try:
+        if file_type == FileType.ZIP_BATCH:
+            def on_progress(stats):
+                update(files_total=stats['total'], files_done=stats['files'],
+                       errors=list(stats['error_files']))
+            
+            zip_stats = process_zip_upload(Path(job['file_path']), job['batch_id'], conn,
+                                           progress=on_progress)
+            parse_status = 'SUCCESS' if zip_stats['errors'] == 0 else 'PARTIAL'
+            cursor.execute("""
+                UPDATE staged_file SET parse_status = ?, records_extracted = ? WHERE id = ?
+            """, (parse_status, zip_stats['success'], job['staged_id']))
+            conn.commit()
+            update(result={k: v for k, v in zip_stats.items() if k != 'error_files'})
+            
+        elif file_type in PDF_FILE_TYPES:
+            process_pdf_file(Path(job['file_path']), job['staged_id'], conn)
+            cursor.execute("""
+                UPDATE staged_file SET parse_status = 'SUCCESS', records_extracted = 1 WHERE id = ?
+            """, (job['staged_id'],))
+            conn.commit()
+            update(files_done=1)
+            
+        else:
+            cursor.execute("""
+                UPDATE staged_file SET parse_status = 'SKIPPED', parse_errors = 'Tipo não suportado' WHERE id = ?
+            """, (job['staged_id'],))
+            conn.commit()
+            update(files_done=1)
+            
+    except Exception as e:
+        conn.rollback()
+        cursor.execute("""
+            UPDATE staged_file SET parse_status = 'ERROR', parse_errors = ? WHERE id = ?
+        """, (str(e), job['staged_id']))
+        conn.commit()
+        raise
+
+class UploadJobQueue:
+    """
+    Fila limitada de uploads com pool de threads de trabalho.
+    
+    O endpoint de upload só grava o arquivo e enfileira; o parsing
+    (pdfplumber) e a escrita no banco rodam fora do event loop. Com a
+    fila cheia `submit` retorna False e o endpoint responde 503.
+    Os jobs ficam em memória (últimos `history` concluídos).
+    """
+    
+    def __init__(self, workers: int = UPLOAD_WORKERS, max_pending: int = UPLOAD_QUEUE_SIZE,
+                 history: int = UPLOAD_JOB_HISTORY):
+        self.workers = max(1, workers)
+        self.history = history
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max(1, max_pending))
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._published_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+    
+    def start(self):
+        """Inicia as threads de trabalho (uma única vez)."""
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"upload-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+    
+    def submit(self, file_name: str, file_path: Path, file_type: FileType,
+               staged_id: int, batch_id: Optional[str] = None) -> Optional[str]:
+        """Enfileira um upload. Retorna o job_id ou None se a fila estiver cheia."""
+        self.start()
+        
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'status': JobStatus.QUEUED,
+            'file_name': file_name,
+            'file_path': str(file_path),
+            'file_type': file_type,
+            'staged_id': staged_id,
+            'batch_id': batch_id,
+            'files_total': 0 if file_type == FileType.ZIP_BATCH else 1,
+            'files_done': 0,
+            'errors': [],
+            'queued_at': datetime.now(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None
+        }
+        
+        with self._lock:
+            self._jobs[job_id] = job
+        
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            return None
+        
+        self._publish(job_id)
+        return job_id
+    
+    def full(self) -> bool:
+        return self._queue.full()
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cópia do estado atual do job."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, errors=list(job['errors'])) if job else None
+    
+    def active(self) -> List[Dict[str, Any]]:
+        """Cópia dos jobs ainda na fila ou em execução."""
+        with self._lock:
+            return [dict(job, errors=list(job['errors'])) for job in self._jobs.values()
+                    if job['status'] in (JobStatus.QUEUED, JobStatus.RUNNING)]
+    
+    def stats(self) -> Dict[str, int]:
+        """Jobs por status e ocupação da fila."""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job['status'].value] += 1
+        counts['queue_size'] = self._queue.qsize()
+        counts['queue_capacity'] = self._queue.maxsize
+        return counts
+    
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+        self._publish(job_id, force='status' in fields)
+    
+    def _publish(self, job_id: str, force: bool = True):
+        """
+        Evento `job` com o estado atual. Progresso (sem mudança de status)
+        sai no máximo a cada JOB_EVENT_INTERVAL segundos por job, para um
+        ZIP grande não ocupar o histórico do barramento.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._published_at.get(job_id, 0.0) < JOB_EVENT_INTERVAL:
+                return
+            self._published_at[job_id] = now
+            job = dict(self._jobs[job_id], errors=list(self._jobs[job_id]['errors']))
+        event_bus.publish('job', JobResponse(**job))
+    
+    def _prune(self):
+        """Descarta os jobs concluídos mais antigos além de `history`."""
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items()
+                        if job['status'] in (JobStatus.DONE, JobStatus.FAILED)]
+            for job_id in finished[:max(0, len(finished) - self.history)]:
+                del self._jobs[job_id]
+                self._published_at.pop(job_id, None)
+    
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.now())
+                job = self.get(job_id)
+                try:
+                    process_upload_job(job, lambda **fields: self._update(job_id, **fields))
+                    self._update(job_id, status=JobStatus.DONE, finished_at=datetime.now())
+                except Exception as e:
+                    with self._lock:
+                        self._jobs[job_id]['errors'].append(str(e))
+                    self._update(job_id, status=JobStatus.FAILED, finished_at=datetime.now())
+                response_cache.invalidate()
+                self._prune()
+            finally:
+                self._queue.task_done()
+
+upload_queue = UploadJobQueue()
+
+# Respostas de polling; invalidado por uploads, alertas e validações
+response_cache = ResponseCache()
+
+# Eventos de alertas e uploads para /api/events
+event_bus = EventBus(EVENT_BUS_QUEUE, EVENT_BUS_HISTORY)
 
 # Inicializa banco na startup
 init_database()
 
+read_pool = ConnectionPool(DATABASE_PATH, DB_READ_POOL_SIZE, readonly=True, pragmas=DB_PRAGMAS)
+write_pool = ConnectionPool(DATABASE_PATH, DB_WRITE_POOL_SIZE, pragmas=DB_PRAGMAS)
+
 # ============================================================================
 # ENDPOINTS - STATUS
 # ============================================================================
 
 @app.get("/api/status", response_model=StatusResponse)
-def get_status(conn: sqlite3.Connection = Depends(get_db)):
-    """Retorna status do sistema."""
-    cursor = conn.cursor()
-    
-    # Conta tabelas
-    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
-    tables_count = cursor.fetchone()[0]
-    
-    # Última importação
-    cursor.execute("SELECT MAX(created_at) FROM staged_file")
-    last_import = cursor.fetchone()[0]
-    
-    # Alertas ativos
-    cursor.execute("SELECT COUNT(*) FROM alert WHERE resolved = 0")
-    alerts_active = cursor.fetchone()[0]
+def get_status(request: Request):
+    """Retorna status do sistema (cache com ETag; ver ResponseCache)."""
+    return response_cache.respond(request, STATUS_CACHE_TTL, compute_status)
+
+def compute_status() -> StatusResponse:
+    with read_pool.connection() as conn:
+        cursor = conn.cursor()
+        
+        # Conta tabelas
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table'")
+        tables_count = cursor.fetchone()[0]
+        
+        # Última importação
+        cursor.execute("SELECT MAX(created_at) FROM staged_file")
+        last_import = cursor.fetchone()[0]
+        
+        # Alertas ativos
+        cursor.execute("SELECT COUNT(*) FROM alert WHERE resolved = 0")
+        alerts_active = cursor.fetchone()[0]
     
     return StatusResponse(
         status="online",
@@ -663,7 +1117,11 @@ def get_status(conn: sqlite3.Connection = Depends(get_db)):
 @app.get("/api/health")
 def health_check():
     """Health check para monitoring."""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now().isoformat(),
+            "upload_queue": upload_queue.stats(),
+            "db_pool": {"read": read_pool.stats(), "write": write_pool.stats()},
+            "response_cache": response_cache.stats(),
+            "event_bus": event_bus.stats()}
 
 # ============================================================================
 # ENDPOINTS - MEDIÇÕES DIÁRIAS
@@ -671,16 +1129,16 @@ def health_check():
 
 @app.get("/api/measurements/daily", response_model=List[Dict[str, Any]])
 def get_daily_measurements(
+    response: Response,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     source: Optional[SourceType] = None,
     asset_tag: Optional[str] = None,
-    limit: int = Query(100, le=1000),
-    conn: sqlite3.Connection = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """Lista medições diárias com filtros."""
-    cursor = conn.cursor()
-    
+    """Lista medições diárias com filtros (padrão: 100 por página; ver list_rows)."""
     query = "SELECT * FROM daily_measurement WHERE 1=1"
     params = []
     
@@ -700,19 +1158,14 @@ def get_daily_measurements(
         query += " AND asset_tag = ?"
         params.append(asset_tag)
     
-    query += f" ORDER BY date DESC LIMIT {limit}"
-    
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    
-    return [dict(row) for row in rows]
+    return list_rows(query, params, MEASUREMENT_KEYSET, cursor, limit, 100, format, response)
 
 @app.post("/api/measurements/daily", response_model=Dict[str, Any])
 def create_daily_measurement(
     measurement: DailyMeasurement,
     conn: sqlite3.Connection = Depends(get_db)
 ):
-    """Cria ou atualiza medição diária."""
+    """Cria ou atualiza medição diária (e o dia correspondente da rollup)."""
     cursor = conn.cursor()
     
     try:
@@ -734,9 +1187,11 @@ def create_daily_measurement(
             measurement.k_gas,
             measurement.k_water
         ))
+        measurement_id = cursor.lastrowid
+        refresh_measurement_rollup(cursor, [(measurement.source.value, measurement.date.isoformat())])
         conn.commit()
         
-        return {"success": True, "id": cursor.lastrowid}
+        return {"success": True, "id": measurement_id}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -744,37 +1199,15 @@ def create_daily_measurement(
 def get_measurements_summary(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    conn: sqlite3.Connection = Depends(get_db)
+    conn: sqlite3.Connection = Depends(get_read_db)
 ):
-    """Retorna resumo de medições por fonte."""
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT 
-            source,
-            COUNT(*) as count,
-            AVG(oil) as avg_oil,
-            AVG(gas) as avg_gas,
-            AVG(water) as avg_water,
-            AVG(hc) as avg_hc,
-            AVG(bsw) as avg_bsw,
-            MIN(date) as first_date,
-            MAX(date) as last_date
-        FROM daily_measurement
-        WHERE 1=1
-    """
-    params = []
-    
-    if start_date:
-        query += " AND date >= ?"
-        params.append(start_date.isoformat())
-    
-    if end_date:
-        query += " AND date <= ?"
-        params.append(end_date.isoformat())
-    
-    query += " GROUP BY source"
+    """Retorna resumo de medições por fonte (a partir da rollup diária)."""
+    query, params = measurement_summary_query(
+        start_date.isoformat() if start_date else None,
+        end_date.isoformat() if end_date else None
+    )
     
+    cursor = conn.cursor()
     cursor.execute(query, params)
     rows = cursor.fetchall()
     
@@ -786,13 +1219,13 @@ def get_measurements_summary(
 
 @app.get("/api/calibrations", response_model=List[Dict[str, Any]])
 def get_calibrations(
+    response: Response,
     asset_tag: Optional[str] = None,
-    limit: int = Query(50, le=200),
-    conn: sqlite3.Connection = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """Lista calibrações."""
-    cursor = conn.cursor()
-    
+    """Lista calibrações (padrão: 50 por página)."""
     query = "SELECT * FROM calibration WHERE 1=1"
     params = []
     
@@ -800,12 +1233,7 @@ def get_calibrations(
         query += " AND asset_tag = ?"
         params.append(asset_tag)
     
-    query += f" ORDER BY start_date DESC LIMIT {limit}"
-    
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    
-    return [dict(row) for row in rows]
+    return list_rows(query, params, CALIBRATION_KEYSET, cursor, limit, 50, format, response)
 
 @app.post("/api/calibrations", response_model=Dict[str, Any])
 def create_calibration(
@@ -846,15 +1274,15 @@ def create_calibration(
 
 @app.get("/api/alerts", response_model=List[Dict[str, Any]])
 def get_alerts(
+    response: Response,
     severity: Optional[AlertSeverity] = None,
     category: Optional[str] = None,
     resolved: Optional[bool] = None,
-    limit: int = Query(100, le=500),
-    conn: sqlite3.Connection = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """Lista alertas com filtros."""
-    cursor = conn.cursor()
-    
+    """Lista alertas com filtros (padrão: 100 por página)."""
     query = "SELECT * FROM alert WHERE 1=1"
     params = []
     
@@ -870,16 +1298,18 @@ def get_alerts(
         query += " AND resolved = ?"
         params.append(1 if resolved else 0)
     
-    query += f" ORDER BY timestamp DESC LIMIT {limit}"
-    
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    
-    return [dict(row) for row in rows]
+    return list_rows(query, params, ALERT_KEYSET, cursor, limit, 100, format, response)
 
 @app.get("/api/alerts/active", response_model=List[Dict[str, Any]])
-def get_active_alerts(conn: sqlite3.Connection = Depends(get_db)):
-    """Lista apenas alertas ativos (não resolvidos)."""
+def get_active_alerts(conn: sqlite3.Connection = Depends(get_read_db)):
+    """
+    Lista apenas alertas ativos (não resolvidos).
+    
+    Para acompanhar mudanças use /api/events em vez de polling.
+    """
+    return fetch_active_alerts(conn)
+
+def fetch_active_alerts(conn: sqlite3.Connection) -> List[Dict[str, Any]]:
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -897,6 +1327,12 @@ def get_active_alerts(conn: sqlite3.Connection = Depends(get_db)):
     
     return [dict(row) for row in rows]
 
+def publish_alert(conn: sqlite3.Connection, alert_id: int, action: str):
+    """Evento `alert` com a linha atual do alerta (o cliente aplica por id)."""
+    row = conn.execute("SELECT * FROM alert WHERE id = ?", (alert_id,)).fetchone()
+    if row is not None:
+        event_bus.publish('alert', {"action": action, "alert": dict(row)})
+
 @app.post("/api/alerts", response_model=Dict[str, Any])
 def create_alert(
     alert: AlertCreate,
@@ -918,6 +1354,8 @@ def create_alert(
         alert.threshold
     ))
     conn.commit()
+    response_cache.invalidate()
+    publish_alert(conn, cursor.lastrowid, "created")
     
     return {"success": True, "id": cursor.lastrowid}
 
@@ -940,6 +1378,8 @@ def acknowledge_alert(
     if cursor.rowcount == 0:
         raise HTTPException(status_code=404, detail="Alerta não encontrado")
     
+    response_cache.invalidate()
+    publish_alert(conn, alert_id, "acknowledged")
     return {"success": True}
 
 @app.put("/api/alerts/{alert_id}/resolve")
@@ -961,6 +1401,8 @@ def resolve_alert(
     if cursor.rowcount == 0:
         raise HTTPException(status_code=404, detail="Alerta não encontrado")
     
+    response_cache.invalidate()
+    publish_alert(conn, alert_id, "resolved")
     return {"success": True}
 
 # ============================================================================
@@ -969,14 +1411,15 @@ def resolve_alert(
 
 @app.get("/api/validation/cross", response_model=List[Dict[str, Any]])
 def get_cross_validations(
+    response: Response,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     classification: Optional[ValidationClassification] = None,
-    conn: sqlite3.Connection = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$")
 ):
-    """Lista resultados de validação cruzada."""
-    cursor = conn.cursor()
-    
+    """Lista resultados de validação cruzada (padrão: 1000 por página)."""
     query = "SELECT * FROM cross_validation WHERE 1=1"
     params = []
     
@@ -992,31 +1435,27 @@ def get_cross_validations(
         query += " AND classification = ?"
         params.append(classification.value)
     
-    query += " ORDER BY date_ref DESC, variable_code"
-    
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
-    
-    return [dict(row) for row in rows]
+    return list_rows(query, params, CROSS_VALIDATION_KEYSET, cursor, limit, 1000, format, response)
 
 @app.get("/api/validation/summary")
-def get_validation_summary(
-    date_ref: date,
-    conn: sqlite3.Connection = Depends(get_db)
-):
-    """Retorna resumo de validação para uma data."""
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT 
-            classification,
-            COUNT(*) as count
-        FROM cross_validation
-        WHERE date_ref = ?
-        GROUP BY classification
-    """, (date_ref.isoformat(),))
-    
-    rows = cursor.fetchall()
+def get_validation_summary(request: Request, date_ref: date):
+    """Retorna resumo de validação para uma data (cache com ETag)."""
+    return response_cache.respond(request, VALIDATION_SUMMARY_CACHE_TTL,
+                                  lambda: compute_validation_summary(date_ref))
+
+def compute_validation_summary(date_ref: date) -> Dict[str, Any]:
+    with read_pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 
+                classification,
+                COUNT(*) as count
+            FROM cross_validation
+            WHERE date_ref = ?
+            GROUP BY classification
+        """, (date_ref.isoformat(),))
+        
+        rows = cursor.fetchall()
     
     summary = {
         "date": date_ref.isoformat(),
@@ -1044,71 +1483,180 @@ def get_validation_summary(
 # ENDPOINTS - UPLOAD DE ARQUIVOS
 # ============================================================================
 
-@app.post("/api/upload", response_model=UploadResponse)
+async def save_upload_stream(upload: UploadFile, dest: Path,
+                             chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, int]:
+    """
+    Grava o upload em disco em blocos de `chunk_size`, calculando o
+    SHA-256 no mesmo passo. A memória usada independe do tamanho do
+    arquivo.
+    
+    Returns:
+        (sha256 hex, tamanho em bytes)
+    """
+    sha256 = hashlib.sha256()
+    size = 0
+    
+    with open(dest, "wb") as f:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+    
+    return sha256.hexdigest(), size
+
+def upload_path(file_name: str) -> Path:
+    """
+    Caminho exclusivo do upload: UPLOAD_FOLDER/<id>/<nome do arquivo>.
+    
+    O processamento é adiado para a fila; um reenvio com o mesmo nome não
+    pode sobrescrever o arquivo de um job ainda pendente. O nome original
+    é mantido (os parsers leem tipo, bank e data dele), sem diretórios.
+    """
+    name = re.sub(r'[^\w.\-+]', '_', Path(file_name or "upload").name) or "upload"
+    upload_dir = Path(UPLOAD_FOLDER) / uuid.uuid4().hex
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return upload_dir / name
+
+@app.post("/api/upload", response_model=UploadResponse, status_code=202)
 async def upload_file(
     file: UploadFile = File(...),
-    file_type: Optional[FileType] = None,
-    conn: sqlite3.Connection = Depends(get_db)
+    file_type: Optional[FileType] = None
 ):
-    """Upload de arquivo para processamento."""
+    """
+    Upload de arquivo para processamento.
+    
+    Grava o arquivo, registra no staging e enfileira o processamento.
+    Retorna imediatamente com o job_id; o progresso é consultado em
+    /api/jobs/{job_id} ou recebido como eventos `job` em /api/events.
+    Com a fila cheia responde 503 (Retry-After) sem receber o corpo
+    (UploadBackpressureMiddleware).
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    content = b""
     
     try:
-        # Salva arquivo
-        file_path = Path(UPLOAD_FOLDER) / file.filename
-        
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # 1. Salva arquivo (streaming, com hash incremental)
+        file_path = upload_path(file.filename)
+        file_hash, file_size = await save_upload_stream(file, file_path)
 
         # 2. Classificação
         detected_type = classify_file(file.filename)
         if file_type is None:
             file_type = detected_type
         
-        # 3. Hash e Batch ID
-        file_hash = hashlib.sha256(content).hexdigest()
+        # 3. Batch ID
         batch_id = f"BATCH_{timestamp}" if file_type == FileType.ZIP_BATCH else None
         
-        # 4. Registrar Staging
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO staged_file 
-            (batch_id, file_name, file_type, file_size, file_hash, parse_status)
-            VALUES (?, ?, ?, ?, ?, 'PENDING')
-        """, (batch_id, file.filename, file_type.value if file_type else "UNKNOWN", len(content), file_hash))
-        
-        file_id = cursor.lastrowid
-        conn.commit()
-        
-        extracted_count = 0
-        warnings = []
-        
-        # 5. Processamento específico
-        if file_type == FileType.ZIP_BATCH:
-            process_zip_upload(file_path, batch_id, conn)
-            extracted_count = -1 # Indica batch
-        elif file_type in [FileType.MPFM_DAILY, FileType.MPFM_HOURLY, FileType.PDF_CALIBRATION]:
-             process_pdf_file(file_path, file_id, conn)
-             extracted_count = 1
-             cursor.execute("UPDATE staged_file SET parse_status = 'SUCCESS' WHERE id = ?", (file_id,))
-             conn.commit()
+        # 4-5. Staging e fila no threadpool: a espera por conexão do pool
+        # não pode bloquear o event loop (e a conexão não fica retida
+        # durante a transferência do arquivo)
+        job_id = await run_in_threadpool(stage_upload, file.filename, file_path, file_type,
+                                         file_size, file_hash, batch_id)
+        if job_id is None:
+            raise HTTPException(status_code=503, detail="Fila de processamento cheia",
+                                headers={"Retry-After": "30"})
 
         return UploadResponse(
             success=True,
             file_name=file.filename,
             file_type=file_type,
-            records_extracted=extracted_count,
-            warnings=warnings,
-            errors=[]
+            records_extracted=0,
+            warnings=[],
+            errors=[],
+            job_id=job_id
         )
 
+    except HTTPException:
+        raise
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail="Banco de dados ocupado",
+                            headers={"Retry-After": "30"})
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Erro no upload: {str(e)}")
 
+def stage_upload(file_name: str, file_path: Path, file_type: Optional[FileType], file_size: int,
+                 file_hash: str, batch_id: Optional[str]) -> Optional[str]:
+    """Registra o upload em staged_file e enfileira o job. None se a fila estiver cheia."""
+    with write_pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO staged_file 
+            (batch_id, file_name, file_type, file_size, file_hash, parse_status)
+            VALUES (?, ?, ?, ?, ?, 'PENDING')
+        """, (batch_id, file_name, file_type.value if file_type else "UNKNOWN", file_size, file_hash))
+        
+        file_id = cursor.lastrowid
+        conn.commit()
+        response_cache.invalidate()
+        
+        job_id = upload_queue.submit(file_name, file_path, file_type, file_id, batch_id)
+        if job_id is None:
+            cursor.execute("""
+                UPDATE staged_file SET parse_status = 'REJECTED', parse_errors = 'Fila cheia' WHERE id = ?
+            """, (file_id,))
+            conn.commit()
+    
+    return job_id
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    """Progresso de um upload enfileirado."""
+    job = upload_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job não encontrado")
+    return JobResponse(**job)
+
+# ============================================================================
+# ENDPOINTS - EVENTOS (SSE)
+# ============================================================================
+
+@app.get("/api/events")
+async def stream_events(
+    request: Request,
+    snapshot: bool = True,
+    last_event_id: Optional[int] = Header(None)
+):
+    """
+    Canal server-sent events: `alert` (created/acknowledged/resolved, com o
+    alerta) e `job` (estado do upload a cada mudança de status/progresso).
+    
+    Na conexão envia `snapshot` com os alertas ativos e os jobs em
+    andamento; na reconexão (header Last-Event-ID) reenvia só os eventos
+    perdidos, ou um novo `snapshot` se o histórico não os cobrir. Um evento
+    pode repetir o que já está no snapshot: o cliente aplica por id.
+    """
+    async def stream():
+        # Assinatura criada e encerrada dentro do gerador: se o cliente sair
+        # antes do início do streaming, nada fica registrado no barramento
+        subscription = event_bus.subscribe(last_event_id)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+            if subscription.gap or (snapshot and last_event_id is None):
+                yield sse_message('snapshot', await run_in_threadpool(compute_event_snapshot))
+            for event in subscription.backlog:
+                yield event.encode()
+            
+            while not await request.is_disconnected():
+                event = await subscription.next(SSE_KEEPALIVE_SECONDS)
+                yield event.encode() if event else b": keepalive\n\n"
+        except OverflowError:
+            # Cliente lento: encerra; o EventSource reconecta com Last-Event-ID
+            pass
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def compute_event_snapshot() -> Dict[str, Any]:
+    with read_pool.connection() as conn:
+        alerts = fetch_active_alerts(conn)
+    return {"alerts": alerts, "jobs": [JobResponse(**job) for job in upload_queue.active()]}
+
 def detect_file_type(filename: str) -> Optional[FileType]:
     # Deprecated: use classify_file instead
     return classify_file(filename)
@@ -1123,53 +1671,71 @@ from backend.validators.reconciliation_v2 import ReconciliationValidatorV2
 def export_daily_report(
     date_ref: date,
     format: str = Query("json", regex="^(json|csv|excel)$"),
-    conn: sqlite3.Connection = Depends(get_db)
+    conn: sqlite3.Connection = Depends(get_read_db)
 ):
-    """Exporta relatório diário."""
-    cursor = conn.cursor()
+    """Exporta relatório diário (JSON, ZIP de CSVs ou XLSX)."""
+    # Medições, validações e alertas do dia (alertas por intervalo de timestamp)
+    sections = daily_report_sections(conn, date_ref)
     
-    # Busca medições
-    cursor.execute("""
-        SELECT * FROM daily_measurement WHERE date = ?
-    """, (date_ref.isoformat(),))
-    measurements = [dict(row) for row in cursor.fetchall()]
-    
-    # Busca validações
-    cursor.execute("""
-        SELECT * FROM cross_validation WHERE date_ref = ?
-    """, (date_ref.isoformat(),))
-    validations = [dict(row) for row in cursor.fetchall()]
+    if format == "json":
+        report = {
+            "date": date_ref.isoformat(),
+            "generated_at": datetime.now().isoformat(),
+        }
+        for name, (columns, rows) in sections.items():
+            report[name] = [dict(zip(columns, row)) for row in rows]
+        return report
     
-    # Busca alertas do dia
-    cursor.execute("""
-        SELECT * FROM alert WHERE DATE(timestamp) = ?
-    """, (date_ref.isoformat(),))
-    alerts = [dict(row) for row in cursor.fetchall()]
+    media_type, extension = {
+        "csv": ("application/zip", "zip"),
+        "excel": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    }[format]
+    return Response(
+        content=daily_report_file(sections, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="relatorio_{date_ref.isoformat()}.{extension}"'}
+    )
+
+@app.get("/api/export/range")
+def export_range_endpoint(
+    table: str = Query(..., pattern=f"^({'|'.join(EXPORT_TABLES)})$"),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    asset_tag: Optional[str] = None,
+    format: str = Query("csv", pattern=f"^({'|'.join(EXPORT_FORMATS)})$")
+):
+    """
+    Exporta um período de fact_mpfm_production, fact_reconciliation_daily
+    ou cross_validation em streaming (CSV, Parquet ou Arrow IPC), lido do
+    banco em blocos de EXPORT_CHUNK_ROWS linhas.
+    """
+    try:
+        validate_export(table, start_date, end_date, format)
+    except ExportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    report = {
-        "date": date_ref.isoformat(),
-        "generated_at": datetime.now().isoformat(),
-        "measurements": measurements,
-        "validations": validations,
-        "alerts": alerts
-    }
+    # Conexão própria: o stream continua depois que o endpoint retorna
+    def stream():
+        with read_pool.connection() as conn:
+            yield from export_range(conn, table, start_date, end_date, format, asset_tag)
     
-    if format == "json":
-        return report
-    else:
-        # TODO: Implementar CSV e Excel
-        return report
+    media_type, extension = EXPORT_FORMATS[format]
+    file_name = f"{table}_{start_date.isoformat()}_{end_date.isoformat()}.{extension}"
+    return StreamingResponse(stream(), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{file_name}"'})
 
 @app.post("/api/validate/run")
-def run_validation(
-    start_date: date,
-    end_date: date,
-    conn: sqlite3.Connection = Depends(get_db)
-):
-    """Executa validação de reconciliação (V2) para um período."""
+def run_validation(start_date: date, end_date: date):
+    """
+    Executa validação de reconciliação (V2) para um período.
+    
+    O validador abre a própria conexão; nenhuma do pool fica retida
+    durante a execução.
+    """
     validator = ReconciliationValidatorV2(DATABASE_PATH)
     try:
         results = validator.validate_date_range(start_date, end_date)
+        response_cache.invalidate()
         
         # Resumo estatístico
         summary = {
@@ -0,0 +1,114 @@
+"""
+MPFM Monitor - Migrações de schema
+Alterações incrementais sobre o schema básico de init_database.
+Cada migração roda uma única vez e fica registrada em schema_migrations.
+"""
+import sqlite3
+from typing import List, Tuple
+
+from backend.rollups import ROLLUP_SCHEMA, ROLLUP_BACKFILL
+
+# ============================================================================
+# MIGRAÇÕES
+# ============================================================================
+
+# (versão, descrição, comandos). Nunca alterar uma migração já publicada:
+# mudanças novas entram como uma versão nova no fim da lista.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "Índices para filtros e ordenações da API", [
+        # /api/alerts: ORDER BY timestamp DESC com filtros por resolved/severity/category;
+        # /api/status e /api/alerts/active: resolved = 0; export: alertas do dia
+        "CREATE INDEX IF NOT EXISTS idx_alert_timestamp ON alert(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_alert_resolved_timestamp ON alert(resolved, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_alert_severity_timestamp ON alert(severity, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_alert_category_timestamp ON alert(category, timestamp)",
+        
+        # /api/measurements/daily por asset_tag (o resumo lê daily_measurement_rollup;
+        # filtros por fonte/dia usam o índice de UNIQUE(date, source, asset_tag))
+        "CREATE INDEX IF NOT EXISTS idx_daily_measurement_asset_date ON daily_measurement(asset_tag, date)",
+        
+        # /api/calibrations: ORDER BY start_date DESC, opcionalmente por asset_tag
+        "CREATE INDEX IF NOT EXISTS idx_calibration_start ON calibration(start_date)",
+        "CREATE INDEX IF NOT EXISTS idx_calibration_asset_start ON calibration(asset_tag, start_date)",
+        
+        # /api/validation/cross: ORDER BY date_ref DESC, variable_code; filtro por classification;
+        # /api/validation/summary: GROUP BY classification de uma data (cobertura)
+        "CREATE INDEX IF NOT EXISTS idx_cross_validation_class_date "
+        "ON cross_validation(classification, date_ref, variable_code)",
+        "CREATE INDEX IF NOT EXISTS idx_cross_validation_date_class "
+        "ON cross_validation(date_ref, classification)",
+        
+        # /api/status: MAX(created_at)
+        "CREATE INDEX IF NOT EXISTS idx_staged_file_created ON staged_file(created_at)",
+        
+        # Reconciliação V2: período por business_date
+        "CREATE INDEX IF NOT EXISTS idx_fact_mpfm_date_asset "
+        "ON fact_mpfm_production(business_date, asset_tag)",
+    ]),
+    (2, "Rollup diária de medições por fonte", [
+        ROLLUP_SCHEMA,
+        ROLLUP_BACKFILL,
+        # Índice de cobertura do resumo antigo (agregado sobre daily_measurement),
+        # criado por versões anteriores da migração 1; só pesava nas inserções
+        "DROP INDEX IF EXISTS idx_daily_measurement_source_date",
+    ]),
+    (3, "Índices na ordem das listagens paginadas", [
+        # /api/measurements/daily: ORDER BY date DESC, id DESC (id = rowid, implícito
+        # no fim do índice); sem filtro e por fonte, o LIMIT encerra a leitura
+        "CREATE INDEX IF NOT EXISTS idx_daily_measurement_date ON daily_measurement(date)",
+        "CREATE INDEX IF NOT EXISTS idx_daily_measurement_source_day ON daily_measurement(source, date)",
+        
+        # /api/validation/cross: ORDER BY date_ref DESC, variable_code ASC, id ASC
+        "CREATE INDEX IF NOT EXISTS idx_cross_validation_listing "
+        "ON cross_validation(date_ref DESC, variable_code ASC)",
+    ]),
+]
+
+
+# ============================================================================
+# APLICAÇÃO
+# ============================================================================
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Maior versão aplicada (0 para banco sem migrações)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação.
+    
+    Returns:
+        Versões aplicadas nesta chamada
+    """
+    applied = []
+    version = current_version(conn)
+    conn.commit()
+    
+    for number, description, statements in MIGRATIONS:
+        if number <= version:
+            continue
+        
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (number, description)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        print(f"Migração {number} aplicada: {description}")
+        applied.append(number)
+    
+    return applied
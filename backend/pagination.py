@@ -0,0 +1,128 @@
+"""
+MPFM Monitor - Paginação por cursor (keyset)
+A página seguinte começa logo após a última linha entregue, comparando a
+chave de ordenação em vez de usar OFFSET: o custo de cada página não
+cresce com a profundidade e linhas inseridas entre requests não causam
+repetições nem saltos.
+
+O cursor é opaco para o cliente (JSON da chave em base64 url-safe) e vai
+no header X-Next-Cursor.
+"""
+import base64
+import json
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_FETCH_SIZE = 500
+
+
+# ============================================================================
+# CHAVES DE ORDENAÇÃO
+# ============================================================================
+
+@dataclass(frozen=True)
+class SortKey:
+    column: str
+    descending: bool = True
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Ordenação total de uma listagem (a última chave deve ser única, ex.: id)."""
+    keys: Tuple[SortKey, ...]
+    
+    def order_by(self) -> str:
+        return ", ".join(f"{k.column} {'DESC' if k.descending else 'ASC'}" for k in self.keys)
+    
+    def cursor_for(self, row: sqlite3.Row) -> str:
+        return encode_cursor([row[k.column] for k in self.keys])
+    
+    def after(self, cursor: str) -> Tuple[str, List[Any]]:
+        """
+        Condição SQL para "linhas depois do cursor" na ordem de `order_by`.
+        
+        Expande (k1, k2, ...) > (v1, v2, ...) respeitando a direção de cada
+        chave e a posição dos NULLs no SQLite (primeiro em ASC, último em
+        DESC). Para a primeira chave não nula adiciona um limite simples
+        (k1 <= v1 / k1 >= v1) que o planner usa como faixa do índice.
+        """
+        values = decode_cursor(cursor, len(self.keys))
+        terms, params = [], []
+        
+        for i, key in enumerate(self.keys):
+            strict, strict_params = _strictly_after(key, values[i])
+            if strict is None:
+                continue
+            equal = [f"{k.column} IS ?" if k.nullable else f"{k.column} = ?" for k in self.keys[:i]]
+            terms.append(" AND ".join(equal + [strict]))
+            params.extend(values[:i] + strict_params)
+        
+        clause = "(" + " OR ".join(f"({t})" for t in terms) + ")" if terms else "0"
+        
+        first = self.keys[0]
+        if not first.nullable and values[0] is not None:
+            clause = f"{first.column} {'<=' if first.descending else '>='} ? AND {clause}"
+            params.insert(0, values[0])
+        
+        return clause, params
+
+
+def _strictly_after(key: SortKey, value: Any) -> Tuple[Optional[str], List[Any]]:
+    if value is None:
+        # NULL é o último em DESC (nada depois) e o primeiro em ASC
+        return (None, []) if key.descending else (f"{key.column} IS NOT NULL", [])
+    if key.descending:
+        if key.nullable:
+            return f"({key.column} < ? OR {key.column} IS NULL)", [value]
+        return f"{key.column} < ?", [value]
+    return f"{key.column} > ?", [value]
+
+
+# Ordenação total das listagens da API (a última chave desempata)
+MEASUREMENT_KEYSET = Keyset((SortKey('date'), SortKey('id')))
+CALIBRATION_KEYSET = Keyset((SortKey('start_date', nullable=True), SortKey('id')))
+# alert.timestamp tem DEFAULT CURRENT_TIMESTAMP e nenhuma gravação o anula;
+# como não nula, a chave vira faixa do índice (com NULLs seria varredura)
+ALERT_KEYSET = Keyset((SortKey('timestamp'), SortKey('id')))
+CROSS_VALIDATION_KEYSET = Keyset((SortKey('date_ref'), SortKey('variable_code', descending=False),
+                                  SortKey('id', descending=False)))
+
+
+# ============================================================================
+# CURSOR
+# ============================================================================
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decodifica um cursor; ValueError se inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {e}")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor inválido para esta listagem")
+    # Só escalares viram parâmetros SQL (bool é int para o json, mas não é chave)
+    if any(isinstance(v, bool) or not isinstance(v, (str, int, float, type(None))) for v in values):
+        raise ValueError("Cursor inválido: valores devem ser escalares")
+    return values
+
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def iter_ndjson(cursor: sqlite3.Cursor, fetch_size: int = STREAM_FETCH_SIZE) -> Iterator[bytes]:
+    """Uma linha JSON por registro, buscando `fetch_size` linhas por vez."""
+    while True:
+        rows = cursor.fetchmany(fetch_size)
+        if not rows:
+            break
+        yield "".join(json.dumps(dict(row), default=str) + "\n" for row in rows).encode()
@@ -0,0 +1,239 @@
+"""
+MPFM Monitor - Consultor de índices
+Roda EXPLAIN QUERY PLAN sobre as consultas dos endpoints do dashboard e
+aponta varreduras completas (SCAN sem índice) nas tabelas grandes.
+
+Uso:
+    python -m backend.query_advisor                 # banco temporário com o schema atual
+    python -m backend.query_advisor --db data/mpfm_monitor.db
+    python -m backend.query_advisor --no-migrations # schema sem os índices das migrações
+
+Retorna código 1 se alguma consulta varrer uma tabela grande sem índice.
+"""
+import os
+import sys
+import importlib
+import sqlite3
+import argparse
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+# Tabelas que crescem com o histórico (dias x assets x variáveis).
+# daily_measurement_rollup fica de fora: uma linha por fonte/dia.
+LARGE_TABLES = {
+    'daily_measurement', 'alert', 'cross_validation', 'staged_file',
+    'fact_mpfm_production', 'fact_reconciliation_daily',
+}
+
+D1, D2 = '2025-01-01', '2025-01-31'
+
+
+# ============================================================================
+# CATÁLOGO DE CONSULTAS
+# ============================================================================
+
+def query_catalog() -> List[Tuple[str, str, tuple]]:
+    """
+    Consultas dos endpoints, com cada combinação de filtros usada pela API.
+    Manter em sincronia com main.py ao alterar um endpoint.
+    """
+    from backend.validators.reconciliation_v2 import ReconciliationValidatorV2
+    from backend.rollups import measurement_summary_query
+    from backend.exporter import EXPORT_TABLES, range_query
+    from backend.pagination import (
+        MEASUREMENT_KEYSET, CALIBRATION_KEYSET, ALERT_KEYSET, CROSS_VALIDATION_KEYSET, encode_cursor
+    )
+    
+    catalog = [
+        ("status: alertas ativos", "SELECT COUNT(*) FROM alert WHERE resolved = 0", ()),
+        ("status: último upload", "SELECT MAX(created_at) FROM staged_file", ()),
+    ]
+    
+    # /api/measurements/daily
+    for name, where, params in [
+        ("sem filtro", "", ()),
+        ("período", " AND date >= ? AND date <= ?", (D1, D2)),
+        ("fonte", " AND source = ?", ('PDF',)),
+        ("fonte + período", " AND date >= ? AND date <= ? AND source = ?", (D1, D2, 'PDF')),
+        ("asset", " AND asset_tag = ?", ('B03',)),
+        ("asset + período", " AND date >= ? AND date <= ? AND asset_tag = ?", (D1, D2, 'B03')),
+    ]:
+        catalog.append((f"measurements/daily: {name}",
+                        f"SELECT * FROM daily_measurement WHERE 1=1{where} "
+                        f"ORDER BY {MEASUREMENT_KEYSET.order_by()} LIMIT 100",
+                        params))
+    
+    # /api/measurements/summary (rollup)
+    catalog.append(("measurements/summary: sem filtro", *measurement_summary_query()))
+    catalog.append(("measurements/summary: período", *measurement_summary_query(D1, D2)))
+    
+    # /api/calibrations
+    calibration_order = CALIBRATION_KEYSET.order_by()
+    catalog.append(("calibrations: sem filtro",
+                    f"SELECT * FROM calibration WHERE 1=1 ORDER BY {calibration_order} LIMIT 50", ()))
+    catalog.append(("calibrations: asset",
+                    f"SELECT * FROM calibration WHERE 1=1 AND asset_tag = ? ORDER BY {calibration_order} LIMIT 50",
+                    ('B03',)))
+    
+    # /api/alerts
+    for name, where, params in [
+        ("sem filtro", "", ()),
+        ("severidade", " AND severity = ?", ('critical',)),
+        ("categoria", " AND category = ?", ('validation',)),
+        ("resolvido", " AND resolved = ?", (0,)),
+        ("severidade + resolvido", " AND severity = ? AND resolved = ?", ('critical', 0)),
+    ]:
+        catalog.append((f"alerts: {name}",
+                        f"SELECT * FROM alert WHERE 1=1{where} ORDER BY {ALERT_KEYSET.order_by()} LIMIT 100",
+                        params))
+    catalog.append(("alerts/active", """
+        SELECT * FROM alert WHERE resolved = 0
+        ORDER BY CASE severity WHEN 'critical' THEN 1 WHEN 'warning' THEN 2 ELSE 3 END,
+                 timestamp DESC
+    """, ()))
+    
+    # /api/validation/cross e /api/validation/summary
+    for name, where, params in [
+        ("sem filtro", "", ()),
+        ("período", " AND date_ref >= ? AND date_ref <= ?", (D1, D2)),
+        ("classificação", " AND classification = ?", ('INCONSISTENTE',)),
+        ("período + classificação", " AND date_ref >= ? AND date_ref <= ? AND classification = ?",
+         (D1, D2, 'INCONSISTENTE')),
+    ]:
+        catalog.append((f"validation/cross: {name}",
+                        f"SELECT * FROM cross_validation WHERE 1=1{where} "
+                        f"ORDER BY {CROSS_VALIDATION_KEYSET.order_by()} LIMIT 1000",
+                        params))
+    catalog.append(("validation/summary",
+                    "SELECT classification, COUNT(*) FROM cross_validation WHERE date_ref = ? GROUP BY classification",
+                    (D1,)))
+    
+    # Páginas seguintes (cursor keyset)
+    for name, table, keyset, cursor in [
+        ("measurements/daily", "daily_measurement", MEASUREMENT_KEYSET, ['2025-01-15', 900]),
+        ("calibrations", "calibration", CALIBRATION_KEYSET, ['2025-01-15', 40]),
+        ("alerts", "alert", ALERT_KEYSET, ['2025-01-15 10:00:00', 900]),
+        ("validation/cross", "cross_validation", CROSS_VALIDATION_KEYSET, ['2025-01-15', 'OIL', 900]),
+    ]:
+        clause, params = keyset.after(encode_cursor(cursor))
+        catalog.append((f"{name}: página seguinte",
+                        f"SELECT * FROM {table} WHERE 1=1 AND {clause} ORDER BY {keyset.order_by()} LIMIT 100",
+                        tuple(params)))
+    
+    # /api/export/daily-report
+    catalog.append(("export: medições do dia", "SELECT * FROM daily_measurement WHERE date = ?", (D1,)))
+    catalog.append(("export: validação do dia", "SELECT * FROM cross_validation WHERE date_ref = ?", (D1,)))
+    catalog.append(("export: alertas do dia",
+                    "SELECT * FROM alert WHERE timestamp >= ? AND timestamp < ?", (D1, '2025-01-02')))
+    
+    # /api/export/range (exporter.range_query)
+    for table in EXPORT_TABLES:
+        for name, asset_tag in [("período", None), ("período + asset", 'B03')]:
+            catalog.append((f"export/range {table}: {name}",
+                            *range_query(table, date.fromisoformat(D1), date.fromisoformat(D2), asset_tag)))
+    
+    # Reconciliação V2 (fetch_range)
+    validator = ReconciliationValidatorV2.__new__(ReconciliationValidatorV2)
+    catalog.append(("reconciliation_v2: período", validator.range_query(), (D1, D2)))
+    catalog.append(("reconciliation_v2: período + asset", validator.range_query(True), (D1, D2, 'B03')))
+    
+    return catalog
+
+
+# ============================================================================
+# ANÁLISE
+# ============================================================================
+
+def full_scans(plan: List[str]) -> List[str]:
+    """
+    Tabelas grandes percorridas por inteiro em um plano.
+    
+    SCAN com índice também percorre a tabela toda; só é aceito com índice
+    de cobertura ou quando o índice já entrega a ordem do ORDER BY (sem
+    TEMP B-TREE), caso em que o LIMIT encerra a leitura.
+    """
+    sorted_by_index = not any('TEMP B-TREE' in detail for detail in plan)
+    tables = []
+    for detail in plan:
+        parts = detail.split()
+        if len(parts) < 2 or parts[0] != 'SCAN' or parts[1] not in LARGE_TABLES:
+            continue
+        if 'COVERING' in parts:
+            continue
+        if 'INDEX' in parts and sorted_by_index:
+            continue
+        tables.append(parts[1])
+    return tables
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: tuple) -> List[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def analyze(conn: sqlite3.Connection, verbose: bool = False) -> Dict[str, List[str]]:
+    """Analisa o catálogo; retorna {consulta: tabelas varridas} dos problemas."""
+    problems = {}
+    
+    for name, sql, params in query_catalog():
+        plan = explain(conn, sql, params)
+        scans = full_scans(plan)
+        
+        print(f"{'❌' if scans else '✅'} {name}")
+        if verbose or scans:
+            for detail in plan:
+                print(f"      {detail}")
+        if scans:
+            problems[name] = scans
+    
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Consultor de índices das consultas do dashboard')
+    parser.add_argument('--db', help='Banco a analisar (padrão: banco temporário com o schema atual)')
+    parser.add_argument('--no-migrations', action='store_true',
+                        help='Não aplica as migrações no banco temporário')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Mostra todos os planos')
+    args = parser.parse_args()
+    
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            db_path = os.path.join(tmp, "advisor.db")
+            os.environ['DATABASE_PATH'] = db_path
+            os.environ.setdefault('UPLOAD_FOLDER', os.path.join(tmp, "uploads"))
+            os.environ.setdefault('EXPORT_FOLDER', os.path.join(tmp, "exports"))
+            os.environ.setdefault('PARSE_CACHE_FOLDER', os.path.join(tmp, "parse_cache"))
+            
+            # A importação de backend.main cria o schema (com migrações)
+            importlib.import_module("backend.main")
+            if args.no_migrations:
+                conn = sqlite3.connect(db_path)
+                for (index,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+                ).fetchall():
+                    conn.execute(f"DROP INDEX {index}")
+                conn.close()
+        
+        conn = sqlite3.connect(db_path)
+        problems = analyze(conn, args.verbose)
+        conn.close()
+    
+    if problems:
+        print(f"\n{len(problems)} consulta(s) com varredura completa:")
+        for name, tables in problems.items():
+            print(f"   {name}: {', '.join(tables)}")
+        sys.exit(1)
+    
+    print("\nNenhuma varredura completa em tabelas grandes")
+
+
+if __name__ == "__main__":
+    main()
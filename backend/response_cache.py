@@ -0,0 +1,127 @@
+"""
+MPFM Monitor - Cache de respostas da API
+Cache em processo para endpoints de leitura consultados por polling
+(/api/status, /api/validation/summary).
+
+Cada entrada vale até o TTL do endpoint ou até a próxima gravação
+relevante: uploads, alterações de alertas e execuções de validação
+chamam `invalidate`, que incrementa a geração e torna todas as entradas
+antigas inválidas. A resposta leva um ETag do conteúdo; um poll com
+If-None-Match igual recebe 304 sem corpo e, com a entrada válida, sem
+consultar o SQLite.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class ResponseCache:
+    """
+    Respostas JSON serializadas por chave (rota + query string), com TTL,
+    geração global e no máximo `max_entries` entradas (LRU).
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, float, str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+        self._invalidations = 0
+    
+    @property
+    def generation(self) -> int:
+        return self._generation
+    
+    def invalidate(self):
+        """Gravação relevante: descarta (logicamente) todas as entradas."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+    
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """(etag, corpo) se a entrada ainda for válida."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            generation, expires_at, etag, body = entry
+            if generation != self._generation or expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+    
+    def put(self, key: str, generation: int, ttl: float, content: Any) -> Tuple[str, bytes]:
+        """
+        Serializa e guarda `content` calculado na geração `generation`.
+        
+        Se houve invalidação durante o cálculo, o resultado é devolvido
+        mas não fica no cache.
+        """
+        body = json.dumps(jsonable_encoder(content), ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (generation, time.monotonic() + ttl, etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return etag, body
+    
+    def respond(self, request: Request, ttl: float, compute: Callable[[], Any]) -> Response:
+        """
+        Resposta do endpoint: cache -> 304/200; sem cache, `compute()` -> 200
+        (ou 304, se o conteúdo recalculado tiver o mesmo ETag do cliente).
+        """
+        key = request.url.path + "?" + str(request.query_params)
+        cached = self.get(key)
+        
+        if cached is not None:
+            etag, body = cached
+            with self._lock:
+                self._hits += 1
+        else:
+            generation = self._generation
+            etag, body = self.put(key, generation, ttl, compute())
+            with self._lock:
+                self._misses += 1
+        
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in _if_none_match(request):
+            with self._lock:
+                self._not_modified += 1
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    def stats(self) -> Dict[str, int]:
+        """Métricas do cache (expostas em /api/health)."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'generation': self._generation,
+                'hits': self._hits,
+                'misses': self._misses,
+                'not_modified': self._not_modified,
+                'invalidations': self._invalidations,
+            }
+
+
+def _if_none_match(request: Request) -> set:
+    header = request.headers.get("if-none-match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
@@ -0,0 +1,118 @@
+"""
+MPFM Monitor - Agregados pré-calculados
+daily_measurement_rollup guarda, por fonte x dia, a quantidade de linhas
+e soma/contagem/mínimo/máximo de cada fase. O resumo de medições combina
+essas linhas para qualquer janela de datas, sem percorrer o histórico.
+
+A manutenção é incremental: quem grava em daily_measurement chama
+refresh_measurement_rollup com as chaves (fonte, dia) afetadas, na mesma
+transação, e só esses dias são recalculados a partir da tabela base.
+Recalcular o dia (em vez de somar deltas) mantém mínimo/máximo corretos
+quando uma medição é substituída (INSERT OR REPLACE).
+"""
+import sqlite3
+from typing import Any, Iterable, List, Optional, Tuple
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+MEASUREMENT_PHASES = ('oil', 'gas', 'water', 'hc', 'total', 'bsw')
+
+_PHASE_COLUMNS = [f"{phase}_{agg}" for phase in MEASUREMENT_PHASES
+                  for agg in ('sum', 'count', 'min', 'max')]
+
+ROLLUP_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS daily_measurement_rollup (
+        source TEXT NOT NULL,
+        date DATE NOT NULL,
+        row_count INTEGER NOT NULL,
+        {', '.join(f"{c} {'INTEGER' if c.endswith('_count') else 'REAL'}" for c in _PHASE_COLUMNS)},
+        PRIMARY KEY (date, source)
+    )
+"""
+
+# Agregado de daily_measurement por fonte/dia (mesmas colunas da rollup)
+_ROLLUP_SELECT = f"""
+    SELECT source, date, COUNT(*),
+           {', '.join(f"SUM({p}), COUNT({p}), MIN({p}), MAX({p})" for p in MEASUREMENT_PHASES)}
+    FROM daily_measurement
+"""
+
+_ROLLUP_INSERT = f"""
+    INSERT INTO daily_measurement_rollup (source, date, row_count, {', '.join(_PHASE_COLUMNS)})
+"""
+
+ROLLUP_BACKFILL = _ROLLUP_INSERT + _ROLLUP_SELECT + " GROUP BY source, date"
+
+
+# ============================================================================
+# MANUTENÇÃO
+# ============================================================================
+
+def refresh_measurement_rollup(cursor: sqlite3.Cursor, keys: Iterable[Tuple[str, str]]) -> int:
+    """
+    Recalcula as linhas da rollup para as chaves (fonte, dia ISO) informadas.
+    
+    Não faz commit: deve rodar na transação que gravou as medições.
+    Dias sem medições restantes ficam sem linha na rollup.
+    
+    Returns:
+        Quantidade de chaves recalculadas
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return 0
+    
+    cursor.executemany("DELETE FROM daily_measurement_rollup WHERE source = ? AND date = ?", keys)
+    cursor.executemany(
+        _ROLLUP_INSERT + _ROLLUP_SELECT + " WHERE source = ? AND date = ? GROUP BY source, date",
+        keys
+    )
+    return len(keys)
+
+
+def rebuild_measurement_rollup(conn: sqlite3.Connection):
+    """Reconstrói a rollup inteira a partir de daily_measurement."""
+    conn.execute("DELETE FROM daily_measurement_rollup")
+    conn.execute(ROLLUP_BACKFILL)
+    conn.commit()
+
+
+# ============================================================================
+# CONSULTA
+# ============================================================================
+
+def measurement_summary_query(start: Optional[str] = None,
+                              end: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """
+    Resumo por fonte a partir da rollup (colunas de /api/measurements/summary).
+    
+    As médias são SUM(soma) / SUM(contagem) das fases, o que equivale ao
+    AVG sobre as medições (nulos ignorados; NULL se não houver valores).
+    """
+    averages = ", ".join(
+        f"SUM({p}_sum) / SUM({p}_count) AS avg_{p}" for p in ('oil', 'gas', 'water', 'hc', 'bsw')
+    )
+    query = f"""
+        SELECT
+            source,
+            SUM(row_count) AS count,
+            {averages},
+            MIN(date) AS first_date,
+            MAX(date) AS last_date
+        FROM daily_measurement_rollup
+        WHERE 1=1
+    """
+    params = []
+    
+    if start:
+        query += " AND date >= ?"
+        params.append(start)
+    
+    if end:
+        query += " AND date <= ?"
+        params.append(end)
+    
+    query += " GROUP BY source"
+    return query, params
@@ -3,6 +3,8 @@ SGM-FM - Reconciliation Validator (V2)
 Realiza a validação cruzada entre Hourly e Daily usando a nova tabela fact_mpfm_production.
 Conforme especificado em 05_validation_rules.md
 """
+import os
+import sys
 import sqlite3
 import json
 import logging
@@ -11,6 +13,15 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from enum import Enum
 
+# Kernel de comparação compartilhado com docs/MPFM_MONITOR
+DOCS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../docs"))
+if DOCS_PATH not in sys.path:
+    sys.path.append(DOCS_PATH)
+
+from MPFM_MONITOR.validators.comparison_kernel import (
+    compare_abs_and_pct, STATUS_SKIPPED, STATUS_OK, STATUS_WARN, STATUS_FAIL
+)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -55,6 +66,11 @@ class ValidationStatus(str, Enum):
     MISSING_DAILY = "MISSING_DAILY"
     MISSING_HOURLY = "MISSING_HOURLY"
 
+# Código do kernel de comparação -> status da métrica
+KERNEL_STATUS = {STATUS_OK: "PASS", STATUS_WARN: "WARN", STATUS_FAIL: "FAIL"}
+OVERALL_STATUS = {STATUS_OK: ValidationStatus.PASS, STATUS_WARN: ValidationStatus.WARN,
+                  STATUS_FAIL: ValidationStatus.FAIL}
+
 @dataclass
 class DailyValidationResult:
     business_date: str
@@ -75,148 +91,177 @@ class ReconciliationValidatorV2:
         self.pct_tol_vol = 0.005 # 0.5%
 
     def validate_date_range(self, start_date: date, end_date: date) -> List[DailyValidationResult]:
-        """Valida um range de datas para todos os assets."""
+        """
+        Valida um range de datas para todos os assets.
+        
+        Set-based: uma consulta agrega todas as horárias do período por
+        (asset_tag, business_date) e junta com o registro diário; a
+        classificação roda coluna a coluna sobre todos os pares e a
+        gravação usa executemany.
+        """
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        # Buscar Assets ativos no período
-        cursor.execute("""
-            SELECT DISTINCT asset_tag 
-            FROM fact_mpfm_production 
-            WHERE business_date BETWEEN ? AND ?
-        """, (start_date, end_date))
-        
-        assets = [r['asset_tag'] for r in cursor.fetchall()]
-        results = []
-
-        for asset in assets:
-            # Para cada dia no range (simplificado: pegando dias com dados)
-            cursor.execute("""
-                SELECT DISTINCT business_date 
-                FROM fact_mpfm_production 
-                WHERE asset_tag = ? AND business_date BETWEEN ? AND ?
-            """, (asset, start_date, end_date))
-            
-            dates = [r['business_date'] for r in cursor.fetchall()]
-            
-            for d_str in dates:
-                res = self.validate_asset_day(cursor, asset, d_str)
-                self.persist_result(cursor, res)
-                results.append(res)
+        rows = self.fetch_range(cursor, start_date, end_date)
+        results = self.classify_rows(rows)
+        self.persist_results(cursor, results)
         
         conn.commit()
         conn.close()
         return results
 
-    def validate_asset_day(self, cursor: sqlite3.Cursor, asset_tag: str, business_date: str) -> DailyValidationResult:
-        result = DailyValidationResult(business_date=business_date, asset_tag=asset_tag)
-        
-        # 1. Obter Daily
-        cursor.execute("""
-            SELECT * FROM fact_mpfm_production 
-            WHERE asset_tag = ? AND business_date = ? AND report_type = 'DAILY'
-        """, (asset_tag, business_date))
-        daily_row = cursor.fetchone()
+    def fetch_range(self, cursor: sqlite3.Cursor, start_date, end_date,
+                    asset_tag: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        Pares (asset_tag, business_date) com dados no período, já com a
+        contagem e as somas das horárias e as métricas do diário.
         
-        if daily_row:
-            result.has_daily = True
-            
-        # 2. Obter Hourly Sum
-        # Dynamically build SUM query
-        sum_cols = [f"SUM({m[0]}) as sum_{m[0]}" for m in METRICS_MAP]
-        query = f"""
-            SELECT COUNT(*) as count, {', '.join(sum_cols)}
-            FROM fact_mpfm_production
-            WHERE asset_tag = ? AND business_date = ? AND report_type = 'HOURLY'
+        O diário de cada par é o de menor period_end (mesmo registro que
+        a busca por asset/data retornava via índice UNIQUE).
         """
-        cursor.execute(query, (asset_tag, business_date))
-        hourly_row = cursor.fetchone()
+        params = [start_date, end_date] + ([asset_tag] if asset_tag is not None else [])
+        cursor.execute(self.range_query(asset_tag is not None), params)
+        return cursor.fetchall()
+    
+    def range_query(self, by_asset: bool = False) -> str:
+        """SQL de fetch_range (parâmetros: início, fim[, asset_tag])."""
+        asset_filter = "AND asset_tag = ?" if by_asset else ""
+        sum_cols = ", ".join(f"SUM({m[0]}) AS sum_{m[0]}" for m in METRICS_MAP)
+        daily_cols = ", ".join(f"d.{m[1]} AS daily_{m[1]}" for m in METRICS_MAP)
+        hourly_cols = ", ".join(f"h.sum_{m[0]}" for m in METRICS_MAP)
         
-        result.hourly_count = hourly_row['count']
+        return f"""
+            WITH range_rows AS (
+                SELECT * FROM fact_mpfm_production
+                WHERE business_date BETWEEN ? AND ? {asset_filter}
+            ),
+            hourly AS (
+                SELECT asset_tag, business_date, COUNT(*) AS hourly_count, {sum_cols}
+                FROM range_rows
+                WHERE report_type = 'HOURLY'
+                GROUP BY asset_tag, business_date
+            ),
+            daily AS (
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY asset_tag, business_date ORDER BY period_end, fact_id
+                    ) AS rn
+                    FROM range_rows
+                    WHERE report_type = 'DAILY'
+                ) WHERE rn = 1
+            ),
+            pairs AS (
+                SELECT DISTINCT asset_tag, business_date FROM range_rows
+            )
+            SELECT p.asset_tag, p.business_date,
+                   COALESCE(h.hourly_count, 0) AS hourly_count,
+                   d.fact_id IS NOT NULL AS has_daily,
+                   {daily_cols}, {hourly_cols}
+            FROM pairs p
+            LEFT JOIN hourly h ON h.asset_tag = p.asset_tag AND h.business_date = p.business_date
+            LEFT JOIN daily d ON d.asset_tag = p.asset_tag AND d.business_date = p.business_date
+            ORDER BY p.asset_tag, p.business_date
+        """
+
+    def classify_rows(self, rows: List[sqlite3.Row]) -> List[DailyValidationResult]:
+        """Classifica todos os pares: status de presença e, depois, métrica a métrica."""
+        results = []
+        comparable = []
         
-        # 3. Validar
-        if not result.has_daily:
-            result.validation_status = ValidationStatus.MISSING_DAILY
-            return result
+        for row in rows:
+            result = DailyValidationResult(
+                business_date=row['business_date'],
+                asset_tag=row['asset_tag'],
+                hourly_count=row['hourly_count'],
+                has_daily=bool(row['has_daily'])
+            )
             
-        if result.hourly_count < 24:
-             # Pode ser parcial, mas vamos flagar warning se for muito baixo ou fail se zero
-             if result.hourly_count == 0:
-                 result.validation_status = ValidationStatus.MISSING_HOURLY
-                 # No hourly data to compare
-                 return result
+            if not result.has_daily:
+                result.validation_status = ValidationStatus.MISSING_DAILY
+            elif result.hourly_count == 0:
+                # No hourly data to compare
+                result.validation_status = ValidationStatus.MISSING_HOURLY
+            else:
+                comparable.append((result, row))
+            
+            results.append(result)
         
-        # Comparar métricas
-        overall_status = ValidationStatus.PASS
+        if not comparable:
+            return results
         
-        for metric_col, _ in METRICS_MAP:
-            daily_val = daily_row[metric_col]
-            sum_val = hourly_row[f"sum_{metric_col}"]
-            
-            # Skip if both None
-            if daily_val is None and sum_val is None:
-                continue
-                
-            # Treat None as 0 for comparison if one is missing? Or fail?
-            # Standard: if one exists and other is None/Zero, it's a diff
-            d = daily_val or 0.0
-            h = sum_val or 0.0
-            
-            # Determine tolerance type
-            is_vol = 'vol' in metric_col or 'sm3' in metric_col
-            abs_tol = self.abs_tol_vol if is_vol else self.abs_tol_mass
-            pct_tol = self.pct_tol_vol if is_vol else self.pct_tol_mass
-            
-            diff_abs = abs(d - h)
-            # Avoid division by zero
-            diff_pct = (diff_abs / d) if abs(d) > 1e-6 else (1.0 if diff_abs > abs_tol else 0.0)
-            
-            status = "PASS"
-            if diff_abs > abs_tol and diff_pct > pct_tol:
-                status = "FAIL"
-                overall_status = ValidationStatus.FAIL
-            elif diff_abs > (abs_tol * 0.8): # Near limit
-                 status = "WARN"
-                 if overall_status == ValidationStatus.PASS:
-                     overall_status = ValidationStatus.WARN
-            
-            result.metrics[metric_col] = {
-                "daily": d,
-                "sum_hourly": h,
-                "diff_abs": diff_abs,
-                "diff_pct": diff_pct,
-                "status": status
-            }
+        # Comparação colunar: pares comparáveis x métricas
+        metric_cols = [m[0] for m in METRICS_MAP]
+        is_vol = ['vol' in col or 'sm3' in col for col in metric_cols]
+        daily = [[row[f"daily_{col}"] for col in metric_cols] for _, row in comparable]
+        sums = [[row[f"sum_{col}"] for col in metric_cols] for _, row in comparable]
+        
+        arrays = compare_abs_and_pct(
+            daily, sums,
+            [self.abs_tol_vol if vol else self.abs_tol_mass for vol in is_vol],
+            [self.pct_tol_vol if vol else self.pct_tol_mass for vol in is_vol]
+        )
+        diff_abs, diff_pct, _, status = arrays.to_lists()
+        
+        for i, (result, _) in enumerate(comparable):
+            for j, metric_col in enumerate(metric_cols):
+                if status[i][j] == STATUS_SKIPPED:
+                    continue
+                result.metrics[metric_col] = {
+                    "daily": daily[i][j] or 0.0,
+                    "sum_hourly": sums[i][j] or 0.0,
+                    "diff_abs": diff_abs[i][j],
+                    "diff_pct": diff_pct[i][j],
+                    "status": KERNEL_STATUS[status[i][j]]
+                }
             
-        result.validation_status = overall_status
-        return result
+            worst = max((s for s in status[i] if s != STATUS_SKIPPED), default=STATUS_OK)
+            result.validation_status = OVERALL_STATUS[worst]
+        
+        return results
+
+    def validate_asset_day(self, cursor: sqlite3.Cursor, asset_tag: str, business_date: str) -> DailyValidationResult:
+        """Valida um único par asset/dia (mesma lógica do range)."""
+        rows = self.fetch_range(cursor, business_date, business_date, asset_tag)
+        if not rows:
+            return DailyValidationResult(business_date=business_date, asset_tag=asset_tag,
+                                         validation_status=ValidationStatus.MISSING_DAILY)
+        return self.classify_rows(rows)[0]
 
     def persist_result(self, cursor: sqlite3.Cursor, res: DailyValidationResult):
-        # Update fact_reconciliation_daily
-        # First, clear old validation for this day/asset
-        cursor.execute("""
+        self.persist_results(cursor, [res])
+
+    def persist_results(self, cursor: sqlite3.Cursor, results: List[DailyValidationResult]):
+        """Grava os resultados em lote (DELETE/INSERT via executemany)."""
+        # Limpar validações anteriores dos pares validados
+        cursor.executemany("""
             DELETE FROM fact_reconciliation_daily
             WHERE business_date = ? AND asset_tag = ?
-        """, (res.business_date, res.asset_tag))
+        """, [(res.business_date, res.asset_tag) for res in results])
         
-        # Persist metrics status
-        for metric, data in res.metrics.items():
-            if data['status'] != 'PASS': # Only persist significant diffs or all? Spec says "PASS/WARN/FAIL".
-                 cursor.execute("""
-                    INSERT INTO fact_reconciliation_daily
-                    (business_date, asset_tag, metric_name, daily_value, sum_hourly_value, diff_abs, diff_pct, status, details)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                 """, (
-                     res.business_date, res.asset_tag, metric,
-                     data['daily'], data['sum_hourly'], data['diff_abs'], data['diff_pct'],
-                     data['status'], f"Reconciliação V2: {res.validation_status.value}"
-                 ))
+        # Persistir apenas métricas fora de PASS (WARN/FAIL)
+        cursor.executemany("""
+            INSERT INTO fact_reconciliation_daily
+            (business_date, asset_tag, metric_name, daily_value, sum_hourly_value, diff_abs, diff_pct, status, details)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                res.business_date, res.asset_tag, metric,
+                data['daily'], data['sum_hourly'], data['diff_abs'], data['diff_pct'],
+                data['status'], f"Reconciliação V2: {res.validation_status.value}"
+            )
+            for res in results
+            for metric, data in res.metrics.items()
+            if data['status'] != 'PASS'
+        ])
         
-        # Also, we might want to update a "Completeness" table
-        cursor.execute("""
+        # Completude por par
+        cursor.executemany("""
             INSERT OR REPLACE INTO fact_completeness
             (date_ref, meter_tag, found_hourly, has_daily, status)
             VALUES (?, ?, ?, ?, ?)
-        """, (res.business_date, res.asset_tag, res.hourly_count, 1 if res.has_daily else 0, res.validation_status.value))
-
+        """, [
+            (res.business_date, res.asset_tag, res.hourly_count, 1 if res.has_daily else 0,
+             res.validation_status.value)
+            for res in results
+        ])
@@ -0,0 +1,144 @@
+"""
+SGM-FM - Escritor de Lote
+Conexão única de escrita usada pelo pipeline durante um lote.
+Agrupa os inserts em transações por volume de linhas ou por tempo.
+"""
+import time
+import sqlite3
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Limites padrão para fechar uma transação
+DEFAULT_COMMIT_ROWS = 5000
+DEFAULT_COMMIT_SECONDS = 2.0
+
+
+# ============================================================================
+# CLASSE: BatchWriter
+# ============================================================================
+
+class BatchWriter:
+    """
+    Escritor único do lote.
+    
+    Mantém uma conexão aberta durante todo o lote e faz commit somente
+    quando a transação atinge `commit_rows` linhas alteradas ou
+    `commit_seconds` de duração. Cada unidade de trabalho (um arquivo,
+    um registro) roda em um SAVEPOINT, de modo que uma falha desfaz
+    apenas as linhas dela, sem perder o restante da transação.
+    """
+    
+    def __init__(self, db_path: str, commit_rows: int = DEFAULT_COMMIT_ROWS,
+                 commit_seconds: float = DEFAULT_COMMIT_SECONDS):
+        self.db_path = db_path
+        self.commit_rows = commit_rows
+        self.commit_seconds = commit_seconds
+        
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened_at = 0.0
+        self._closed_at = 0.0
+        self._txn_started_at = 0.0
+        self._changes_at_commit = 0
+        self._commits = 0
+        self._rows_written = 0
+    
+    def open(self) -> 'BatchWriter':
+        """Abre a conexão (transações controladas manualmente)."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, isolation_level=None)
+            self._opened_at = time.perf_counter()
+            self._changes_at_commit = 0
+        return self
+    
+    def close(self) -> None:
+        """Confirma a transação pendente e fecha a conexão."""
+        if self._conn is None:
+            return
+        
+        try:
+            self.commit()
+        finally:
+            self._rows_written = self._conn.total_changes
+            self._closed_at = time.perf_counter()
+            self._conn.close()
+            self._conn = None
+    
+    def __enter__(self) -> 'BatchWriter':
+        return self.open()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and self._conn is not None and self._conn.in_transaction:
+            self._conn.rollback()
+        self.close()
+    
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("BatchWriter não está aberto")
+        return self._conn
+    
+    @contextmanager
+    def savepoint(self) -> Iterator[sqlite3.Connection]:
+        """
+        Unidade de trabalho dentro da transação corrente.
+        
+        Em caso de exceção desfaz apenas o que foi escrito no bloco.
+        """
+        conn = self.connection
+        
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+            self._txn_started_at = time.perf_counter()
+        
+        conn.execute("SAVEPOINT batch_writer")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK TO batch_writer")
+            conn.execute("RELEASE batch_writer")
+            raise
+        conn.execute("RELEASE batch_writer")
+    
+    def maybe_commit(self) -> bool:
+        """Faz commit se a transação atingiu o limite de linhas ou de tempo."""
+        conn = self.connection
+        if not conn.in_transaction:
+            return False
+        
+        pending = conn.total_changes - self._changes_at_commit
+        age = time.perf_counter() - self._txn_started_at
+        
+        if pending >= self.commit_rows or age >= self.commit_seconds:
+            self.commit()
+            return True
+        return False
+    
+    def commit(self) -> None:
+        """Confirma a transação corrente (se houver)."""
+        conn = self.connection
+        if conn.in_transaction:
+            conn.commit()
+            self._commits += 1
+        self._changes_at_commit = conn.total_changes
+    
+    def stats(self) -> Dict:
+        """Estatísticas de escrita do lote."""
+        rows = self._conn.total_changes if self._conn is not None else self._rows_written
+        end = self._closed_at if self._conn is None else time.perf_counter()
+        elapsed = end - self._opened_at if self._opened_at else 0.0
+        
+        return {
+            'rows_written': rows,
+            'commits': self._commits,
+            'elapsed': elapsed,
+            'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0
+        }
@@ -0,0 +1,104 @@
+"""
+SGM-FM - Microbenchmark do kernel de comparação
+Mede o custo por comparação (asset/dia x métrica) das duas regras do
+kernel, com NumPy e com o fallback em Python, contra a comparação
+escalar métrica a métrica usada antes pelos motores.
+
+Uso:
+    python benchmarks/bench_comparison_kernel.py --rows 10000 --metrics 16
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from validators import comparison_kernel as kernel
+
+
+def synthetic_matrices(rows: int, metrics: int, seed: int = 42):
+    """Somas horárias e diários com ~2% nulos e ruído em torno da tolerância."""
+    rng = random.Random(seed)
+    sums, daily = [], []
+    for _ in range(rows):
+        s_row, d_row = [], []
+        for _ in range(metrics):
+            s = rng.uniform(10, 5000)
+            d = s + rng.choice([0.0, 0.005, 0.3, 0.45, 3.0, 25.0])
+            s_row.append(None if rng.random() < 0.02 else s)
+            d_row.append(None if rng.random() < 0.02 else d)
+        sums.append(s_row)
+        daily.append(d_row)
+    return sums, daily
+
+
+def scalar_tolerance_band(sums, daily, abs_tol=0.01, rel_tol=0.0005):
+    """Comparação escalar (regra PRD), como _compare_metric fazia por métrica."""
+    out = []
+    for s_row, d_row in zip(sums, daily):
+        for s, d in zip(s_row, d_row):
+            if s is None or d is None:
+                out.append(None)
+                continue
+            delta = abs(s - d)
+            tol = max(abs_tol, abs(d) * rel_tol)
+            out.append(0 if delta <= tol else 1 if delta <= tol * 2 else 2)
+    return out
+
+
+def timed(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark do kernel de comparação')
+    parser.add_argument('--rows', '-r', type=int, default=10000, help='Pares asset/dia')
+    parser.add_argument('--metrics', '-m', type=int, default=16, help='Métricas por par')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    sums, daily = synthetic_matrices(args.rows, args.metrics)
+    comparisons = args.rows * args.metrics
+    numpy_module = kernel.np
+    
+    def band():
+        kernel.compare_tolerance_band(sums, daily, 0.01, 0.0005).to_lists()
+    
+    def abs_pct():
+        kernel.compare_abs_and_pct(daily, sums, 0.5, 0.005).to_lists()
+    
+    cases = [('escalar (laço por métrica)', lambda: scalar_tolerance_band(sums, daily))]
+    
+    kernel.np = None
+    cases_python = [('kernel PRD (Python)', band), ('kernel V2 (Python)', abs_pct)]
+    results = [(name, timed(func, args.repeat)) for name, func in cases + cases_python]
+    kernel.np = numpy_module
+    
+    if numpy_module is not None:
+        results += [(name, timed(func, args.repeat))
+                    for name, func in [('kernel PRD (NumPy)', band), ('kernel V2 (NumPy)', abs_pct)]]
+        
+        # Só o cálculo, com as matrizes já em ndarray (sem conversão de listas)
+        sums_array = numpy_module.array(sums, dtype=float)
+        daily_array = numpy_module.array(daily, dtype=float)
+        results.append(('kernel PRD (NumPy, ndarray)', timed(
+            lambda: kernel.compare_tolerance_band(sums_array, daily_array, 0.01, 0.0005), args.repeat)))
+        results.append(('kernel V2 (NumPy, ndarray)', timed(
+            lambda: kernel.compare_abs_and_pct(daily_array, sums_array, 0.5, 0.005), args.repeat)))
+    else:
+        print("NumPy não instalado: apenas o fallback em Python foi medido")
+    
+    print(f"🔢 {args.rows} pares x {args.metrics} métricas = {comparisons} comparações")
+    for name, elapsed in results:
+        print(f"   {name:28s} {elapsed * 1000:8.1f} ms  {elapsed / comparisons * 1e9:7.0f} ns/comparação")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+SGM-FM - Benchmark da validação cruzada multi-fonte
+Gera fatos Excel/XML/PDF para N assets x D dias e compara o laço
+validate_date dia a dia (três consultas, gravação e histórico por dia)
+com CrossValidator.validate_range (uma carga e uma passada). Mede também
+a carga dos fatos do período pelos joins nas tabelas de origem e pela
+varredura de measurement_fact.
+
+Uso:
+    python benchmarks/bench_cross_validation.py --assets 8 --days 365
+"""
+import sys
+import time
+import shutil
+import sqlite3
+import logging
+import argparse
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import populate_cross_sources
+from validators.cross_validator import CrossValidator
+
+SCHEMA = Path(__file__).parent.parent / "database" / "schema.sql"
+START = date(2025, 1, 1)
+
+# Tabelas comparadas entre os dois fluxos (sem ids/timestamps)
+SNAPSHOTS = {
+    'cross_validation_result': """
+        SELECT asset_id, date_ref, time_window, variable_code, value_excel, value_xml, value_pdf,
+               sources_count, classification, max_deviation_abs, tolerance_applied, comparison_details
+        FROM cross_validation_result ORDER BY 1, 2, 3, 4
+    """,
+    'inconsistency_history': """
+        SELECT asset_id, variable_code, first_occurrence, last_occurrence, consecutive_days, status
+        FROM inconsistency_history ORDER BY 1, 2, 3
+    """,
+    'nonconformance': """
+        SELECT asset_id, unique_event_id, occurrence_datetime, variable_affected, deviation_description
+        FROM nonconformance ORDER BY 2
+    """,
+}
+
+
+def per_day(db_path: str, start: date, end: date) -> None:
+    validator = CrossValidator(db_path, materialized=True)
+    current = start
+    while current <= end:
+        validator.validate_date(current)
+        current += timedelta(days=1)
+
+
+def snapshot(db_path: str):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {table: conn.execute(query).fetchall() for table, query in SNAPSHOTS.items()}
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark validação cruzada')
+    parser.add_argument('--assets', '-a', type=int, default=8, help='Quantidade de assets')
+    parser.add_argument('--days', '-d', type=int, default=365, help='Dias de dados')
+    args = parser.parse_args()
+    logging.getLogger('validators.cross_validator').setLevel(logging.ERROR)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        base_db = str(tmp / "base.db")
+        conn = sqlite3.connect(base_db)
+        conn.executescript(SCHEMA.read_text(encoding='utf-8'))
+        rows = populate_cross_sources(conn, n_assets=args.assets, days=args.days, start=START)
+        conn.close()
+        end = START + timedelta(days=args.days - 1)
+        
+        # Materialização (backfill do período)
+        validator = CrossValidator(base_db, materialized=True)
+        start = time.perf_counter()
+        facts = validator.materialize_facts(START, end)
+        materialize_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        validator.load_source_facts(START, end)
+        joins_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        validator.load_fact_store(START, end)
+        scan_time = time.perf_counter() - start
+        
+        loop_db = str(tmp / "loop.db")
+        range_db = str(tmp / "range.db")
+        shutil.copy(base_db, loop_db)
+        shutil.copy(base_db, range_db)
+        
+        start = time.perf_counter()
+        per_day(loop_db, START, end)
+        loop_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        CrossValidator(range_db, materialized=True).validate_range(START, end)
+        range_time = time.perf_counter() - start
+        
+        loop_rows = snapshot(loop_db)
+        range_rows = snapshot(range_db)
+    
+    print(f"🔀 {args.assets} assets x {args.days} dias: {rows} linhas de origem, {facts} fatos")
+    print(f"   materialize_facts:      {materialize_time:7.2f}s  (backfill)")
+    print(f"   carga via joins:        {joins_time:7.2f}s")
+    print(f"   carga measurement_fact: {scan_time:7.2f}s")
+    print(f"   validate_date por dia:  {loop_time:7.2f}s")
+    print(f"   validate_range:         {range_time:7.2f}s  ({loop_time / range_time:.1f}x)")
+    for table in SNAPSHOTS:
+        same = 'idêntico' if loop_rows[table] == range_rows[table] else 'DIVERGENTE'
+        print(f"   {table:24s} {len(range_rows[table]):7d} linhas  {same}")
+
+
+if __name__ == "__main__":
+    main()
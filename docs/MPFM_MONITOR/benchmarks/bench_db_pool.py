@@ -0,0 +1,150 @@
+"""
+SGM-FM - Benchmark do pool de conexões do backend
+Compara o get_db anterior (sqlite3.connect por request, journal padrão)
+com o ConnectionPool (WAL + PRAGMAs): custo por request das consultas de
+/api/status e latência de leitores concorrentes enquanto um escritor
+grava em transações (como um job de ingestão).
+
+Uso:
+    python benchmarks/bench_db_pool.py --requests 2000 --readers 4 --seconds 3
+"""
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.db_pool import ConnectionPool
+
+STATUS_QUERIES = [
+    "SELECT COUNT(*) FROM sqlite_master WHERE type='table'",
+    "SELECT MAX(created_at) FROM staged_file",
+    "SELECT COUNT(*) FROM alert WHERE resolved = 0",
+]
+
+
+def create_db(db_path: str, wal: bool, alerts: int = 20000):
+    conn = sqlite3.connect(db_path)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE staged_file (id INTEGER PRIMARY KEY, created_at TIMESTAMP)")
+    conn.execute("CREATE TABLE alert (id INTEGER PRIMARY KEY, resolved INTEGER, timestamp TIMESTAMP)")
+    conn.execute("CREATE INDEX idx_alert_resolved ON alert(resolved, timestamp)")
+    conn.executemany("INSERT INTO alert (resolved, timestamp) VALUES (?, datetime('now'))",
+                     ((i % 7 == 0,) for i in range(alerts)))
+    conn.commit()
+    conn.close()
+
+
+class ConnectPerRequest:
+    """get_db anterior: conexão nova a cada request."""
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+    
+    def checkout(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def checkin(self, conn):
+        conn.close()
+
+
+def status_request(provider) -> float:
+    start = time.perf_counter()
+    conn = provider.checkout()
+    try:
+        for sql in STATUS_QUERIES:
+            conn.execute(sql).fetchone()
+    finally:
+        provider.checkin(conn)
+    return time.perf_counter() - start
+
+
+def sequential(provider, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        status_request(provider)
+    return (time.perf_counter() - start) / requests
+
+
+def concurrent(db_path: str, readers, readers_count: int, seconds: float):
+    """Leitores em laço enquanto um escritor grava lotes de 500 linhas por transação."""
+    stop = threading.Event()
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    
+    def reader():
+        while not stop.is_set():
+            try:
+                elapsed = status_request(readers)
+                with lock:
+                    latencies.append(elapsed)
+            except sqlite3.OperationalError:
+                with lock:
+                    errors[0] += 1
+    
+    def writer():
+        conn = sqlite3.connect(db_path, timeout=30)
+        while not stop.is_set():
+            conn.executemany("INSERT INTO alert (resolved, timestamp) VALUES (0, datetime('now'))",
+                             ((),) * 500)
+            conn.execute("INSERT INTO staged_file (created_at) VALUES (datetime('now'))")
+            time.sleep(0.002)   # parsing entre lotes
+            conn.commit()
+        conn.close()
+    
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader)
+                                                   for _ in range(readers_count)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else float('nan')
+    return len(latencies), errors[0], p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do pool de conexões SQLite')
+    parser.add_argument('--requests', '-n', type=int, default=2000, help='Requests sequenciais')
+    parser.add_argument('--readers', '-r', type=int, default=4, help='Leitores concorrentes')
+    parser.add_argument('--seconds', '-s', type=float, default=3.0, help='Duração do teste concorrente')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = str(Path(tmp) / "legacy.db")
+        pooled_db = str(Path(tmp) / "pooled.db")
+        create_db(legacy_db, wal=False)
+        create_db(pooled_db, wal=True)
+        
+        legacy = ConnectPerRequest(legacy_db)
+        pool = ConnectionPool(pooled_db, size=args.readers, readonly=True)
+        
+        legacy_seq = sequential(legacy, args.requests)
+        pool_seq = sequential(pool, args.requests)
+        legacy_conc = concurrent(legacy_db, legacy, args.readers, args.seconds)
+        pool_conc = concurrent(pooled_db, pool, args.readers, args.seconds)
+        pool_stats = pool.stats()
+        pool.close()
+    
+    print(f"🔌 /api/status sequencial ({args.requests} requests)")
+    print(f"   connect por request:  {legacy_seq * 1e6:8.0f} µs/request")
+    print(f"   pool (WAL):           {pool_seq * 1e6:8.0f} µs/request  ({legacy_seq / pool_seq:.1f}x)")
+    print(f"👥 {args.readers} leitores + 1 escritor por {args.seconds:.0f}s")
+    for name, (done, errors, p95) in [("connect por request", legacy_conc), ("pool (WAL)", pool_conc)]:
+        print(f"   {name:20s} {done:7d} requests  {errors:5d} erros 'locked'  p95 {p95 * 1000:7.2f} ms")
+    print(f"   métricas do pool: {pool_stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+SGM-FM - Benchmark do canal de eventos (SSE) vs polling de alertas
+Simula D dashboards abertos por uma janela de M minutos com C mudanças
+de alertas no período:
+
+- polling: cada dashboard chama /api/alerts/active a cada P segundos
+  (ordenação CASE severity sobre todos os alertas ativos). O custo por
+  poll é medido numa amostra pelo TestClient e extrapolado para a janela.
+- SSE: cada dashboard recebe um snapshot ao conectar e depois só os C
+  eventos, publicados por publish_alert (uma leitura por chave primária
+  no caminho de escrita) e distribuídos pelo EventBus a D assinantes.
+
+Uso:
+    python benchmarks/bench_event_bus.py --dashboards 50 --minutes 10 --interval 5 --active 2000
+"""
+import os
+import sys
+import time
+import asyncio
+import sqlite3
+import logging
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+
+
+def measure_polling(client, pool, samples: int):
+    before = pool.stats()['checkouts']
+    start = time.perf_counter()
+    for _ in range(samples):
+        client.get("/api/alerts/active")
+    elapsed = time.perf_counter() - start
+    return elapsed / samples, (pool.stats()['checkouts'] - before) / samples
+
+
+async def measure_sse(backend, dashboards: int, changes: int):
+    read_before = backend.read_pool.stats()['checkouts']
+    start = time.perf_counter()
+    subscriptions = [backend.event_bus.subscribe() for _ in range(dashboards)]
+    for _ in range(dashboards):
+        await asyncio.get_running_loop().run_in_executor(None, backend.compute_event_snapshot)
+    snapshot_time = time.perf_counter() - start
+    snapshot_reads = backend.read_pool.stats()['checkouts'] - read_before
+    
+    def writer():
+        with backend.write_pool.connection() as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM alert WHERE resolved = 0 LIMIT ?", (changes,))]
+            for alert_id in ids:
+                backend.publish_alert(conn, alert_id, "acknowledged")
+    
+    start = time.perf_counter()
+    thread = threading.Thread(target=writer)
+    thread.start()
+    received = 0
+    for subscription in subscriptions:
+        for _ in range(changes):
+            if await subscription.next(10) is not None:
+                received += 1
+    thread.join()
+    delivery_time = time.perf_counter() - start
+    
+    for subscription in subscriptions:
+        subscription.close()
+    return snapshot_time, snapshot_reads, delivery_time, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SSE vs polling de alertas')
+    parser.add_argument('--dashboards', '-d', type=int, default=50, help='Dashboards abertos')
+    parser.add_argument('--minutes', '-m', type=float, default=10, help='Janela simulada (min)')
+    parser.add_argument('--interval', '-p', type=float, default=5, help='Intervalo de polling (s)')
+    parser.add_argument('--changes', '-c', type=int, default=100, help='Mudanças de alertas na janela')
+    parser.add_argument('--active', type=int, default=2000, help='Alertas ativos no banco')
+    parser.add_argument('--samples', type=int, default=200, help='Polls medidos (amostra)')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / "bench.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        os.environ['EVENT_BUS_QUEUE'] = str(max(256, args.changes + 1))
+        sys.path.insert(0, str(ROOT))
+        
+        from fastapi.testclient import TestClient
+        from backend import main as backend
+        
+        conn = sqlite3.connect(backend.DATABASE_PATH)
+        conn.executemany("""
+            INSERT INTO alert (meter_tag, category, severity, title, description, resolved)
+            VALUES (?, 'balance', ?, 't', 'd', 0)
+        """, ((f"M{i % 40:02d}", ['critical', 'warning', 'info'][i % 3]) for i in range(args.active)))
+        conn.commit()
+        conn.close()
+        
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        client = TestClient(backend.app)
+        per_poll, reads_per_poll = measure_polling(client, backend.read_pool, args.samples)
+        snapshot_time, snapshot_reads, delivery_time, received = asyncio.run(
+            measure_sse(backend, args.dashboards, args.changes))
+    
+    polls = int(args.dashboards * args.minutes * 60 / args.interval)
+    print(f"📡 {args.dashboards} dashboards, {args.minutes:g} min, {args.changes} mudanças, "
+          f"{args.active} alertas ativos")
+    print(f"   polling a cada {args.interval:g}s: {polls} polls, "
+          f"{polls * reads_per_poll:.0f} consultas ao SQLite, "
+          f"~{polls * per_poll:.1f}s de servidor ({per_poll * 1e3:.2f} ms/poll)")
+    print(f"   SSE: {snapshot_reads} snapshots ({snapshot_time:.2f}s) + {args.changes} leituras por PK; "
+          f"{received} eventos entregues em {delivery_time:.2f}s "
+          f"({delivery_time / max(1, received) * 1e6:.0f} µs/entrega)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+SGM-FM - Benchmark do DatabaseLoader (Excel)
+Compara a carga linha a linha com o caminho bulk (mapas de IDs +
+executemany) em uma planilha Daily sintética grande.
+
+Uso:
+    python benchmarks/bench_excel_loader.py --tags 80 --variables 60 --repeat 3
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from extractors.excel_extractor import ExcelExtractor, DatabaseLoader
+from benchmarks.synthetic import build_daily_workbook, create_loader_db
+
+
+def time_load(extraction, db_path: str, bulk: bool) -> float:
+    """Carrega a extração em um banco vazio e retorna o tempo (s)."""
+    create_loader_db(db_path)
+    
+    start = time.perf_counter()
+    DatabaseLoader(db_path, bulk=bulk).load(extraction)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DatabaseLoader (Excel)')
+    parser.add_argument('--tags', type=int, default=80, help='Medidores na planilha')
+    parser.add_argument('--variables', type=int, default=60, help='Variáveis por bloco')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por modo')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = build_daily_workbook(str(Path(tmp) / "Daily_Oil_synthetic.xlsx"),
+                                    n_tags=args.tags, n_variables=args.variables)
+        extraction = ExcelExtractor(xlsx).extract()
+        print(f"📄 Valores extraídos: {len(extraction.values)} "
+              f"({len(extraction.meters_found)} TAGs)")
+        
+        db_path = str(Path(tmp) / "bench.db")
+        results = {}
+        for label, bulk in [('linha a linha', False), ('bulk', True)]:
+            runs = [time_load(extraction, db_path, bulk) for _ in range(args.repeat)]
+            results[label] = min(runs)
+            print(f"   {label:<14} {results[label]:8.3f}s "
+                  f"({len(extraction.values) / results[label]:,.0f} valores/s)")
+        
+        print(f"\n⚡ Speedup: {results['linha a linha'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+SGM-FM - Benchmark da exportação em lote
+Gera anos de fact_mpfm_production sintéticos e compara, em pico de
+memória Python (tracemalloc) e tempo, a exportação "em JSON" (fetchall +
+lista de dicts + json.dumps, como as listagens faziam) com a exportação
+em blocos do backend (CSV e, com pyarrow instalado, Parquet e Arrow).
+
+Uso:
+    python benchmarks/bench_export.py --assets 8 --days 730
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import populate_mpfm_facts
+
+ROOT = Path(__file__).parent.parent.parent.parent
+START = date(2024, 1, 1)
+
+
+def measure(func):
+    """Executa `func`; retorna (bytes gerados, pico MB, s)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da exportação em lote')
+    parser.add_argument('--assets', '-a', type=int, default=8, help='Quantidade de banks')
+    parser.add_argument('--days', '-d', type=int, default=730, help='Dias de dados')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / "bench.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        sys.path.insert(0, str(ROOT))
+        
+        # A importação cria o schema do backend em bench.db
+        from backend import main as backend
+        from backend import exporter
+        
+        conn = sqlite3.connect(backend.DATABASE_PATH)
+        rows = populate_mpfm_facts(conn, n_assets=args.assets, days=args.days, start=START)
+        end = START + timedelta(days=args.days - 1)
+        
+        def as_json():
+            query, params = exporter.range_query('fact_mpfm_production', START, end)
+            cursor = conn.execute(query, params)
+            columns = [d[0] for d in cursor.description]
+            data = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return len(json.dumps(data, default=str).encode())
+        
+        def chunked(format):
+            def run():
+                out = tmp / f"export.{format}"
+                with open(out, 'wb') as f:
+                    for data in exporter.export_range(conn, 'fact_mpfm_production', START, end, format):
+                        f.write(data)
+                return out.stat().st_size
+            return run
+        
+        cases = [('JSON (fetchall)', as_json), ('CSV em blocos', chunked('csv'))]
+        if exporter.pa is not None:
+            cases += [('Parquet em blocos', chunked('parquet')), ('Arrow em blocos', chunked('arrow'))]
+        else:
+            print("pyarrow não instalado: Parquet/Arrow não medidos")
+        
+        results = [(name, measure(func)) for name, func in cases]
+        conn.close()
+    
+    print(f"📤 {args.assets} banks x {args.days} dias: {rows} linhas "
+          f"(blocos de {exporter.EXPORT_CHUNK_ROWS} linhas)")
+    for name, (size, peak, elapsed) in results:
+        print(f"   {name:20s} {size / 1024 / 1024:8.1f} MB  pico {peak:8.1f} MB  {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
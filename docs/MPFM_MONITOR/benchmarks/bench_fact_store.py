@@ -0,0 +1,96 @@
+"""
+SGM-FM - Benchmark do MeasurementFactStore
+Compara memória (tracemalloc) e tempo de agrupamento + validação de N
+fatos sintéticos como lista de MeasurementFact (group_facts +
+validate_group) e como MeasurementFactStore (validate_store).
+
+Uso:
+    python benchmarks/bench_fact_store.py --facts 300000
+"""
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from validators.cross_validator import (
+    CrossValidator, MeasurementFact, MeasurementFactStore, SourceType, TimeWindow
+)
+
+VARIABLES = ['mass_oil_t', 'mass_gas_t', 'mass_hc_t', 'mass_water_t', 'mass_total_t',
+             'gross_std_volume_sm3', 'net_std_volume_sm3']
+SOURCES = [(SourceType.EXCEL, 'B03_MPFM_Daily.xlsx'), (SourceType.XML, '002_PRODUCAO.xml'),
+           (SourceType.PDF, 'B03_MPFM_Daily.pdf')]
+
+
+def synthetic_rows(n_facts: int, seed: int = 42):
+    """Tuplas (fonte, arquivo, asset, tag, variável, data, janela, valor, unidade)."""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    rows = []
+    day = 0
+    while len(rows) < n_facts:
+        for asset_id in range(1, 41):
+            for variable in VARIABLES:
+                base = round(rng.uniform(100, 5000), 3)
+                for source, file_name in SOURCES:
+                    value = base if rng.random() < 0.8 else round(base * rng.choice([1.001, 1.02]), 3)
+                    rows.append((source, file_name, asset_id, f"Bank{asset_id:02d}", variable,
+                                 start + timedelta(days=day), TimeWindow.DAILY, value, 't'))
+        day += 1
+    return rows[:n_facts]
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, current, elapsed
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MeasurementFactStore')
+    parser.add_argument('--facts', '-n', type=int, default=300000, help='Quantidade de fatos')
+    args = parser.parse_args()
+    
+    rows = synthetic_rows(args.facts)
+    validator = CrossValidator(":memory:")
+    
+    facts, facts_bytes, facts_build = measure(lambda: [MeasurementFact(*row) for row in rows])
+    
+    def build_store():
+        store = MeasurementFactStore()
+        for row in rows:
+            store.append(*row)
+        return store
+    store, store_bytes, store_build = measure(build_store)
+    
+    old_results, old_time = timed(lambda: [validator.validate_group(key, group)
+                                           for key, group in validator.group_facts(facts).items()])
+    new_results, new_time = timed(lambda: validator.validate_store(store))
+    
+    assert old_results == new_results, "resultados divergentes"
+    n = len(rows)
+    
+    print(f"🗃️  {n} fatos, {len(new_results)} grupos")
+    print(f"   lista de MeasurementFact:  {facts_bytes / n:6.0f} bytes/fato  "
+          f"montagem {facts_build:5.2f}s  agrupar+validar {old_time:5.2f}s")
+    print(f"   MeasurementFactStore:      {store_bytes / n:6.0f} bytes/fato  "
+          f"montagem {store_build:5.2f}s  agrupar+validar {new_time:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+SGM-FM - Benchmark do resumo de medições (/api/measurements/summary)
+Para históricos crescentes de daily_measurement compara a agregação
+sobre a tabela inteira (consulta anterior) com a combinação das linhas
+da rollup diária, e mede o custo extra de manter a rollup na gravação.
+
+Uso:
+    python benchmarks/bench_measurement_summary.py --assets 30 --years 1 5 20
+"""
+import sys
+import time
+import random
+import sqlite3
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.migrations import apply_migrations
+from backend.rollups import refresh_measurement_rollup, measurement_summary_query
+
+SOURCES = ['TOPSIDE', 'SUBSEA', 'SEPARATOR']
+START = date(2005, 1, 1)
+
+LEGACY_SUMMARY = """
+    SELECT source, COUNT(*) as count, AVG(oil) as avg_oil, AVG(gas) as avg_gas,
+           AVG(water) as avg_water, AVG(hc) as avg_hc, AVG(bsw) as avg_bsw,
+           MIN(date) as first_date, MAX(date) as last_date
+    FROM daily_measurement WHERE 1=1 GROUP BY source
+"""
+
+INSERT = """
+    INSERT OR REPLACE INTO daily_measurement (date, source, asset_tag, oil, gas, water, hc, total, bsw)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def create_db(assets: int, days: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE daily_measurement (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date DATE NOT NULL, source TEXT NOT NULL,
+            asset_tag TEXT NOT NULL, oil REAL, gas REAL, water REAL, hc REAL, total REAL, bsw REAL,
+            k_oil REAL, k_gas REAL, k_water REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(date, source, asset_tag)
+        )
+    """)
+    # Demais tabelas referenciadas pelos índices da migração 1
+    for table in ['alert', 'calibration', 'cross_validation', 'staged_file', 'fact_mpfm_production']:
+        conn.execute(f"""CREATE TABLE {table} (timestamp, resolved, severity, category, asset_tag,
+                         start_date, date_ref, variable_code, classification, created_at, business_date)""")
+    
+    rng = random.Random(42)
+    conn.executemany(INSERT, (
+        ((START + timedelta(days=d)).isoformat(), source, f"B{a:02d}",
+         *(rng.uniform(0, 1000) for _ in range(6)))
+        for d in range(days) for source in SOURCES for a in range(assets)
+    ))
+    conn.commit()
+    apply_migrations(conn)   # índices + rollup (backfill)
+    return conn
+
+
+def best_of(func, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do resumo de medições')
+    parser.add_argument('--assets', '-a', type=int, default=30, help='Assets por fonte')
+    parser.add_argument('--years', '-y', type=int, nargs='+', default=[1, 5, 20], help='Anos de histórico')
+    args = parser.parse_args()
+    
+    rollup_sql, rollup_params = measurement_summary_query()
+    print(f"📊 resumo por fonte ({len(SOURCES)} fontes x {args.assets} assets por dia)")
+    
+    for years in args.years:
+        conn = create_db(args.assets, years * 365)
+        rows = conn.execute("SELECT COUNT(*) FROM daily_measurement").fetchone()[0]
+        
+        legacy = best_of(lambda: conn.execute(LEGACY_SUMMARY).fetchall())
+        rollup = best_of(lambda: conn.execute(rollup_sql, rollup_params).fetchall())
+        
+        # Janela dos últimos 30 dias
+        last = START + timedelta(days=years * 365 - 1)
+        window = ((last - timedelta(days=29)).isoformat(), last.isoformat())
+        legacy_window = best_of(lambda: conn.execute(
+            LEGACY_SUMMARY.replace("WHERE 1=1", "WHERE date >= ? AND date <= ?"), window).fetchall())
+        window_sql, window_params = measurement_summary_query(*window)
+        rollup_window = best_of(lambda: conn.execute(window_sql, window_params).fetchall())
+        
+        # Gravação de um dia novo: só medições x medições + rollup
+        day = (START + timedelta(days=years * 365)).isoformat()
+        batch = [(day, source, f"B{a:02d}", 1.0, 2.0, 3.0, 4.0, 10.0, 0.1)
+                 for source in SOURCES for a in range(args.assets)]
+        
+        def insert_only():
+            conn.executemany(INSERT, batch)
+            conn.rollback()
+        
+        def insert_with_rollup():
+            cursor = conn.cursor()
+            for row in batch:
+                cursor.execute(INSERT, row)
+                refresh_measurement_rollup(cursor, [(row[1], row[0])])
+            conn.rollback()
+        
+        per_row = len(batch)
+        write_plain = best_of(insert_only) / per_row
+        write_rollup = best_of(insert_with_rollup) / per_row
+        conn.close()
+        
+        print(f"   {years:2d} anos ({rows:8d} linhas)")
+        print(f"      histórico inteiro: tabela {legacy * 1000:8.2f} ms  rollup {rollup * 1000:7.2f} ms  "
+              f"({legacy / rollup:4.0f}x)")
+        print(f"      últimos 30 dias:   tabela {legacy_window * 1000:8.2f} ms  rollup {rollup_window * 1000:7.2f} ms  "
+              f"({legacy_window / rollup_window:4.0f}x)")
+        print(f"      gravação: {write_plain * 1e6:5.0f} -> {write_rollup * 1e6:5.0f} µs/linha")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+SGM-FM - Benchmark do parser MPFM PDF
+Compara, nos PDFs de exemplo em docs/, a extração de texto sem cache
+(primeira página extraída duas vezes, como no parser anterior) com o
+parser atual, serial e com páginas em paralelo.
+
+Uso:
+    python benchmarks/bench_mpfm_pdf.py [diretório] --workers 2
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pdfplumber
+
+from extractors.mpfm_pdf_parser import MPFMPDFParser
+
+DEFAULT_DIR = Path(__file__).parent.parent.parent
+
+
+def uncached_text(file_path: Path) -> None:
+    """Extração sem cache: página 1 para detecção + todas as páginas no parse."""
+    with pdfplumber.open(file_path) as pdf:
+        pdf.pages[0].extract_text()
+        for page in pdf.pages:
+            page.extract_text()
+
+
+def timed(func, files) -> float:
+    start = time.perf_counter()
+    for f in files:
+        func(f)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MPFM PDF parser')
+    parser.add_argument('directory', nargs='?', default=str(DEFAULT_DIR),
+                        help='Diretório com PDFs MPFM (padrão: docs/)')
+    parser.add_argument('--workers', '-w', type=int, default=2,
+                        help='Processos para extração de páginas em paralelo')
+    args = parser.parse_args()
+    
+    files = sorted(Path(args.directory).glob("*MPFM*.pdf")) + \
+        sorted(Path(args.directory).glob("PVTCalibration*.pdf"))
+    if not files:
+        print(f"Nenhum PDF MPFM em {args.directory}")
+        return
+    
+    pages = 0
+    for f in files:
+        with pdfplumber.open(f) as pdf:
+            pages += len(pdf.pages)
+    
+    baseline = timed(uncached_text, files)
+    cached = timed(lambda f: MPFMPDFParser(str(f)).extract(), files)
+    parallel = timed(lambda f: MPFMPDFParser(str(f), workers=args.workers,
+                                             parallel_min_pages=2).extract(), files)
+    
+    print(f"📄 {len(files)} PDFs, {pages} páginas")
+    print(f"   texto sem cache (anterior):  {baseline:7.2f}s")
+    print(f"   parser com cache (serial):   {cached:7.2f}s  ({baseline / cached:.2f}x)")
+    print(f"   parser paralelo (w={args.workers}):      {parallel:7.2f}s  ({baseline / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
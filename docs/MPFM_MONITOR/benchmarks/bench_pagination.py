@@ -0,0 +1,117 @@
+"""
+SGM-FM - Benchmark das listagens da API
+Com N linhas em cross_validation compara:
+- página profunda com OFFSET x cursor keyset (mesma ordenação e índices)
+- resposta JSON completa (fetchall + lista de dicts, como antes) x
+  streaming NDJSON: pico de memória Python e tempo até o primeiro bloco
+
+Uso:
+    python benchmarks/bench_pagination.py --rows 400000
+"""
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.pagination import CROSS_VALIDATION_KEYSET, iter_ndjson
+
+ORDER = CROSS_VALIDATION_KEYSET.order_by()
+VARIABLES = ['OIL_VOL', 'GAS_VOL', 'WATER_VOL', 'HC_MASS', 'BSW', 'TOTAL_MASS', 'K_OIL', 'K_GAS']
+
+
+def create_db(db_path: str, rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE cross_validation (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, date_ref DATE NOT NULL, asset_tag TEXT NOT NULL,
+            variable_code TEXT NOT NULL, excel_value REAL, pdf_value REAL, xml_value REAL,
+            deviation_abs REAL, deviation_pct REAL, classification TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(date_ref, asset_tag, variable_code)
+        )
+    """)
+    per_day = 20 * len(VARIABLES)
+    conn.executemany("""
+        INSERT INTO cross_validation (date_ref, asset_tag, variable_code, excel_value, pdf_value,
+                                      deviation_abs, deviation_pct, classification)
+        VALUES (date('2000-01-01', '+' || ? || ' days'), ?, ?, 100.0, 100.2, 0.2, 0.2, 'CONSISTENTE')
+    """, ((i // per_day, f"B{(i // len(VARIABLES)) % 20:02d}", VARIABLES[i % len(VARIABLES)])
+          for i in range(rows)))
+    # Mesmo índice da migração 1 usado pela listagem
+    conn.execute("CREATE INDEX idx_cross_validation_date_class ON cross_validation(date_ref, classification)")
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de paginação e streaming')
+    parser.add_argument('--rows', '-n', type=int, default=400000, help='Linhas em cross_validation')
+    parser.add_argument('--page', type=int, default=1000, help='Tamanho da página')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = create_db(str(Path(tmp) / "bench.db"), args.rows)
+        depth = args.rows - 2 * args.page
+        
+        # Página profunda: OFFSET x cursor da linha anterior
+        offset_rows, offset_time = timed(lambda: conn.execute(
+            f"SELECT * FROM cross_validation ORDER BY {ORDER} LIMIT ? OFFSET ?",
+            (args.page, depth)).fetchall())
+        previous = conn.execute(f"SELECT * FROM cross_validation ORDER BY {ORDER} LIMIT 1 OFFSET ?",
+                                (depth - 1,)).fetchone()
+        clause, params = CROSS_VALIDATION_KEYSET.after(CROSS_VALIDATION_KEYSET.cursor_for(previous))
+        keyset_rows, keyset_time = timed(lambda: conn.execute(
+            f"SELECT * FROM cross_validation WHERE {clause} ORDER BY {ORDER} LIMIT ?",
+            params + [args.page]).fetchall())
+        assert [tuple(r) for r in offset_rows] == [tuple(r) for r in keyset_rows]
+        
+        # Resposta completa: lista em memória x NDJSON em blocos
+        def full_json():
+            rows = conn.execute(f"SELECT * FROM cross_validation ORDER BY {ORDER}").fetchall()
+            return json.dumps([dict(row) for row in rows], default=str).encode()
+        
+        def ndjson():
+            first, size = None, 0
+            start = time.perf_counter()
+            for chunk in iter_ndjson(conn.execute(f"SELECT * FROM cross_validation ORDER BY {ORDER}")):
+                if first is None:
+                    first = time.perf_counter() - start
+                size += len(chunk)
+            return first, size
+        
+        tracemalloc.start()
+        body, json_time = timed(full_json)
+        _, json_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        json_size = len(body)
+        del body
+        
+        tracemalloc.start()
+        (first_chunk, nd_size), nd_time = timed(ndjson)
+        _, nd_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        conn.close()
+    
+    print(f"📄 {args.rows} linhas, página de {args.page} na profundidade {depth}")
+    print(f"   OFFSET:      {offset_time * 1000:8.1f} ms")
+    print(f"   keyset:      {keyset_time * 1000:8.1f} ms  ({offset_time / keyset_time:.0f}x)")
+    print(f"📦 resposta completa ({json_size / 1e6:.0f} MB JSON, {nd_size / 1e6:.0f} MB NDJSON)")
+    print(f"   JSON (fetchall):  pico {json_peak / 1e6:8.1f} MB  total {json_time:6.2f}s  primeiro byte {json_time:6.2f}s")
+    print(f"   NDJSON (stream):  pico {nd_peak / 1e6:8.1f} MB  total {nd_time:6.2f}s  primeiro byte {first_chunk:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+SGM-FM - Benchmark da reconciliação Hourly x Daily (V2)
+Gera um ano de fatos MPFM sintéticos para N banks e compara o laço por
+asset/dia (uma consulta + gravação por par) com validate_date_range
+set-based.
+
+Uso:
+    python benchmarks/bench_reconciliation.py --assets 8 --days 365
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import populate_mpfm_facts
+
+ROOT = Path(__file__).parent.parent.parent.parent
+START = date(2025, 1, 1)
+
+
+def per_pair(validator, db_path: str, start: date, end: date) -> int:
+    """Laço asset -> dia -> validação/gravação individual."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT DISTINCT asset_tag, business_date FROM fact_mpfm_production
+        WHERE business_date BETWEEN ? AND ?
+    """, (start, end))
+    pairs = cursor.fetchall()
+    
+    for row in pairs:
+        result = validator.validate_asset_day(cursor, row['asset_tag'], row['business_date'])
+        validator.persist_result(cursor, result)
+    
+    conn.commit()
+    conn.close()
+    return len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark reconciliação V2')
+    parser.add_argument('--assets', '-a', type=int, default=8, help='Quantidade de banks')
+    parser.add_argument('--days', '-d', type=int, default=365, help='Dias de dados')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / "base.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        sys.path.insert(0, str(ROOT))
+        
+        # A importação cria o schema do backend em base.db
+        from backend import main as backend
+        from backend.validators.reconciliation_v2 import ReconciliationValidatorV2
+        
+        conn = sqlite3.connect(backend.DATABASE_PATH)
+        rows = populate_mpfm_facts(conn, n_assets=args.assets, days=args.days, start=START)
+        conn.close()
+        
+        loop_db = str(tmp / "loop.db")
+        set_db = str(tmp / "set.db")
+        shutil.copy(backend.DATABASE_PATH, loop_db)
+        shutil.copy(backend.DATABASE_PATH, set_db)
+        end = START + timedelta(days=args.days - 1)
+        
+        start = time.perf_counter()
+        pairs = per_pair(ReconciliationValidatorV2(loop_db), loop_db, START, end)
+        loop_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        results = ReconciliationValidatorV2(set_db).validate_date_range(START, end)
+        set_time = time.perf_counter() - start
+    
+    print(f"📊 {args.assets} banks x {args.days} dias: {rows} linhas, {pairs} pares asset/dia")
+    print(f"   laço por asset/dia:  {loop_time:7.2f}s")
+    print(f"   set-based:           {set_time:7.2f}s  ({loop_time / set_time:.1f}x)")
+    print(f"   resultados: {len(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+SGM-FM - Benchmark do ReconciliationEngine
+Gera N assets x D dias em mpfm_hourly/mpfm_daily e compara o laço
+asset a asset (duas consultas + uma gravação por asset/dia) com
+reconcile_range + save_results (duas consultas e uma transação).
+
+Uso:
+    python benchmarks/bench_reconciliation_engine.py --assets 8 --days 365
+"""
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import populate_mpfm_tables
+from validators.reconciliation_engine import ReconciliationEngine
+
+SCHEMA = Path(__file__).parent.parent / "database" / "schema.sql"
+START = date(2025, 1, 1)
+
+
+def per_asset_day(db_path: str, start: date, end: date) -> int:
+    """Fluxo anterior: por dia, DISTINCT de assets e reconcile/save_result por asset."""
+    engine = ReconciliationEngine(db_path)
+    conn = sqlite3.connect(db_path)
+    count = 0
+    
+    current = start
+    while current <= end:
+        asset_ids = [row[0] for row in conn.execute("""
+            SELECT DISTINCT asset_id FROM mpfm_hourly WHERE report_date = ?
+            UNION
+            SELECT DISTINCT asset_id FROM mpfm_daily WHERE report_date = ?
+        """, (current.isoformat(), current.isoformat()))]
+        for asset_id in asset_ids:
+            engine.save_result(engine.reconcile(asset_id, current))
+            count += 1
+        current += timedelta(days=1)
+    
+    conn.close()
+    return count
+
+
+def batched(db_path: str, start: date, end: date) -> int:
+    engine = ReconciliationEngine(db_path)
+    results = engine.reconcile_range(start, end)
+    engine.save_results(results)
+    return len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ReconciliationEngine')
+    parser.add_argument('--assets', '-a', type=int, default=8, help='Quantidade de assets')
+    parser.add_argument('--days', '-d', type=int, default=365, help='Dias de dados')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        base_db = str(tmp / "base.db")
+        conn = sqlite3.connect(base_db)
+        conn.executescript(SCHEMA.read_text(encoding='utf-8'))
+        rows = populate_mpfm_tables(conn, n_assets=args.assets, days=args.days, start=START)
+        conn.close()
+        
+        loop_db = str(tmp / "loop.db")
+        batch_db = str(tmp / "batch.db")
+        shutil.copy(base_db, loop_db)
+        shutil.copy(base_db, batch_db)
+        end = START + timedelta(days=args.days - 1)
+        
+        start = time.perf_counter()
+        loop_count = per_asset_day(loop_db, START, end)
+        loop_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batch_count = batched(batch_db, START, end)
+        batch_time = time.perf_counter() - start
+        
+        query = "SELECT asset_id, report_date, status, failed_metrics FROM reconciliation_result ORDER BY 1, 2"
+        same = (sqlite3.connect(loop_db).execute(query).fetchall()
+                == sqlite3.connect(batch_db).execute(query).fetchall())
+    
+    print(f"📊 {args.assets} assets x {args.days} dias: {rows} linhas, {batch_count} asset/dia")
+    print(f"   laço por asset/dia:     {loop_time:7.2f}s  ({loop_count} resultados)")
+    print(f"   range em lote:          {batch_time:7.2f}s  ({loop_time / batch_time:.1f}x)")
+    print(f"   resultados idênticos: {'sim' if same else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+SGM-FM - Benchmark do cache de respostas (polling do dashboard)
+Faz N polls de /api/status e /api/validation/summary pelo TestClient
+sobre um banco com histórico sintético e compara: sem cache (TTL 0,
+consulta a cada poll), cache válido (200 do cache) e cache com
+If-None-Match (304 sem corpo). Conta também as conexões retiradas do
+pool, ou seja, quantos polls chegaram ao SQLite.
+
+Uso:
+    python benchmarks/bench_response_cache.py --polls 500 --alerts 200000
+"""
+import os
+import sys
+import time
+import sqlite3
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+
+
+def poll(client, pool, url: str, polls: int, etag: bool):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = client.get(url).headers["etag"]
+    before = pool.stats()['checkouts']
+    start = time.perf_counter()
+    for _ in range(polls):
+        client.get(url, headers=headers)
+    elapsed = time.perf_counter() - start
+    return elapsed / polls, pool.stats()['checkouts'] - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do cache de respostas')
+    parser.add_argument('--polls', '-n', type=int, default=500, help='Polls por cenário')
+    parser.add_argument('--alerts', type=int, default=200000, help='Alertas no banco')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / "bench.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        sys.path.insert(0, str(ROOT))
+        
+        from fastapi.testclient import TestClient
+        from backend import main as backend
+        
+        conn = sqlite3.connect(backend.DATABASE_PATH)
+        conn.executemany("INSERT INTO alert (category, severity, title, resolved) VALUES ('v', 'warning', 't', ?)",
+                         ((i % 3 == 0,) for i in range(args.alerts)))
+        conn.executemany("""
+            INSERT INTO cross_validation (date_ref, asset_tag, variable_code, classification)
+            VALUES ('2025-01-15', ?, ?, ?)
+        """, ((f"B{a:02d}", f"VAR{v:03d}", ['CONSISTENTE', 'ACEITAVEL', 'INCONSISTENTE'][v % 3])
+              for a in range(20) for v in range(200)))
+        conn.commit()
+        conn.close()
+        
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        client = TestClient(backend.app)
+        results = []
+        for url in ["/api/status", "/api/validation/summary?date_ref=2025-01-15"]:
+            ttls = (backend.STATUS_CACHE_TTL, backend.VALIDATION_SUMMARY_CACHE_TTL)
+            backend.STATUS_CACHE_TTL = backend.VALIDATION_SUMMARY_CACHE_TTL = 0
+            uncached = poll(client, backend.read_pool, url, args.polls, etag=False)
+            backend.STATUS_CACHE_TTL, backend.VALIDATION_SUMMARY_CACHE_TTL = ttls
+            
+            backend.response_cache.invalidate()
+            cached = poll(client, backend.read_pool, url, args.polls, etag=False)
+            not_modified = poll(client, backend.read_pool, url, args.polls, etag=True)
+            results.append((url, uncached, cached, not_modified))
+    
+    print(f"🔁 {args.polls} polls por cenário ({args.alerts} alertas no banco)")
+    for url, *cases in results:
+        print(f"   {url}")
+        for name, (per_poll, checkouts) in zip(["sem cache", "cache (200)", "If-None-Match (304)"], cases):
+            print(f"      {name:20s} {per_poll * 1e6:8.0f} µs/poll  {checkouts:5d} acessos ao SQLite")
+
+
+if __name__ == "__main__":
+    main()
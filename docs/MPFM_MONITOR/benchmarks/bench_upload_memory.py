@@ -0,0 +1,89 @@
+"""
+SGM-FM - Benchmark de memória do upload
+Gera um ZIP sintético grande (conteúdo incompressível) e compara o pico
+de memória Python (tracemalloc) ao gravar o upload com
+`await file.read()` + hash do buffer (fluxo anterior) e com
+save_upload_stream (blocos + hash incremental).
+
+Uso:
+    python benchmarks/bench_upload_memory.py --size-mb 256
+"""
+import os
+import sys
+import time
+import asyncio
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+ROOT = Path(__file__).parent.parent.parent.parent
+
+
+def build_large_zip(zip_path: Path, size_mb: int) -> None:
+    """ZIP com membros de 16 MB de bytes aleatórios (sem compressão)."""
+    member_mb = 16
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zf:
+        for i in range(max(1, size_mb // member_mb)):
+            with zf.open(f"lote/B03_MPFM_Hourly-{i:05d}.pdf", 'w', force_zip64=True) as member:
+                for _ in range(member_mb):
+                    member.write(os.urandom(1024 * 1024))
+
+
+async def legacy_save(upload: UploadFile, dest: Path):
+    """Fluxo anterior: arquivo inteiro em memória, depois hash do buffer."""
+    with open(dest, "wb") as f:
+        content = await upload.read()
+        f.write(content)
+    return hashlib.sha256(content).hexdigest(), len(content)
+
+
+def measure(save, source: Path, dest: Path):
+    """Executa `save` sobre um UploadFile lido de `source`; retorna (resultado, pico MB, s)."""
+    with open(source, 'rb') as f:
+        upload = UploadFile(file=f, filename=source.name)
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = asyncio.run(save(upload, dest))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, peak / 1024 / 1024, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memória do upload')
+    parser.add_argument('--size-mb', type=int, default=256,
+                        help='Tamanho aproximado do ZIP sintético (MB)')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        os.environ['DATABASE_PATH'] = str(tmp / "bench.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        sys.path.insert(0, str(ROOT))
+        
+        from backend import main as backend
+        
+        source = tmp / "lote.zip"
+        build_large_zip(source, args.size_mb)
+        size_mb = source.stat().st_size / 1024 / 1024
+        
+        old, old_peak, old_time = measure(legacy_save, source, tmp / "legacy.zip")
+        new, new_peak, new_time = measure(backend.save_upload_stream, source, tmp / "stream.zip")
+    
+    assert old == new, "hash/tamanho divergentes entre os fluxos"
+    
+    print(f"📦 ZIP sintético: {size_mb:.0f} MB")
+    print(f"   read() + hash do buffer:  pico {old_peak:8.1f} MB  {old_time:6.2f}s")
+    print(f"   streaming em blocos:      pico {new_peak:8.1f} MB  {new_time:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
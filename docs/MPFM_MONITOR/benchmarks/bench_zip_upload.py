@@ -0,0 +1,103 @@
+"""
+SGM-FM - Benchmark do processamento de ZIP no backend
+Monta um ZIP com N membros (PDFs MPFM de exemplo repetidos) e mede
+arquivos/s de process_zip_upload contra o fluxo anterior (diretório
+temporário por membro + commit por arquivo).
+
+Uso:
+    python benchmarks/bench_zip_upload.py --members 1000
+"""
+import os
+import sys
+import time
+import sqlite3
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent.parent
+DEFAULT_DIR = Path(__file__).parent.parent.parent
+
+
+def build_zip(zip_path: Path, sources, members: int) -> None:
+    """ZIP com `members` PDFs, repetindo os arquivos de exemplo."""
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(members):
+            src = sources[i % len(sources)]
+            zf.write(src, f"lote/{i:05d}_{src.name}")
+
+
+def legacy_zip_upload(backend, zip_path: Path, batch_id: str, conn: sqlite3.Connection) -> None:
+    """Fluxo anterior: diretório temporário por membro e commit por arquivo."""
+    with zipfile.ZipFile(zip_path, 'r') as z:
+        for file_info in z.infolist():
+            if file_info.filename.endswith('/'):
+                continue
+            with tempfile.TemporaryDirectory() as temp_dir:
+                extracted_path = Path(temp_dir) / Path(file_info.filename).name
+                with open(extracted_path, 'wb') as f_out:
+                    f_out.write(z.read(file_info.filename))
+                
+                f_type = backend.classify_file(extracted_path.name)
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO dim_file (file_name, file_type, file_size_bytes, source_path)
+                    VALUES (?, ?, ?, ?)
+                """, (extracted_path.name, f_type.value, file_info.file_size, f"{batch_id}/{file_info.filename}"))
+                file_id = cursor.lastrowid
+                try:
+                    backend.process_pdf_file(extracted_path, file_id, conn)
+                    cursor.execute("UPDATE dim_file SET status = 'SUCCESS' WHERE file_id = ?", (file_id,))
+                except Exception as e:
+                    cursor.execute("UPDATE dim_file SET status = 'ERROR', error_message = ? WHERE file_id = ?", (str(e), file_id))
+                conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark process_zip_upload')
+    parser.add_argument('directory', nargs='?', default=str(DEFAULT_DIR),
+                        help='Diretório com PDFs MPFM (padrão: docs/)')
+    parser.add_argument('--members', '-n', type=int, default=1000,
+                        help='Membros no ZIP sintético')
+    args = parser.parse_args()
+    
+    sources = sorted(Path(args.directory).glob("*MPFM*.pdf"))
+    if not sources:
+        print(f"Nenhum PDF MPFM em {args.directory}")
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # O backend cria banco e pastas na importação: apontar tudo para tmp
+        os.environ['DATABASE_PATH'] = str(tmp / "bench.db")
+        os.environ['UPLOAD_FOLDER'] = str(tmp / "uploads")
+        os.environ['EXPORT_FOLDER'] = str(tmp / "exports")
+        os.environ['PARSE_CACHE_FOLDER'] = str(tmp / "parse_cache")
+        sys.path.insert(0, str(ROOT))
+        
+        from backend import main as backend
+        # Sem cache de parse: membros repetidos seriam acertos de cache
+        backend.parse_cache = None
+        
+        zip_path = tmp / "lote.zip"
+        build_zip(zip_path, sources, args.members)
+        
+        conn = sqlite3.connect(backend.DATABASE_PATH)
+        
+        start = time.perf_counter()
+        legacy_zip_upload(backend, zip_path, "BENCH_LEGACY", conn)
+        legacy = time.perf_counter() - start
+        
+        stats = backend.process_zip_upload(zip_path, "BENCH_MEMORY", conn)
+        conn.close()
+    
+    print(f"📦 {args.members} membros ({len(sources)} PDFs de exemplo)")
+    print(f"   temp dir + commit por arquivo: {legacy:7.2f}s  {args.members / legacy:7.1f} arquivos/s")
+    print(f"   em memória + commit em lote:   {stats['elapsed_s']:7.2f}s  {stats['files_per_sec']:7.1f} arquivos/s"
+          f"  ({legacy / stats['elapsed_s']:.2f}x)")
+    print(f"   status: {stats['success']} ok, {stats['skipped']} ignorados, {stats['errors']} com erro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+SGM-FM - Dados Sintéticos para Benchmarks
+Gera planilhas Daily no layout dos relatórios reais (âncoras, linha de
+TAGs, coluna de unidades), o schema mínimo usado pelos loaders e fatos
+MPFM horários/diários para o backend e para o ReconciliationEngine e as
+fontes Excel/XML/PDF da validação cruzada.
+"""
+import sqlite3
+import random
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import List
+from collections import defaultdict
+
+import openpyxl
+
+
+# ============================================================================
+# SCHEMA DOS LOADERS
+# ============================================================================
+
+# Tabelas gravadas por DatabaseLoader (excel_extractor)
+LOADER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_name TEXT, file_hash TEXT UNIQUE, file_type TEXT, report_date DATE,
+    period_start TEXT, period_end TEXT, field_name TEXT,
+    records_extracted INTEGER, status TEXT
+);
+CREATE TABLE IF NOT EXISTS daily_snapshot (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    installation_id INTEGER, report_date DATE, period_start TEXT,
+    period_end TEXT, report_generated_at TEXT,
+    UNIQUE(installation_id, report_date)
+);
+CREATE TABLE IF NOT EXISTS meter (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    installation_id INTEGER, tag TEXT, fluid_type TEXT,
+    UNIQUE(installation_id, tag)
+);
+CREATE TABLE IF NOT EXISTS section (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    installation_id INTEGER, name TEXT, fluid_type TEXT,
+    UNIQUE(installation_id, name)
+);
+CREATE TABLE IF NOT EXISTS daily_measurement (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_id INTEGER, import_id INTEGER, meter_id INTEGER, section_id INTEGER,
+    block_type TEXT, variable_code TEXT, variable_raw TEXT, value REAL,
+    unit TEXT, source_sheet TEXT, source_cell TEXT,
+    UNIQUE(snapshot_id, meter_id, block_type, variable_raw)
+);
+CREATE TABLE IF NOT EXISTS gas_balance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    snapshot_id INTEGER, import_id INTEGER, line_order INTEGER, line_sign TEXT,
+    line_description TEXT, flowrate_value REAL, flowrate_unit TEXT,
+    pd_value REAL, pd_unit TEXT, source_cell TEXT
+);
+"""
+
+
+def create_loader_db(db_path: str) -> None:
+    """Cria um banco vazio com as tabelas dos loaders."""
+    path = Path(db_path)
+    if path.exists():
+        path.unlink()
+    
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LOADER_SCHEMA)
+    conn.close()
+
+
+# ============================================================================
+# PLANILHA SINTÉTICA
+# ============================================================================
+
+BLOCK_TITLES = ["Cumulative totals @ day close", "Day totals", "Flow weighted average"]
+
+BASE_VARIABLES = [
+    ("Gross volume", "m³"), ("Gross standard volume", "sm³"),
+    ("Net standard volume", "sm³"), ("Mass", "t"), ("Flow time", "min"),
+    ("Pressure", "kPag"), ("Temperature", "°C"), ("Line density", "kg/m³"),
+    ("Standard density", "kg/sm³"), ("K-factor", "pls/m³"),
+    ("Meter factor", "-"), ("CTL", "-"), ("CPL", "-"), ("BS&W analyzer", "%"),
+]
+
+
+def synthetic_tags(count: int) -> List[str]:
+    """TAGs no padrão dos medidores (ex: 20FT0001)."""
+    return [f"{20 + i // 10000:02d}FT{i % 10000:04d}" for i in range(count)]
+
+
+def build_daily_workbook(path: str, n_tags: int = 60, n_variables: int = 40,
+                         seed: int = 42) -> str:
+    """
+    Gera um Daily_Oil sintético com os três blocos padrão.
+    
+    Args:
+        path: Arquivo .xlsx de saída
+        n_tags: Quantidade de medidores (colunas)
+        n_variables: Quantidade de variáveis (linhas) por bloco
+    """
+    rng = random.Random(seed)
+    tags = synthetic_tags(n_tags)
+    variables = list(BASE_VARIABLES)
+    while len(variables) < n_variables:
+        variables.append((f"Variable {len(variables) + 1}", "-"))
+    variables = variables[:n_variables]
+    
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Oil_Synthetic"
+    
+    ws.cell(row=1, column=1, value="Daily Oil Report")
+    ws.cell(row=2, column=1, value="Date and time:")
+    ws.cell(row=2, column=2, value=datetime(2026, 1, 16, 6, 0))
+    ws.cell(row=3, column=1, value="Field:")
+    ws.cell(row=3, column=2, value="Synthetic")
+    ws.cell(row=4, column=1, value="Period:")
+    ws.cell(row=4, column=2, value="15-01-2026 00:00 till 16-01-2026 00:00")
+    
+    first_tag_col = 3
+    row = 7
+    for title in BLOCK_TITLES:
+        # Linha de seção (acima da âncora)
+        for i in range(n_tags):
+            ws.cell(row=row, column=first_tag_col + i, value=f"Section {i // 4 + 1}")
+        row += 1
+        
+        ws.cell(row=row, column=1, value=title)
+        row += 1
+        
+        ws.cell(row=row, column=1, value="Variable")
+        ws.cell(row=row, column=2, value="Unit")
+        for i, tag in enumerate(tags):
+            ws.cell(row=row, column=first_tag_col + i, value=tag)
+        row += 1
+        
+        for name, unit in variables:
+            ws.cell(row=row, column=1, value=name)
+            ws.cell(row=row, column=2, value=unit)
+            for i in range(n_tags):
+                ws.cell(row=row, column=first_tag_col + i, value=round(rng.uniform(0, 5000), 3))
+            row += 1
+        
+        row += 2
+    
+    wb.save(path)
+    return path
+
+
+# ============================================================================
+# FATOS MPFM (fact_mpfm_production do backend)
+# ============================================================================
+
+MPFM_METRICS = [
+    'uncorrected_mass_gas_t', 'uncorrected_mass_oil_t', 'uncorrected_mass_hc_t',
+    'uncorrected_mass_water_t', 'uncorrected_mass_total_t',
+    'corrected_mass_gas_t', 'corrected_mass_oil_t', 'corrected_mass_hc_t',
+    'corrected_mass_water_t', 'corrected_mass_total_t',
+    'pvt_ref_mass_gas_t', 'pvt_ref_mass_oil_t',
+    'pvt_ref_vol_gas_sm3', 'pvt_ref_vol_oil_sm3',
+    'pvt_ref_mass_20c_gas_t', 'pvt_ref_mass_20c_oil_t',
+]
+
+
+def populate_mpfm_facts(conn: sqlite3.Connection, n_assets: int = 8, days: int = 365,
+                        start: date = date(2025, 1, 1), seed: int = 42) -> int:
+    """
+    Preenche fact_mpfm_production com 24 horárias + 1 diário por asset/dia.
+    
+    O diário é a soma das horárias com ruído: a maioria dentro da
+    tolerância, alguns perto do limite e alguns fora. Uma fração dos dias
+    fica sem diário ou com horas faltando.
+    
+    Returns:
+        Quantidade de linhas inseridas
+    """
+    rng = random.Random(seed)
+    columns = ", ".join(MPFM_METRICS)
+    placeholders = ", ".join("?" for _ in MPFM_METRICS)
+    sql = f"""
+        INSERT INTO fact_mpfm_production
+        (asset_tag, report_type, period_start, period_end, business_date, bank, {columns})
+        VALUES (?, ?, ?, ?, ?, ?, {placeholders})
+    """
+    
+    rows = []
+    for a in range(n_assets):
+        asset_tag = f"Bank{a + 1:02d}"
+        for d in range(days):
+            day = start + timedelta(days=d)
+            day_start = datetime.combine(day, datetime.min.time())
+            hours = range(24) if rng.random() > 0.02 else range(rng.randint(0, 23))
+            
+            sums = [0.0] * len(MPFM_METRICS)
+            for h in hours:
+                values = [round(rng.uniform(10, 400), 3) for _ in MPFM_METRICS]
+                sums = [s + v for s, v in zip(sums, values)]
+                rows.append((asset_tag, 'HOURLY', day_start + timedelta(hours=h),
+                             day_start + timedelta(hours=h + 1), day.isoformat(), a + 1, *values))
+            
+            if rng.random() < 0.02:
+                continue
+            noise = rng.choice([0.0] * 90 + [0.45] * 7 + [25.0] * 3)
+            daily = [round(s + noise, 3) for s in sums]
+            rows.append((asset_tag, 'DAILY', day_start, day_start + timedelta(days=1),
+                         day.isoformat(), a + 1, *daily))
+    
+    conn.executemany(sql, rows)
+    conn.commit()
+    return len(rows)
+
+
+# ============================================================================
+# FATOS MPFM (mpfm_hourly / mpfm_daily do database/schema.sql)
+# ============================================================================
+
+ENGINE_METRICS = [
+    'uncorr_mass_gas', 'uncorr_mass_oil', 'uncorr_mass_hc', 'uncorr_mass_water', 'uncorr_mass_total',
+    'corr_mass_gas', 'corr_mass_oil', 'corr_mass_hc', 'corr_mass_water', 'corr_mass_total',
+    'pvt_ref_mass_gas', 'pvt_ref_mass_oil', 'pvt_ref_vol_gas_sm3', 'pvt_ref_vol_oil_sm3',
+]
+
+
+def populate_mpfm_tables(conn: sqlite3.Connection, n_assets: int = 8, days: int = 365,
+                         start: date = date(2025, 1, 1), seed: int = 42) -> int:
+    """
+    Preenche asset_registry, mpfm_hourly e mpfm_daily (schema de
+    database/schema.sql) com a mesma distribuição de populate_mpfm_facts.
+    
+    Returns:
+        Quantidade de linhas hourly + daily inseridas
+    """
+    rng = random.Random(seed)
+    columns = ", ".join(ENGINE_METRICS)
+    placeholders = ", ".join("?" for _ in ENGINE_METRICS)
+    hourly_sql = f"""
+        INSERT INTO mpfm_hourly
+        (asset_id, report_date, period_start, period_end, hour_of_day, {columns})
+        VALUES (?, ?, ?, ?, ?, {placeholders})
+    """
+    daily_sql = f"""
+        INSERT INTO mpfm_daily
+        (asset_id, report_date, period_start, period_end, {columns})
+        VALUES (?, ?, ?, ?, {placeholders})
+    """
+    
+    hourly_rows, daily_rows = [], []
+    for a in range(n_assets):
+        asset_id = conn.execute(
+            "INSERT INTO asset_registry (installation_id, asset_tag) VALUES (1, ?)", (f"Bank{a + 1:02d}",)
+        ).lastrowid
+        for d in range(days):
+            day = start + timedelta(days=d)
+            day_start = datetime.combine(day, datetime.min.time())
+            hours = range(24) if rng.random() > 0.02 else range(rng.randint(0, 23))
+            
+            sums = [0.0] * len(ENGINE_METRICS)
+            for h in hours:
+                values = [round(rng.uniform(10, 400), 3) for _ in ENGINE_METRICS]
+                sums = [s + v for s, v in zip(sums, values)]
+                hourly_rows.append((asset_id, day.isoformat(), day_start + timedelta(hours=h),
+                                    day_start + timedelta(hours=h + 1), h, *values))
+            
+            if rng.random() < 0.02:
+                continue
+            noise = rng.choice([0.0] * 90 + [0.45] * 7 + [25.0] * 3)
+            daily_rows.append((asset_id, day.isoformat(), day_start, day_start + timedelta(days=1),
+                               *[round(s + noise, 3) for s in sums]))
+    
+    conn.executemany(hourly_sql, hourly_rows)
+    conn.executemany(daily_sql, daily_rows)
+    conn.commit()
+    return len(hourly_rows) + len(daily_rows)
+
+
+# ============================================================================
+# FONTES DA VALIDAÇÃO CRUZADA (Excel / XML / PDF)
+# ============================================================================
+
+# variable_code do Excel -> coluna de mpfm_daily com o mesmo fato
+CROSS_PDF_VARIABLES = {
+    'mass_oil_t': 'corr_mass_oil', 'mass_gas_t': 'corr_mass_gas', 'mass_hc_t': 'corr_mass_hc',
+    'mass_water_t': 'corr_mass_water', 'mass_total_t': 'corr_mass_total',
+}
+
+
+def populate_cross_sources(conn: sqlite3.Connection, n_assets: int = 8, days: int = 365,
+                           start: date = date(2025, 1, 1), seed: int = 42) -> int:
+    """
+    Preenche report/daily_measurement (Excel), xml_production (XML) e
+    mpfm_daily (PDF) com os mesmos fatos por asset/dia.
+    
+    Cada asset/variável alterna períodos concordantes com sequências de
+    3 a 15 dias de divergência fora da tolerância, para exercitar o
+    histórico de inconsistências e o gatilho de desenquadramento.
+    
+    Returns:
+        Quantidade de linhas de fatos inseridas
+    """
+    rng = random.Random(seed)
+    asset_ids = [
+        conn.execute(
+            "INSERT INTO asset_registry (installation_id, asset_tag) VALUES (1, ?)", (f"Bank{a + 1:02d}",)
+        ).lastrowid
+        for a in range(n_assets)
+    ]
+    pdf_columns = list(CROSS_PDF_VARIABLES.values())
+    streaks = defaultdict(int)
+    rows = 0
+    
+    for d in range(days):
+        day = start + timedelta(days=d)
+        day_start = datetime.combine(day, datetime.min.time())
+        report_id = conn.execute("""
+            INSERT INTO report (installation_id, report_date, file_type)
+            VALUES (1, ?, 'MPFM_DAILY')
+        """, (day.isoformat(),)).lastrowid
+        
+        measurements, pdf_rows, xml_rows = [], [], []
+        for asset_id in asset_ids:
+            pdf_values = []
+            for variable in list(CROSS_PDF_VARIABLES) + ['gross_std_volume_sm3']:
+                value = round(rng.uniform(100, 5000), 3)
+                if streaks[(asset_id, variable)] == 0 and rng.random() < 0.03:
+                    streaks[(asset_id, variable)] = rng.randint(3, 15)
+                if streaks[(asset_id, variable)] > 0:
+                    streaks[(asset_id, variable)] -= 1
+                    other = round(value * 1.02, 3)
+                else:
+                    other = value if rng.random() < 0.7 else round(value + 0.005, 3)
+                
+                measurements.append((report_id, asset_id, 'MPFM_DAILY', 'DAY', variable, 't', value))
+                if variable == 'gross_std_volume_sm3':
+                    xml_rows.append((asset_id, 'PRODUCAO', day_start, day_start + timedelta(days=1), other))
+                else:
+                    pdf_values.append(other)
+            
+            pdf_rows.append((asset_id, day.isoformat(), day_start, day_start + timedelta(days=1), *pdf_values))
+        
+        conn.executemany("""
+            INSERT INTO daily_measurement
+            (report_id, asset_id, file_type, block_type, variable_code, unit, value)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, measurements)
+        conn.executemany(f"""
+            INSERT INTO mpfm_daily
+            (asset_id, report_date, period_start, period_end, {", ".join(pdf_columns)})
+            VALUES (?, ?, ?, ?, {", ".join("?" for _ in pdf_columns)})
+        """, pdf_rows)
+        conn.executemany("""
+            INSERT INTO xml_production
+            (asset_id, xml_type, period_start, period_end, gross_volume_corrected)
+            VALUES (?, ?, ?, ?, ?)
+        """, xml_rows)
+        rows += len(measurements) + len(pdf_rows) + len(xml_rows)
+    
+    conn.commit()
+    return rows
@@ -343,6 +343,9 @@ CREATE TABLE IF NOT EXISTS measurement_fact (
 CREATE INDEX IF NOT EXISTS idx_measurement_fact_key 
 ON measurement_fact(asset_id, variable_code, date_ref, time_window);
 
+CREATE INDEX IF NOT EXISTS idx_measurement_fact_date
+ON measurement_fact(date_ref, asset_id, variable_code);
+
 -- Resultados da validação cruzada
 CREATE TABLE IF NOT EXISTS cross_validation_result (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -513,6 +516,8 @@ CREATE TABLE IF NOT EXISTS xml_production (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX IF NOT EXISTS idx_xml_production_period ON xml_production(period_start);
+
 CREATE TABLE IF NOT EXISTS xml_alarm_event (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     staged_file_id INTEGER REFERENCES staged_file(id),
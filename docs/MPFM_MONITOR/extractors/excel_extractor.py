@@ -16,6 +16,7 @@ from enum import Enum
 
 try:
     import openpyxl
+    from openpyxl.utils import get_column_letter
     from openpyxl.worksheet.worksheet import Worksheet
 except ImportError:
     raise ImportError("openpyxl é necessário. Instale com: pip install openpyxl")
@@ -23,6 +24,13 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Versão do parser: incrementar quando a saída da extração mudar
+# (invalida o cache de resultados em extractors/parse_cache.py)
+PARSER_VERSION = "1.0"
+
+# Leitura em blocos para o hash (memória constante em arquivos grandes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 # ============================================================================
 # CONSTANTES E CONFIGURAÇÃO
@@ -49,6 +57,13 @@ BLOCK_ANCHORS = {
     BlockType.AVG: ["flow weighted average", "flow weighted averages"]
 }
 
+# Todas as âncoras em uma única alternação (um grupo nomeado por tipo de bloco)
+ANCHOR_REGEX = re.compile('|'.join(
+    f"(?P<{block_type.name}>" + '|'.join(
+        re.escape(p) for p in sorted(patterns, key=len, reverse=True)) + ")"
+    for block_type, patterns in BLOCK_ANCHORS.items()
+))
+
 # Âncoras alternativas para formatos simplificados
 SIMPLE_ANCHORS = {
     BlockType.DAY: [
@@ -152,6 +167,160 @@ class ExtractionResult:
     warnings: List[str] = field(default_factory=list)
 
 
+# ============================================================================
+# GRADE DE VALORES (leitura única da aba)
+# ============================================================================
+
+class SheetGrid:
+    """
+    Grade compacta com os valores de uma aba.
+    
+    Preenchida em uma única passada (openpyxl read_only + values_only);
+    as detecções de âncoras, TAGs e unidades consultam a grade em vez de
+    objetos Cell. Índices 1-based, como em openpyxl.
+    """
+    
+    def __init__(self, title: str, rows: List[Tuple[Any, ...]]):
+        self.title = title
+        self.rows = rows
+        self.max_row = len(rows)
+        self.max_column = max((len(r) for r in rows), default=0)
+    
+    @classmethod
+    def from_worksheet(cls, worksheet) -> 'SheetGrid':
+        """Lê a aba inteira para a grade (descarta células vazias à direita)."""
+        rows = []
+        for values in worksheet.iter_rows(values_only=True):
+            end = len(values)
+            while end and values[end - 1] is None:
+                end -= 1
+            rows.append(tuple(values[:end]))
+        
+        # Remover linhas vazias no final
+        while rows and not rows[-1]:
+            rows.pop()
+        
+        return cls(worksheet.title, rows)
+    
+    def value(self, row: int, column: int) -> Any:
+        """Valor da célula (None fora da área preenchida)."""
+        if row < 1 or column < 1 or row > self.max_row:
+            return None
+        values = self.rows[row - 1]
+        return values[column - 1] if column <= len(values) else None
+    
+    def row_values(self, row: int) -> Tuple[Any, ...]:
+        """Valores preenchidos de uma linha."""
+        if row < 1 or row > self.max_row:
+            return ()
+        return self.rows[row - 1]
+    
+    @staticmethod
+    def coordinate(row: int, column: int) -> str:
+        """Coordenada no formato Excel (ex: C12)."""
+        return f"{get_column_letter(column)}{row}"
+
+
+# ============================================================================
+# ÍNDICE DE BLOCOS (uma passada por aba)
+# ============================================================================
+
+# Unidades típicas da coluna de unidades
+UNIT_HINTS = ['m³', 'sm³', 'kpa', '°c', 'kg', 't', 'min', 'gj', '%']
+
+
+class SheetIndex:
+    """
+    Índice pré-calculado dos blocos de uma aba.
+    
+    Construído em uma única passada pela grade: para cada linha registra
+    os tipos de âncora encontrados e as colunas de TAG; depois associa a
+    cada âncora a sua linha de TAGs e a coluna de unidades. A extração
+    dos blocos consulta apenas este índice.
+    """
+    
+    def __init__(self):
+        # Tipo de bloco -> linhas de âncora (na ordem da planilha)
+        self.anchors: Dict[BlockType, List[int]] = {bt: [] for bt in BlockType}
+        # Linhas cuja coluna 1 contém uma âncora (fim de bloco)
+        self.first_column_anchor_rows: set = set()
+        # Linha -> {coluna: TAG}
+        self.tag_columns: Dict[int, Dict[int, str]] = {}
+        # Linha da âncora -> (linha de TAGs, coluna de unidades)
+        self.blocks: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+    
+    @classmethod
+    def build(cls, sheet: SheetGrid) -> 'SheetIndex':
+        index = cls()
+        
+        for row, values in enumerate(sheet.rows, start=1):
+            row_tags = {}
+            
+            for col, cell_value in enumerate(values, start=1):
+                if cell_value is None:
+                    continue
+                
+                cell_str = str(cell_value).strip()
+                
+                # Âncoras: somente nas primeiras 19 colunas
+                if col < 20:
+                    matched = {m.lastgroup for m in ANCHOR_REGEX.finditer(cell_str.lower())}
+                    for block_type in BlockType:
+                        if block_type.name in matched:
+                            index.anchors[block_type].append(row)
+                    if matched and col == 1:
+                        index.first_column_anchor_rows.add(row)
+                
+                if cell_value and TAG_PATTERN.match(cell_str):
+                    row_tags[col] = cell_str
+            
+            if row_tags:
+                index.tag_columns[row] = row_tags
+        
+        # Associar cada âncora à linha de TAGs (até 7 linhas abaixo)
+        for anchor_rows in index.anchors.values():
+            for anchor_row in anchor_rows:
+                if anchor_row in index.blocks:
+                    continue
+                
+                tag_row = None
+                for offset in range(1, 8):
+                    row = anchor_row + offset
+                    if row > sheet.max_row:
+                        break
+                    if len(index.tag_columns.get(row, {})) >= 2:
+                        tag_row = row
+                        break
+                
+                unit_col = None
+                if tag_row is not None:
+                    unit_col = cls._find_unit_column(sheet, tag_row, index.tag_columns[tag_row])
+                
+                index.blocks[anchor_row] = (tag_row, unit_col)
+        
+        return index
+    
+    @property
+    def total_anchors(self) -> int:
+        return sum(len(rows) for rows in self.anchors.values())
+    
+    @staticmethod
+    def _find_unit_column(sheet: SheetGrid, tag_row: int, 
+                          tag_columns: Dict[int, str]) -> Optional[int]:
+        """Encontra a coluna de unidades (geralmente antes das TAGs)."""
+        first_tag_col = min(tag_columns.keys())
+        
+        # Procurar coluna com unidades típicas antes das TAGs
+        for col in range(first_tag_col - 1, 0, -1):
+            cell_value = sheet.value(tag_row + 1, col)
+            if cell_value:
+                val = str(cell_value).strip().lower()
+                if any(u in val for u in UNIT_HINTS):
+                    return col
+        
+        return first_tag_col - 1 if first_tag_col > 1 else None
+
+
 # ============================================================================
 # CLASSE PRINCIPAL: ExcelExtractor
 # ============================================================================
@@ -162,21 +331,25 @@ class ExcelExtractor:
     Suporta: Daily_Oil, Daily_Gas, Daily_Water, GasBalance
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, file_hash: Optional[str] = None):
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
         
         self.workbook = None
-        self._file_hash = None
+        # Hash já calculado na indexação (evita reler o arquivo)
+        self._file_hash = file_hash
         self._file_type = None
     
     @property
     def file_hash(self) -> str:
         """Calcula hash SHA-256 do arquivo."""
         if self._file_hash is None:
+            sha256 = hashlib.sha256()
             with open(self.file_path, 'rb') as f:
-                self._file_hash = hashlib.sha256(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    sha256.update(chunk)
+            self._file_hash = sha256.hexdigest()
         return self._file_hash
     
     @property
@@ -233,13 +406,18 @@ class ExcelExtractor:
         )
         
         try:
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
-            sheet = self._get_main_sheet()
+            # Leitura única em modo read_only para uma grade de valores
+            self.workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+            worksheet = self._get_main_sheet()
             
-            if sheet is None:
+            if worksheet is None:
                 result.errors.append("Não foi possível encontrar a aba principal")
                 return result
             
+            sheet = SheetGrid.from_worksheet(worksheet)
+            self.workbook.close()
+            self.workbook = None
+            
             # Extrair metadados
             result.metadata = self._extract_metadata(sheet)
             if result.metadata is None:
@@ -286,7 +464,7 @@ class ExcelExtractor:
         # Fallback: primeira aba
         return self.workbook.active
     
-    def _extract_metadata(self, sheet: Worksheet) -> Optional[ReportMetadata]:
+    def _extract_metadata(self, sheet: 'SheetGrid') -> Optional[ReportMetadata]:
         """Extrai metadados do cabeçalho do relatório."""
         metadata = {
             'report_generated_at': None,
@@ -299,34 +477,34 @@ class ExcelExtractor:
         # Busca nas primeiras 25 linhas
         for row in range(1, 26):
             for col in range(1, 15):
-                cell = sheet.cell(row=row, column=col)
-                if cell.value is None:
+                cell_value = sheet.value(row, col)
+                if cell_value is None:
                     continue
                 
-                cell_str = str(cell.value).strip().lower()
+                cell_str = str(cell_value).strip().lower()
                 
                 # Date and time:
                 if 'date and time' in cell_str:
                     for offset in [1, 2]:
-                        next_cell = sheet.cell(row=row, column=col + offset)
-                        if next_cell.value:
-                            metadata['report_generated_at'] = self._parse_datetime(next_cell.value)
+                        next_value = sheet.value(row, col + offset)
+                        if next_value:
+                            metadata['report_generated_at'] = self._parse_datetime(next_value)
                             break
                 
                 # Field:
                 elif cell_str == 'field:' or cell_str.startswith('field'):
                     for offset in [1, 2]:
-                        next_cell = sheet.cell(row=row, column=col + offset)
-                        if next_cell.value:
-                            metadata['field_name'] = str(next_cell.value).strip()
+                        next_value = sheet.value(row, col + offset)
+                        if next_value:
+                            metadata['field_name'] = str(next_value).strip()
                             break
                 
                 # Period:
                 elif 'period:' in cell_str or cell_str == 'period':
                     for offset in [1, 2]:
-                        next_cell = sheet.cell(row=row, column=col + offset)
-                        if next_cell.value:
-                            period = self._parse_period(str(next_cell.value))
+                        next_value = sheet.value(row, col + offset)
+                        if next_value:
+                            period = self._parse_period(str(next_value))
                             if period:
                                 metadata['period_start'], metadata['period_end'] = period
                             break
@@ -414,29 +592,28 @@ class ExcelExtractor:
         
         return None
     
-    def _extract_daily_values(self, sheet: Worksheet, result: ExtractionResult) -> List[ExtractedValue]:
+    def _extract_daily_values(self, sheet: 'SheetGrid', result: ExtractionResult) -> List[ExtractedValue]:
         """Extrai valores dos blocos Cumulative/Day/Average."""
         values = []
         
-        # Encontrar todas as âncoras
-        anchors = self._find_block_anchors(sheet)
+        # Índice de âncoras, linhas de TAG e colunas de unidade (uma passada)
+        index = SheetIndex.build(sheet)
         
-        logger.info(f"Âncoras encontradas: {[(bt.value, rows) for bt, rows in anchors.items() if rows]}")
+        logger.info(f"Âncoras encontradas: {[(bt.value, rows) for bt, rows in index.anchors.items() if rows]}")
         
         # Se não encontrou âncoras padrão, tentar extração simplificada
-        total_anchors = sum(len(rows) for rows in anchors.values())
-        if total_anchors == 0:
+        if index.total_anchors == 0:
             logger.info("Usando extração simplificada (formato alternativo)")
             return self._extract_simple_format(sheet, result)
         
-        for block_type, anchor_rows in anchors.items():
+        for block_type, anchor_rows in index.anchors.items():
             for anchor_row in anchor_rows:
-                block_values = self._extract_block(sheet, anchor_row, block_type, result)
+                block_values = self._extract_block(sheet, index, anchor_row, block_type, result)
                 values.extend(block_values)
         
         return values
     
-    def _extract_simple_format(self, sheet: Worksheet, result: ExtractionResult) -> List[ExtractedValue]:
+    def _extract_simple_format(self, sheet: 'SheetGrid', result: ExtractionResult) -> List[ExtractedValue]:
         """
         Extrai valores de formato simplificado (sem âncoras padrão).
         Formato: Label | Value
@@ -446,14 +623,14 @@ class ExcelExtractor:
         current_section = ""
         
         for row in range(1, sheet.max_row + 1):
-            cell_a = sheet.cell(row=row, column=1)
-            cell_b = sheet.cell(row=row, column=2)
+            value_a = sheet.value(row, 1)
+            value_b = sheet.value(row, 2)
             
-            if cell_a.value is None:
+            if value_a is None:
                 continue
             
-            label = str(cell_a.value).strip()
-            value_str = str(cell_b.value).strip() if cell_b.value else ""
+            label = str(value_a).strip()
+            value_str = str(value_b).strip() if value_b else ""
             
             # Detectar seção (labels em maiúsculas ou com keywords)
             label_upper = label.upper()
@@ -497,44 +674,24 @@ class ExcelExtractor:
                     value=num_value,
                     unit=unit,
                     source_sheet=sheet.title,
-                    source_cell=f"{sheet.title}!{cell_b.coordinate}"
+                    source_cell=f"{sheet.title}!{sheet.coordinate(row, 2)}"
                 ))
         
         return values
     
-    def _find_block_anchors(self, sheet: Worksheet) -> Dict[BlockType, List[int]]:
-        """Encontra todas as âncoras de blocos na planilha."""
-        anchors = {bt: [] for bt in BlockType}
-        
-        for row in range(1, sheet.max_row + 1):
-            for col in range(1, min(sheet.max_column + 1, 20)):
-                cell = sheet.cell(row=row, column=col)
-                if cell.value is None:
-                    continue
-                
-                cell_str = str(cell.value).strip().lower()
-                
-                for block_type, patterns in BLOCK_ANCHORS.items():
-                    for pattern in patterns:
-                        if pattern in cell_str:
-                            anchors[block_type].append(row)
-                            break
-        
-        return anchors
-    
-    def _extract_block(self, sheet: Worksheet, anchor_row: int, block_type: BlockType, 
-                       result: ExtractionResult) -> List[ExtractedValue]:
+    def _extract_block(self, sheet: 'SheetGrid', index: SheetIndex, anchor_row: int, 
+                       block_type: BlockType, result: ExtractionResult) -> List[ExtractedValue]:
         """Extrai dados de um bloco específico."""
         values = []
         
-        # Encontrar linha de TAGs (geralmente 1-5 linhas abaixo da âncora)
-        tag_row = self._find_tag_row(sheet, anchor_row)
+        # Linha de TAGs e coluna de unidades vêm do índice da aba
+        tag_row, unit_col = index.blocks[anchor_row]
         if tag_row is None:
             result.warnings.append(f"TAG row não encontrada para âncora na linha {anchor_row}")
             return values
         
         # Mapear colunas para TAGs
-        tag_columns = self._get_tag_columns(sheet, tag_row)
+        tag_columns = index.tag_columns.get(tag_row, {})
         if not tag_columns:
             result.warnings.append(f"Nenhuma TAG encontrada na linha {tag_row}")
             return values
@@ -550,9 +707,6 @@ class ExcelExtractor:
             if sn and sn not in result.sections_found:
                 result.sections_found.append(sn)
         
-        # Encontrar coluna de unidades (geralmente coluna antes das TAGs)
-        unit_col = self._find_unit_column(sheet, tag_row, tag_columns)
-        
         # Ler linhas de variáveis
         current_row = tag_row + 1
         max_empty_rows = 3
@@ -560,19 +714,16 @@ class ExcelExtractor:
         
         while current_row <= sheet.max_row and empty_count < max_empty_rows:
             # Verificar se chegou em outra âncora
-            first_cell = sheet.cell(row=current_row, column=1).value
-            if first_cell:
-                first_str = str(first_cell).strip().lower()
-                if any(p in first_str for patterns in BLOCK_ANCHORS.values() for p in patterns):
-                    break
+            if current_row in index.first_column_anchor_rows:
+                break
             
             # Encontrar nome da variável (procurar nas primeiras colunas)
             variable_raw = None
             var_col = None
             for col in range(1, min(list(tag_columns.keys())[0] if tag_columns else 10, 10)):
-                cell = sheet.cell(row=current_row, column=col)
-                if cell.value and str(cell.value).strip():
-                    val = str(cell.value).strip()
+                cell_value = sheet.value(current_row, col)
+                if cell_value and str(cell_value).strip():
+                    val = str(cell_value).strip()
                     # Ignorar células que parecem números ou unidades
                     if not re.match(r'^[\d\.\,\-]+$', val) and len(val) > 2:
                         variable_raw = val
@@ -589,17 +740,16 @@ class ExcelExtractor:
             # Obter unidade
             unit = ""
             if unit_col:
-                unit_cell = sheet.cell(row=current_row, column=unit_col)
-                if unit_cell.value:
-                    unit = str(unit_cell.value).strip()
+                unit_value = sheet.value(current_row, unit_col)
+                if unit_value:
+                    unit = str(unit_value).strip()
             
             # Padronizar nome da variável
             variable_code = self._normalize_variable(variable_raw)
             
             # Extrair valores para cada TAG
             for col, tag in tag_columns.items():
-                cell = sheet.cell(row=current_row, column=col)
-                value = self._parse_numeric(cell.value)
+                value = self._parse_numeric(sheet.value(current_row, col))
                 
                 section_name = section_names.get(col, "")
                 
@@ -612,43 +762,14 @@ class ExcelExtractor:
                     value=value,
                     unit=unit,
                     source_sheet=sheet.title,
-                    source_cell=f"{sheet.title}!{cell.coordinate}"
+                    source_cell=f"{sheet.title}!{sheet.coordinate(current_row, col)}"
                 ))
             
             current_row += 1
         
         return values
     
-    def _find_tag_row(self, sheet: Worksheet, anchor_row: int) -> Optional[int]:
-        """Encontra a linha contendo TAGs abaixo de uma âncora."""
-        for offset in range(1, 8):
-            row = anchor_row + offset
-            if row > sheet.max_row:
-                break
-            
-            tag_count = 0
-            for col in range(1, sheet.max_column + 1):
-                cell = sheet.cell(row=row, column=col)
-                if cell.value and TAG_PATTERN.match(str(cell.value).strip()):
-                    tag_count += 1
-            
-            if tag_count >= 2:
-                return row
-        
-        return None
-    
-    def _get_tag_columns(self, sheet: Worksheet, tag_row: int) -> Dict[int, str]:
-        """Mapeia coluna -> TAG."""
-        tags = {}
-        for col in range(1, sheet.max_column + 1):
-            cell = sheet.cell(row=tag_row, column=col)
-            if cell.value:
-                tag = str(cell.value).strip()
-                if TAG_PATTERN.match(tag):
-                    tags[col] = tag
-        return tags
-    
-    def _get_section_names(self, sheet: Worksheet, anchor_row: int, 
+    def _get_section_names(self, sheet: 'SheetGrid', anchor_row: int, 
                            tag_columns: Dict[int, str]) -> Dict[int, str]:
         """Encontra nomes de seção para cada coluna de TAG."""
         sections = {}
@@ -660,9 +781,9 @@ class ExcelExtractor:
                 row = anchor_row - offset
                 if row < 1:
                     break
-                cell = sheet.cell(row=row, column=col)
-                if cell.value:
-                    val = str(cell.value).strip()
+                cell_value = sheet.value(row, col)
+                if cell_value:
+                    val = str(cell_value).strip()
                     # Ignorar se parece ser TAG ou número
                     if not TAG_PATTERN.match(val) and not re.match(r'^[\d\.\,]+$', val):
                         section_name = val
@@ -671,24 +792,6 @@ class ExcelExtractor:
         
         return sections
     
-    def _find_unit_column(self, sheet: Worksheet, tag_row: int, 
-                          tag_columns: Dict[int, str]) -> Optional[int]:
-        """Encontra a coluna de unidades."""
-        if not tag_columns:
-            return None
-        
-        first_tag_col = min(tag_columns.keys())
-        
-        # Procurar coluna com unidades típicas antes das TAGs
-        for col in range(first_tag_col - 1, 0, -1):
-            cell = sheet.cell(row=tag_row + 1, column=col)
-            if cell.value:
-                val = str(cell.value).strip().lower()
-                if any(u in val for u in ['m³', 'sm³', 'kpa', '°c', 'kg', 't', 'min', 'gj', '%']):
-                    return col
-        
-        return first_tag_col - 1 if first_tag_col > 1 else None
-    
     def _normalize_variable(self, raw: str) -> str:
         """Normaliza nome de variável para código padronizado."""
         raw_clean = raw.strip().lower()
@@ -725,7 +828,7 @@ class ExcelExtractor:
         except ValueError:
             return None
     
-    def _extract_gas_balance(self, sheet: Worksheet, result: ExtractionResult) -> List[GasBalanceLine]:
+    def _extract_gas_balance(self, sheet: 'SheetGrid', result: ExtractionResult) -> List[GasBalanceLine]:
         """Extrai dados do balanço de gás."""
         lines = []
         
@@ -733,8 +836,8 @@ class ExcelExtractor:
         balance_row = None
         for row in range(1, sheet.max_row + 1):
             for col in range(1, 10):
-                cell = sheet.cell(row=row, column=col)
-                if cell.value and 'gas balance' in str(cell.value).lower():
+                cell_value = sheet.value(row, col)
+                if cell_value and 'gas balance' in str(cell_value).lower():
                     balance_row = row
                     break
             if balance_row:
@@ -749,9 +852,9 @@ class ExcelExtractor:
         columns = {}
         
         for col in range(1, 20):
-            cell = sheet.cell(row=header_row, column=col)
-            if cell.value:
-                val = str(cell.value).strip().lower()
+            cell_value = sheet.value(header_row, col)
+            if cell_value:
+                val = str(cell_value).strip().lower()
                 if 'sign' in val or val in ['+', '-']:
                     columns['sign'] = col
                 elif 'flow rate' in val and 'unit' not in val:
@@ -776,21 +879,22 @@ class ExcelExtractor:
         line_order = 0
         
         while current_row <= sheet.max_row:
-            sign_cell = sheet.cell(row=current_row, column=columns.get('sign', 1))
+            sign_col = columns.get('sign', 1)
+            sign_value = sheet.value(current_row, sign_col)
             
-            if sign_cell.value is None:
+            if sign_value is None:
                 # Verificar se é linha de total
                 for col in range(1, 10):
-                    cell = sheet.cell(row=current_row, column=col)
-                    if cell.value and 'total' in str(cell.value).lower():
-                        sign_cell = cell
+                    cell_value = sheet.value(current_row, col)
+                    if cell_value and 'total' in str(cell_value).lower():
+                        sign_col, sign_value = col, cell_value
                         break
             
-            if sign_cell.value is None:
+            if sign_value is None:
                 current_row += 1
                 continue
             
-            sign_str = str(sign_cell.value).strip()
+            sign_str = str(sign_value).strip()
             
             # Determinar tipo de linha
             if sign_str == '+':
@@ -807,8 +911,8 @@ class ExcelExtractor:
             
             # Extrair descrição
             desc_col = columns.get('description', 2)
-            desc_cell = sheet.cell(row=current_row, column=desc_col)
-            description = str(desc_cell.value).strip() if desc_cell.value else ""
+            desc_value = sheet.value(current_row, desc_col)
+            description = str(desc_value).strip() if desc_value else ""
             
             # Extrair valores
             flowrate_value = None
@@ -817,20 +921,18 @@ class ExcelExtractor:
             pd_unit = ""
             
             if 'flowrate_value' in columns:
-                fv_cell = sheet.cell(row=current_row, column=columns['flowrate_value'])
-                flowrate_value = self._parse_numeric(fv_cell.value)
+                flowrate_value = self._parse_numeric(sheet.value(current_row, columns['flowrate_value']))
             
             if 'pd_value' in columns:
-                pv_cell = sheet.cell(row=current_row, column=columns['pd_value'])
-                pd_value = self._parse_numeric(pv_cell.value)
+                pd_value = self._parse_numeric(sheet.value(current_row, columns['pd_value']))
             
             if 'flowrate_unit' in columns:
-                fu_cell = sheet.cell(row=current_row, column=columns['flowrate_unit'])
-                flowrate_unit = str(fu_cell.value).strip() if fu_cell.value else ""
+                fu_value = sheet.value(current_row, columns['flowrate_unit'])
+                flowrate_unit = str(fu_value).strip() if fu_value else ""
             
             if 'pd_unit' in columns:
-                pu_cell = sheet.cell(row=current_row, column=columns['pd_unit'])
-                pd_unit = str(pu_cell.value).strip() if pu_cell.value else ""
+                pu_value = sheet.value(current_row, columns['pd_unit'])
+                pd_unit = str(pu_value).strip() if pu_value else ""
             
             lines.append(GasBalanceLine(
                 line_order=line_order,
@@ -840,7 +942,7 @@ class ExcelExtractor:
                 flowrate_unit=flowrate_unit,
                 pd_value=pd_value,
                 pd_unit=pd_unit,
-                source_cell=f"{sheet.title}!{sign_cell.coordinate}"
+                source_cell=f"{sheet.title}!{sheet.coordinate(current_row, sign_col)}"
             ))
             
             # Parar depois do TOTAL
@@ -859,8 +961,11 @@ class ExcelExtractor:
 class DatabaseLoader:
     """Carrega dados extraídos no banco de dados SQLite."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, conn: Optional[sqlite3.Connection] = None,
+                 bulk: bool = True):
         self.db_path = db_path
+        self.conn = conn
+        self.bulk = bulk
         self._ensure_schema()
     
     def _ensure_schema(self):
@@ -886,7 +991,9 @@ class DatabaseLoader:
         if not result.success or not result.metadata:
             return stats
         
-        conn = sqlite3.connect(self.db_path)
+        # Conexão externa (escritor do lote): commit/rollback ficam com o dono
+        own_conn = self.conn is None
+        conn = sqlite3.connect(self.db_path) if own_conn else self.conn
         cursor = conn.cursor()
         
         try:
@@ -941,65 +1048,40 @@ class DatabaseLoader:
                 FileType.DAILY_WATER: 'WATER'
             }.get(result.file_type, None)
             
-            for tag in result.meters_found:
-                cursor.execute("""
+            meter_rows = [(installation_id, tag, fluid_type) for tag in result.meters_found]
+            if meter_rows:
+                cursor.executemany("""
                     INSERT OR IGNORE INTO meter (installation_id, tag, fluid_type)
                     VALUES (?, ?, ?)
-                """, (installation_id, tag, fluid_type))
-                if cursor.rowcount > 0:
-                    stats['meters_created'] += 1
+                """, meter_rows)
+                stats['meters_created'] = max(cursor.rowcount, 0)
             
             # 4. Criar seções encontradas
-            for section_name in result.sections_found:
-                if section_name:
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO section (installation_id, name, fluid_type)
-                        VALUES (?, ?, ?)
-                    """, (installation_id, section_name, fluid_type))
-                    if cursor.rowcount > 0:
-                        stats['sections_created'] += 1
+            section_rows = [(installation_id, name, fluid_type) 
+                            for name in result.sections_found if name]
+            if section_rows:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO section (installation_id, name, fluid_type)
+                    VALUES (?, ?, ?)
+                """, section_rows)
+                stats['sections_created'] = max(cursor.rowcount, 0)
             
             # 5. Inserir valores
-            for val in result.values:
-                # Obter IDs
-                cursor.execute("SELECT id FROM meter WHERE tag = ? AND installation_id = ?", 
-                              (val.tag, installation_id))
-                meter_row = cursor.fetchone()
-                meter_id = meter_row[0] if meter_row else None
-                
-                cursor.execute("SELECT id FROM section WHERE name = ? AND installation_id = ?", 
-                              (val.section_name, installation_id))
-                section_row = cursor.fetchone()
-                section_id = section_row[0] if section_row else None
-                
-                cursor.execute("""
-                    INSERT OR REPLACE INTO daily_measurement
-                    (snapshot_id, import_id, meter_id, section_id, block_type, 
-                     variable_code, variable_raw, value, unit, source_sheet, source_cell)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    stats['snapshot_id'],
-                    stats['import_id'],
-                    meter_id,
-                    section_id,
-                    val.block_type.value,
-                    val.variable_code,
-                    val.variable_raw,
-                    val.value,
-                    val.unit,
-                    val.source_sheet,
-                    val.source_cell
-                ))
-                stats['values_inserted'] += 1
+            if self.bulk:
+                stats['values_inserted'] = self._insert_values_bulk(
+                    cursor, result, installation_id, stats['snapshot_id'], stats['import_id'])
+            else:
+                stats['values_inserted'] = self._insert_values_rowwise(
+                    cursor, result, installation_id, stats['snapshot_id'], stats['import_id'])
             
             # 6. Inserir balanço de gás
-            for line in result.gas_balance:
-                cursor.execute("""
-                    INSERT INTO gas_balance
-                    (snapshot_id, import_id, line_order, line_sign, line_description,
-                     flowrate_value, flowrate_unit, pd_value, pd_unit, source_cell)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
+            cursor.executemany("""
+                INSERT INTO gas_balance
+                (snapshot_id, import_id, line_order, line_sign, line_description,
+                 flowrate_value, flowrate_unit, pd_value, pd_unit, source_cell)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
                     stats['snapshot_id'],
                     stats['import_id'],
                     line.line_order,
@@ -1010,19 +1092,101 @@ class DatabaseLoader:
                     line.pd_value,
                     line.pd_unit,
                     line.source_cell
-                ))
-                stats['balance_lines_inserted'] += 1
+                )
+                for line in result.gas_balance
+            ])
+            stats['balance_lines_inserted'] = len(result.gas_balance)
             
-            conn.commit()
+            if own_conn:
+                conn.commit()
             
         except Exception as e:
-            conn.rollback()
+            if own_conn:
+                conn.rollback()
             logger.exception("Erro ao carregar dados no banco")
             raise
         finally:
-            conn.close()
+            if own_conn:
+                conn.close()
         
         return stats
+    
+    def _insert_values_bulk(self, cursor: sqlite3.Cursor, result: ExtractionResult,
+                            installation_id: int, snapshot_id: Optional[int],
+                            import_id: Optional[int]) -> int:
+        """
+        Insere todos os valores com um único executemany.
+        
+        IDs de medidor e seção são resolvidos uma vez em mapas em memória.
+        """
+        cursor.execute("SELECT tag, id FROM meter WHERE installation_id = ?", 
+                      (installation_id,))
+        meter_ids = dict(cursor.fetchall())
+        
+        cursor.execute("SELECT name, id FROM section WHERE installation_id = ?", 
+                      (installation_id,))
+        section_ids = dict(cursor.fetchall())
+        
+        cursor.executemany("""
+            INSERT OR REPLACE INTO daily_measurement
+            (snapshot_id, import_id, meter_id, section_id, block_type, 
+             variable_code, variable_raw, value, unit, source_sheet, source_cell)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                snapshot_id,
+                import_id,
+                meter_ids.get(val.tag),
+                section_ids.get(val.section_name),
+                val.block_type.value,
+                val.variable_code,
+                val.variable_raw,
+                val.value,
+                val.unit,
+                val.source_sheet,
+                val.source_cell
+            )
+            for val in result.values
+        ])
+        
+        return len(result.values)
+    
+    def _insert_values_rowwise(self, cursor: sqlite3.Cursor, result: ExtractionResult,
+                               installation_id: int, snapshot_id: Optional[int],
+                               import_id: Optional[int]) -> int:
+        """Insere os valores um a um (caminho original, mantido para comparação)."""
+        for val in result.values:
+            # Obter IDs
+            cursor.execute("SELECT id FROM meter WHERE tag = ? AND installation_id = ?", 
+                          (val.tag, installation_id))
+            meter_row = cursor.fetchone()
+            meter_id = meter_row[0] if meter_row else None
+            
+            cursor.execute("SELECT id FROM section WHERE name = ? AND installation_id = ?", 
+                          (val.section_name, installation_id))
+            section_row = cursor.fetchone()
+            section_id = section_row[0] if section_row else None
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO daily_measurement
+                (snapshot_id, import_id, meter_id, section_id, block_type, 
+                 variable_code, variable_raw, value, unit, source_sheet, source_cell)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                snapshot_id,
+                import_id,
+                meter_id,
+                section_id,
+                val.block_type.value,
+                val.variable_code,
+                val.variable_raw,
+                val.value,
+                val.unit,
+                val.source_sheet,
+                val.source_cell
+            ))
+        
+        return len(result.values)
 
 
 # ============================================================================
@@ -5,9 +5,11 @@ Suporta: MPFM Hourly, MPFM Daily, PVTCalibration
 
 Baseado no PRD Pipeline Diário SGM-FM v6
 """
+import io
 import re
 import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -22,6 +24,17 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Versão do parser: incrementar quando a saída da extração mudar
+# (invalida o cache de resultados em extractors/parse_cache.py)
+PARSER_VERSION = "1.0"
+
+# Leitura em blocos para o hash (memória constante em arquivos grandes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Mínimo de páginas para extrair texto em paralelo (abaixo disso o custo
+# de abrir o PDF em cada processo supera o ganho)
+PARALLEL_MIN_PAGES = 4
+
 
 # ============================================================================
 # ENUMS E CONSTANTES
@@ -222,6 +235,16 @@ class MPFMExtractionResult:
     warnings: List[str] = field(default_factory=list)
 
 
+# ============================================================================
+# EXTRAÇÃO DE TEXTO EM PARALELO
+# ============================================================================
+
+def _extract_pages_text(file_path: str, indices: List[int]) -> Dict[int, str]:
+    """Extrai o texto de um conjunto de páginas (executado em processo separado)."""
+    with pdfplumber.open(file_path) as pdf:
+        return {i: pdf.pages[i].extract_text() or "" for i in indices}
+
+
 # ============================================================================
 # CLASSE: MPFMPDFParser
 # ============================================================================
@@ -229,27 +252,85 @@ class MPFMExtractionResult:
 class MPFMPDFParser:
     """
     Parser especializado para relatórios MPFM em PDF.
+    
+    O PDF pode vir de um arquivo em disco ou, com `content`, de bytes já
+    em memória (ex.: membro de um ZIP). Neste caso `file_path` é usado
+    apenas como nome do arquivo.
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, workers: int = 1, 
+                 parallel_min_pages: int = PARALLEL_MIN_PAGES, file_hash: Optional[str] = None,
+                 content: Optional[bytes] = None):
         if pdfplumber is None:
             raise ImportError("pdfplumber é necessário. Instale: pip install pdfplumber")
         
         self.file_path = Path(file_path)
-        if not self.file_path.exists():
+        self.content = content
+        if content is None and not self.file_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
         
-        self._file_hash = None
-        self._text_cache = {}
+        self.workers = max(1, workers)
+        self.parallel_min_pages = parallel_min_pages
+        
+        # Hash já calculado na indexação (evita reler o arquivo)
+        self._file_hash = file_hash
+        # Texto por página (índice -> texto), preenchido uma vez por documento
+        self._text_cache: Dict[int, str] = {}
     
     @property
     def file_hash(self) -> str:
         """Calcula SHA-256."""
-        if self._file_hash is None:
+        if self._file_hash is None and self.content is not None:
+            self._file_hash = hashlib.sha256(self.content).hexdigest()
+        elif self._file_hash is None:
+            sha256 = hashlib.sha256()
             with open(self.file_path, 'rb') as f:
-                self._file_hash = hashlib.sha256(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    sha256.update(chunk)
+            self._file_hash = sha256.hexdigest()
         return self._file_hash
     
+    def _open(self):
+        """Abre o PDF a partir do disco ou dos bytes em memória."""
+        if self.content is not None:
+            return pdfplumber.open(io.BytesIO(self.content))
+        return pdfplumber.open(self.file_path)
+    
+    def _page_text(self, pdf, index: int) -> str:
+        """Texto de uma página (extraído uma única vez por documento)."""
+        if index not in self._text_cache:
+            self._text_cache[index] = pdf.pages[index].extract_text() or ""
+        return self._text_cache[index]
+    
+    def _full_text(self, pdf) -> str:
+        """
+        Texto completo do documento a partir do cache de páginas.
+        
+        Com workers > 1 e documentos com muitas páginas, as páginas ainda
+        não extraídas são distribuídas entre processos.
+        """
+        page_count = len(pdf.pages)
+        missing = [i for i in range(page_count) if i not in self._text_cache]
+        
+        # Em memória não há caminho para os processos filhos: extração serial
+        if (self.workers > 1 and self.content is None
+                and len(missing) >= max(self.parallel_min_pages, 2)):
+            self._text_cache.update(self._extract_pages_parallel(missing))
+        
+        return "".join(self._page_text(pdf, i) + "\n" for i in range(page_count))
+    
+    def _extract_pages_parallel(self, indices: List[int]) -> Dict[int, str]:
+        """Extrai o texto de várias páginas em um pool de processos."""
+        chunk_count = min(self.workers, len(indices))
+        chunks = [indices[i::chunk_count] for i in range(chunk_count)]
+        
+        texts = {}
+        with ProcessPoolExecutor(max_workers=chunk_count) as executor:
+            for chunk_texts in executor.map(_extract_pages_text, 
+                                            [str(self.file_path)] * chunk_count, chunks):
+                texts.update(chunk_texts)
+        return texts
+    
     def _detect_report_type(self, text: str) -> MPFMReportType:
         """Detecta tipo de relatório pelo conteúdo."""
         text_lower = text.lower()
@@ -473,10 +554,7 @@ class MPFMPDFParser:
         """Parse relatório MPFM Hourly."""
         records = []
         
-        full_text = ""
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            full_text += page_text + "\n"
+        full_text = self._full_text(pdf)
         
         # Extrair metadados
         period_start, period_end = self._extract_period(full_text)
@@ -520,10 +598,7 @@ class MPFMPDFParser:
         """Parse relatório MPFM Daily."""
         records = []
         
-        full_text = ""
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            full_text += page_text + "\n"
+        full_text = self._full_text(pdf)
         
         # Extrair metadados
         period_start, period_end = self._extract_period(full_text)
@@ -597,10 +672,7 @@ class MPFMPDFParser:
         """Parse relatório PVTCalibration."""
         records = []
         
-        full_text = ""
-        for page in pdf.pages:
-            page_text = page.extract_text() or ""
-            full_text += page_text + "\n"
+        full_text = self._full_text(pdf)
         
         # Extrair Calibration No
         cal_no_match = re.search(r'calibration\s+no\.?\s*[:\s]*(\d+)', full_text, re.IGNORECASE)
@@ -782,9 +854,9 @@ class MPFMPDFParser:
         )
         
         try:
-            with pdfplumber.open(self.file_path) as pdf:
+            with self._open() as pdf:
                 # Extrair texto da primeira página para detectar tipo
-                first_page_text = pdf.pages[0].extract_text() or ""
+                first_page_text = self._page_text(pdf, 0)
                 
                 result.report_type = self._detect_report_type(first_page_text)
                 
@@ -814,9 +886,14 @@ class MPFMPDFParser:
 # FUNÇÕES DE CONVENIÊNCIA
 # ============================================================================
 
-def parse_mpfm_pdf(file_path: str) -> MPFMExtractionResult:
-    """Parse um arquivo PDF MPFM."""
-    parser = MPFMPDFParser(file_path)
+def parse_mpfm_pdf(file_path: str, workers: int = 1, content: Optional[bytes] = None,
+                   file_hash: Optional[str] = None) -> MPFMExtractionResult:
+    """
+    Parse um arquivo PDF MPFM (do disco ou de `content`).
+    
+    Função de módulo: pode ser enviada a um ProcessPoolExecutor.
+    """
+    parser = MPFMPDFParser(file_path, workers=workers, file_hash=file_hash, content=content)
     return parser.extract()
 
 
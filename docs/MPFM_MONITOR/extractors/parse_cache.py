@@ -0,0 +1,173 @@
+"""
+SGM-FM - Cache de Resultados de Extração
+Cache em disco de resultados de parsing (ExtractionResult, XMLExtractionResult,
+MPFMExtractionResult, ...) endereçado pelo SHA-256 do arquivo e pela versão do
+parser. Reenvios do mesmo arquivo não passam de novo por openpyxl/pdfplumber.
+"""
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Tamanho máximo padrão do cache (bytes)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+CACHE_SUFFIX = ".pkl"
+
+# Gravações entre varreduras completas do diretório (ressincroniza o
+# tamanho estimado com entradas gravadas/removidas por outros processos)
+EVICT_EVERY_PUTS = 100
+
+# Fração de max_bytes a que a remoção reduz o cache (folga até a próxima)
+EVICT_LOW_WATER = 0.9
+
+
+# ============================================================================
+# CLASSE: ParseCache
+# ============================================================================
+
+class ParseCache:
+    """
+    Cache LRU em disco de resultados de extração.
+    
+    Cada entrada é um arquivo pickle cujo nome deriva de
+    (parser, versão do parser, SHA-256 do arquivo, nome do arquivo).
+    O nome entra na chave porque os parsers também leem dados dele
+    (tipo de relatório, bank, data de fallback).
+    
+    O mtime da entrada marca o último acesso; ao exceder `max_bytes`
+    as entradas menos usadas recentemente são removidas.
+    
+    O tamanho total é mantido em memória: a primeira gravação varre o
+    diretório e as seguintes só somam o tamanho escrito. A varredura
+    completa (evict) roda quando a estimativa passa de `max_bytes` (e
+    reduz o cache a EVICT_LOW_WATER do limite) ou a cada EVICT_EVERY_PUTS
+    gravações, o que corrige a estimativa quando vários processos gravam
+    no mesmo diretório.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        
+        self.hits = 0
+        self.misses = 0
+        
+        # Tamanho estimado do cache (None = ainda não varrido)
+        self._size_bytes: Optional[int] = None
+        self._puts_since_scan = 0
+    
+    def _entry_path(self, parser: str, version: str, file_hash: str,
+                    file_name: str = "") -> Path:
+        key = hashlib.sha256(f"{parser}|{version}|{file_hash}|{file_name}".encode()).hexdigest()
+        return self.cache_dir / f"{parser}-{key}{CACHE_SUFFIX}"
+    
+    def get(self, parser: str, version: str, file_hash: str,
+            file_name: str = "") -> Optional[Any]:
+        """Retorna o resultado em cache ou None."""
+        path = self._entry_path(parser, version, file_hash, file_name)
+        
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # Entrada corrompida ou de classes que não existem mais
+            logger.warning(f"Entrada de cache inválida descartada ({path.name}): {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        
+        # Marcar acesso (LRU)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        self.hits += 1
+        return result
+    
+    def put(self, parser: str, version: str, file_hash: str, result: Any,
+            file_name: str = "") -> None:
+        """Grava um resultado no cache (escrita atômica) e aplica o limite."""
+        path = self._entry_path(parser, version, file_hash, file_name)
+        tmp_path = None
+        
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                written = f.tell()
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar cache de {file_name or file_hash}: {e}")
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+            return
+        
+        self._puts_since_scan += 1
+        if self._size_bytes is not None:
+            self._size_bytes += written - replaced
+        
+        if (self._size_bytes is None or self._size_bytes > self.max_bytes
+                or self._puts_since_scan >= EVICT_EVERY_PUTS):
+            self.evict()
+    
+    def evict(self) -> int:
+        """
+        Remove entradas menos usadas se o total passar de max_bytes,
+        até EVICT_LOW_WATER * max_bytes. Retorna removidas.
+        """
+        entries = []
+        total = 0
+        
+        for path in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_LOW_WATER
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+                if total <= target:
+                    break
+        
+        self._size_bytes = total
+        self._puts_since_scan = 0
+        return removed
+    
+    def stats(self) -> Dict:
+        """Estatísticas de uso do cache."""
+        entries = list(self.cache_dir.glob(f"*{CACHE_SUFFIX}"))
+        
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'size_bytes': sum(p.stat().st_size for p in entries if p.exists())
+        }
@@ -22,6 +22,13 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Versão do parser: incrementar quando a saída da extração mudar
+# (invalida o cache de resultados em extractors/parse_cache.py)
+PARSER_VERSION = "1.0"
+
+# Leitura em blocos para o hash (memória constante em arquivos grandes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 # ============================================================================
 # CONSTANTES
@@ -136,7 +143,7 @@ class PDFExtractor:
     Suporta relatórios de calibração, PVT, avaliação e não-conformidades.
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, file_hash: Optional[str] = None):
         if pdfplumber is None:
             raise ImportError("pdfplumber é necessário. Instale com: pip install pdfplumber")
         
@@ -144,15 +151,19 @@ class PDFExtractor:
         if not self.file_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
         
-        self._file_hash = None
+        # Hash já calculado na indexação (evita reler o arquivo)
+        self._file_hash = file_hash
         self._pdf_type = None
     
     @property
     def file_hash(self) -> str:
         """Calcula hash SHA-256 do arquivo."""
         if self._file_hash is None:
+            sha256 = hashlib.sha256()
             with open(self.file_path, 'rb') as f:
-                self._file_hash = hashlib.sha256(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    sha256.update(chunk)
+            self._file_hash = sha256.hexdigest()
         return self._file_hash
     
     def _detect_pdf_type(self, text: str) -> PDFType:
@@ -425,8 +436,9 @@ class PDFExtractor:
 class PDFDatabaseLoader:
     """Carrega dados PDF extraídos no banco de dados."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, conn: Optional[sqlite3.Connection] = None):
         self.db_path = db_path
+        self.conn = conn
     
     def load(self, result: PDFExtractionResult, installation_id: int = 1) -> Dict:
         """
@@ -445,7 +457,9 @@ class PDFDatabaseLoader:
         if not result.success or not result.metadata:
             return stats
         
-        conn = sqlite3.connect(self.db_path)
+        # Conexão externa (escritor do lote): commit/rollback ficam com o dono
+        own_conn = self.conn is None
+        conn = sqlite3.connect(self.db_path) if own_conn else self.conn
         cursor = conn.cursor()
         
         try:
@@ -542,14 +556,17 @@ class PDFDatabaseLoader:
                 ))
                 stats['tables_stored'] += 1
             
-            conn.commit()
+            if own_conn:
+                conn.commit()
             
         except Exception as e:
-            conn.rollback()
+            if own_conn:
+                conn.rollback()
             logger.exception("Erro ao carregar PDF no banco")
             raise
         finally:
-            conn.close()
+            if own_conn:
+                conn.close()
         
         return stats
     
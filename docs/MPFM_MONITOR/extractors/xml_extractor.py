@@ -18,6 +18,13 @@ import xml.etree.ElementTree as ET
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Versão do parser: incrementar quando a saída da extração mudar
+# (invalida o cache de resultados em extractors/parse_cache.py)
+PARSER_VERSION = "1.0"
+
+# Leitura em blocos para o hash (memória constante em arquivos grandes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 # ============================================================================
 # CONSTANTES
@@ -171,12 +178,13 @@ class XMLExtractor:
     Suporta tipos 001 (Óleo), 002 (Gás Linear), 003 (Gás Diferencial), 004 (Alarmes).
     """
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, file_hash: Optional[str] = None):
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
         
-        self._file_hash = None
+        # Hash já calculado na indexação (evita reler o arquivo)
+        self._file_hash = file_hash
         self._xml_type = None
         self.root = None
     
@@ -184,8 +192,11 @@ class XMLExtractor:
     def file_hash(self) -> str:
         """Calcula hash SHA-256 do arquivo."""
         if self._file_hash is None:
+            sha256 = hashlib.sha256()
             with open(self.file_path, 'rb') as f:
-                self._file_hash = hashlib.sha256(f.read()).hexdigest()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                    sha256.update(chunk)
+            self._file_hash = sha256.hexdigest()
         return self._file_hash
     
     def _detect_xml_type(self) -> XMLType:
@@ -544,8 +555,9 @@ class XMLExtractor:
 class XMLDatabaseLoader:
     """Carrega dados XML extraídos no banco de dados SQLite."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, conn: Optional[sqlite3.Connection] = None):
         self.db_path = db_path
+        self.conn = conn
     
     def load(self, result: XMLExtractionResult, installation_id: int = 1) -> Dict:
         """
@@ -566,7 +578,9 @@ class XMLDatabaseLoader:
         if not result.success or not result.metadata:
             return stats
         
-        conn = sqlite3.connect(self.db_path)
+        # Conexão externa (escritor do lote): commit/rollback ficam com o dono
+        own_conn = self.conn is None
+        conn = sqlite3.connect(self.db_path) if own_conn else self.conn
         cursor = conn.cursor()
         
         try:
@@ -756,14 +770,17 @@ class XMLDatabaseLoader:
                     ))
                     stats['events_inserted'] += 1
             
-            conn.commit()
+            if own_conn:
+                conn.commit()
             
         except Exception as e:
-            conn.rollback()
+            if own_conn:
+                conn.rollback()
             logger.exception("Erro ao carregar XML no banco")
             raise
         finally:
-            conn.close()
+            if own_conn:
+                conn.close()
         
         return stats
 
@@ -231,11 +231,8 @@ def run_cross_validation(db_path: str, date_str: str = None, days: int = 1) -> D
         else:
             target_date = date.today() - timedelta(days=1)
         
-        all_results = []
-        for i in range(days):
-            d = target_date - timedelta(days=i)
-            results = validator.validate_date(d)
-            all_results.extend(results)
+        results = validator.validate_range(target_date - timedelta(days=days - 1), target_date)
+        all_results = [r for day_results in results.values() for r in day_results]
         
         # Estatísticas
         stats = defaultdict(int)
@@ -11,12 +11,15 @@ import sqlite3
 import json
 import logging
 import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from collections import defaultdict
+from contextlib import contextmanager
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -63,6 +66,14 @@ FILE_PATTERNS = {
     FileType.XML_004: ['004_'],
 }
 
+# Leitura em blocos para hash e extração (memória constante em arquivos grandes)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Agrupamento de tipos por extrator
+EXCEL_FILE_TYPES = (FileType.DAILY_OIL, FileType.DAILY_GAS, FileType.DAILY_WATER, FileType.GAS_BALANCE)
+XML_FILE_TYPES = (FileType.XML_001, FileType.XML_002, FileType.XML_003, FileType.XML_004)
+PDF_FILE_TYPES = (FileType.MPFM_HOURLY, FileType.MPFM_DAILY, FileType.PVT_CALIBRATION)
+
 
 # ============================================================================
 # DATA CLASSES
@@ -113,6 +124,98 @@ class PipelineResult:
     manifests: List[Dict] = field(default_factory=list)
     reconciliations: List[Dict] = field(default_factory=list)
     validations: List[Dict] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    write_stats: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ExtractionOutcome:
+    """Resultado da etapa de extração de um arquivo (sem acesso ao banco)."""
+    extraction: Any = None
+    errors: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    cached: bool = False
+
+
+# ============================================================================
+# EXTRAÇÃO (executável em processo separado)
+# ============================================================================
+
+def extract_file(file_type: FileType, file_path: str, file_hash: str = None,
+                 cache_dir: str = None, cache_max_bytes: int = None) -> ExtractionOutcome:
+    """
+    Executa somente a extração de um arquivo.
+    
+    Função de módulo (serializável) para rodar em ProcessPoolExecutor.
+    Não acessa o banco: a carga é feita pelo processo principal.
+    
+    Com cache_dir e file_hash, resultados já extraídos (mesmo conteúdo,
+    mesmo nome, mesma versão do parser) são lidos do cache em disco
+    (limitado a cache_max_bytes; padrão DEFAULT_MAX_BYTES).
+    """
+    module_dir = str(Path(__file__).parent)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    
+    outcome = ExtractionOutcome()
+    start = time.perf_counter()
+    
+    try:
+        if file_type in EXCEL_FILE_TYPES:
+            from extractors import excel_extractor as module
+            parser_name, make_extractor = 'excel', module.ExcelExtractor
+        
+        elif file_type in XML_FILE_TYPES:
+            from extractors import xml_extractor as module
+            parser_name, make_extractor = 'xml', module.XMLExtractor
+        
+        elif file_type in PDF_FILE_TYPES:
+            # TODO: Implementar parser PDF específico para MPFM Hourly/Daily
+            # Por enquanto, usa o extrator genérico
+            from extractors import pdf_extractor as module
+            parser_name, make_extractor = 'pdf', module.PDFExtractor
+        
+        else:
+            outcome.elapsed = time.perf_counter() - start
+            return outcome
+        
+        cache = None
+        file_name = Path(file_path).name
+        if cache_dir and file_hash:
+            cache = _get_parse_cache(cache_dir, cache_max_bytes)
+            outcome.extraction = cache.get(parser_name, module.PARSER_VERSION, file_hash, file_name)
+            outcome.cached = outcome.extraction is not None
+        
+        if outcome.extraction is None:
+            try:
+                outcome.extraction = make_extractor(file_path, file_hash=file_hash).extract()
+            except ImportError:
+                if parser_name != 'pdf':
+                    raise
+                outcome.errors.append("pdfplumber não instalado")
+            
+            if cache is not None and outcome.extraction is not None and outcome.extraction.success:
+                cache.put(parser_name, module.PARSER_VERSION, file_hash, outcome.extraction, file_name)
+    
+    except Exception as e:
+        outcome.errors.append(str(e))
+    
+    outcome.elapsed = time.perf_counter() - start
+    return outcome
+
+
+# Um ParseCache por processo e diretório: o tamanho do cache fica em
+# memória entre arquivos, sem varrer o diretório a cada gravação
+_parse_caches: Dict[Tuple[str, Optional[int]], Any] = {}
+
+
+def _get_parse_cache(cache_dir: str, max_bytes: int = None):
+    from extractors.parse_cache import ParseCache, DEFAULT_MAX_BYTES
+    
+    key = (cache_dir, max_bytes)
+    if key not in _parse_caches:
+        _parse_caches[key] = ParseCache(cache_dir, max_bytes or DEFAULT_MAX_BYTES)
+    return _parse_caches[key]
 
 
 # ============================================================================
@@ -132,26 +235,80 @@ class IngestionPipeline:
     6. Carga na base única
     """
     
-    def __init__(self, db_path: str, work_dir: str = None, installation_id: int = 1):
+    def __init__(self, db_path: str, work_dir: str = None, installation_id: int = 1,
+                 workers: int = 1, commit_rows: int = None, commit_seconds: float = None,
+                 cache_dir: str = None, cache_max_bytes: int = None):
         self.db_path = db_path
         self.work_dir = Path(work_dir) if work_dir else Path.cwd() / "data" / "processing"
         self.work_dir.mkdir(parents=True, exist_ok=True)
         self.installation_id = installation_id
+        self.workers = max(1, workers)
+        self.commit_rows = commit_rows
+        self.commit_seconds = commit_seconds
+        
+        # Cache de resultados de extração (None = desativado)
+        self.cache_dir = str(cache_dir) if cache_dir else None
+        self.cache_max_bytes = cache_max_bytes
+        
+        # Escritor único do lote (aberto somente durante run())
+        self.writer = None
         
         # Importar extratores
         sys.path.insert(0, str(Path(__file__).parent.parent))
         from extractors.excel_extractor import ExcelExtractor, DatabaseLoader as ExcelLoader
         from extractors.xml_extractor import XMLExtractor, XMLDatabaseLoader
+        from batch_writer import BatchWriter
         
         self.ExcelExtractor = ExcelExtractor
         self.ExcelLoader = ExcelLoader
         self.XMLExtractor = XMLExtractor
         self.XMLDatabaseLoader = XMLDatabaseLoader
+        self.BatchWriter = BatchWriter
+    
+    @contextmanager
+    def _connection(self):
+        """
+        Conexão de escrita.
+        
+        Durante run() usa o escritor do lote (um SAVEPOINT por unidade de
+        trabalho, commit agrupado); fora dele abre uma conexão avulsa.
+        """
+        if self.writer is not None:
+            with self.writer.savepoint() as conn:
+                yield conn
+            self.writer.maybe_commit()
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
     
     def calculate_hash(self, file_path: Path) -> str:
-        """Calcula SHA-256 de um arquivo."""
+        """Calcula SHA-256 de um arquivo (leitura em blocos)."""
+        sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+    
+    def stream_zip_member(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo,
+                          target: Path) -> str:
+        """
+        Descompacta um membro do ZIP para `target` calculando o SHA-256
+        no mesmo passo. Retorna o hash do conteúdo descompactado.
+        """
+        sha256 = hashlib.sha256()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        
+        with zf.open(info) as src, open(target, 'wb') as dst:
+            for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+                dst.write(chunk)
+        
+        return sha256.hexdigest()
     
     def detect_file_type(self, file_path: Path) -> FileType:
         """Detecta tipo de arquivo pelo nome."""
@@ -233,12 +390,17 @@ class IngestionPipeline:
         
         return None
     
-    def index_file(self, file_path: Path) -> FileInfo:
-        """Indexa um arquivo e extrai metadados."""
+    def index_file(self, file_path: Path, file_hash: Optional[str] = None) -> FileInfo:
+        """
+        Indexa um arquivo e extrai metadados.
+        
+        Se `file_hash` já foi calculado (ex.: durante a descompactação),
+        o arquivo não é lido de novo.
+        """
         return FileInfo(
             path=file_path,
             name=file_path.name,
-            hash=self.calculate_hash(file_path),
+            hash=file_hash or self.calculate_hash(file_path),
             size=file_path.stat().st_size,
             file_type=self.detect_file_type(file_path),
             report_date=self.extract_date_from_name(file_path.name),
@@ -252,7 +414,7 @@ class IngestionPipeline:
         
         Args:
             zip_path: Caminho do arquivo ZIP
-            
+        
         Returns:
             BatchInfo com arquivos indexados
         """
@@ -267,14 +429,23 @@ class IngestionPipeline:
             package_hash=self.calculate_hash(zip_path)
         )
         
-        # Extrair ZIP
+        # Extrair e indexar em um único passo: cada membro é descompactado
+        # em blocos e o hash é calculado enquanto é gravado em disco
+        root = extract_dir.resolve()
         with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(extract_dir)
-        
-        # Indexar arquivos extraídos
-        for file_path in extract_dir.rglob('*'):
-            if file_path.is_file() and not file_path.name.startswith('.'):
-                file_info = self.index_file(file_path)
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                
+                target = extract_dir / info.filename
+                if root not in target.resolve().parents:
+                    logger.warning(f"Membro ignorado (caminho inválido): {info.filename}")
+                    continue
+                if target.name.startswith('.'):
+                    continue
+                
+                file_hash = self.stream_zip_member(zf, info, target)
+                file_info = self.index_file(target, file_hash)
                 batch.files.append(file_info)
                 
                 # Agrupar por data
@@ -323,10 +494,9 @@ class IngestionPipeline:
     
     def register_batch(self, batch: BatchInfo) -> int:
         """Registra lote no banco e retorna batch_id."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT OR IGNORE INTO batch_package
                 (package_name, package_hash, file_count, upload_source, status)
@@ -338,19 +508,13 @@ class IngestionPipeline:
             """, (batch.package_hash,))
             
             row = cursor.fetchone()
-            batch_id = row[0] if row else None
-            
-            conn.commit()
-            return batch_id
-        finally:
-            conn.close()
+            return row[0] if row else None
     
     def register_file(self, file_info: FileInfo, batch_id: int) -> int:
         """Registra arquivo no staged_file."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
             cursor.execute("""
                 INSERT OR IGNORE INTO staged_file
                 (batch_id, file_name, file_path, file_hash, file_size, file_type,
@@ -372,20 +536,15 @@ class IngestionPipeline:
             """, (file_info.hash,))
             
             row = cursor.fetchone()
-            staged_id = row[0] if row else None
-            
-            conn.commit()
-            return staged_id
-        finally:
-            conn.close()
+            return row[0] if row else None
     
     def create_manifests(self, batch: BatchInfo, batch_id: int) -> List[Dict]:
         """Cria manifestos de lote por asset/data."""
         manifests = []
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
-        try:
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
             # Agrupar por asset e data
             for asset_tag, files in batch.by_asset.items():
                 by_date = defaultdict(list)
@@ -428,38 +587,35 @@ class IngestionPipeline:
                     ))
                     
                     manifests.append(manifest)
-            
-            conn.commit()
-        finally:
-            conn.close()
         
         return manifests
     
-    def process_file(self, file_info: FileInfo, staged_id: int) -> ProcessingResult:
-        """Processa um arquivo individual."""
+    def process_file(self, file_info: FileInfo, staged_id: int,
+                     outcome: Optional[ExtractionOutcome] = None) -> ProcessingResult:
+        """
+        Processa um arquivo individual.
+        
+        Args:
+            file_info: Arquivo indexado
+            staged_id: ID em staged_file
+            outcome: Extração já realizada (modo paralelo). Se None, extrai aqui.
+        """
         result = ProcessingResult(file_info=file_info, staged_file_id=staged_id)
         
         try:
             file_type = file_info.file_type
             
-            if file_type in [FileType.DAILY_OIL, FileType.DAILY_GAS, 
-                            FileType.DAILY_WATER, FileType.GAS_BALANCE]:
-                # Processar Excel
-                result = self._process_excel(file_info, staged_id)
-                
-            elif file_type in [FileType.XML_001, FileType.XML_002, 
-                              FileType.XML_003, FileType.XML_004]:
-                # Processar XML
-                result = self._process_xml(file_info, staged_id)
-                
-            elif file_type in [FileType.MPFM_HOURLY, FileType.MPFM_DAILY, FileType.PVT_CALIBRATION]:
-                # Processar PDF
-                result = self._process_pdf(file_info, staged_id)
-                
+            if file_type in EXCEL_FILE_TYPES + XML_FILE_TYPES + PDF_FILE_TYPES:
+                if outcome is None:
+                    outcome = extract_file(file_type, str(file_info.path),
+                                           file_info.hash, self.cache_dir,
+                                           self.cache_max_bytes)
+                result = self._load_extraction(file_info, staged_id, outcome)
+            
             else:
                 result.status = ParseStatus.FAILED
                 result.errors.append(f"Tipo de arquivo não suportado: {file_type}")
-            
+        
         except Exception as e:
             result.status = ParseStatus.FAILED
             result.errors.append(str(e))
@@ -470,100 +626,71 @@ class IngestionPipeline:
         
         return result
     
-    def _process_excel(self, file_info: FileInfo, staged_id: int) -> ProcessingResult:
-        """Processa arquivo Excel."""
+    def _load_extraction(self, file_info: FileInfo, staged_id: int,
+                         outcome: ExtractionOutcome) -> ProcessingResult:
+        """Carrega no banco o resultado de uma extração."""
         result = ProcessingResult(file_info=file_info, staged_file_id=staged_id)
+        extraction = outcome.extraction
         
-        try:
-            extractor = self.ExcelExtractor(str(file_info.path))
-            extraction = extractor.extract()
-            
-            if extraction.success:
-                loader = self.ExcelLoader(self.db_path)
-                stats = loader.load(extraction, self.installation_id)
-                
-                result.status = ParseStatus.SUCCESS
-                result.records_extracted = stats.get('values_inserted', 0) + stats.get('balance_lines_inserted', 0)
-                result.warnings = extraction.warnings
-            else:
-                result.status = ParseStatus.FAILED
-                result.errors = extraction.errors
-                
-        except Exception as e:
+        if outcome.errors or extraction is None:
             result.status = ParseStatus.FAILED
-            result.errors.append(str(e))
-        
-        return result
-    
-    def _process_xml(self, file_info: FileInfo, staged_id: int) -> ProcessingResult:
-        """Processa arquivo XML ANP."""
-        result = ProcessingResult(file_info=file_info, staged_file_id=staged_id)
+            result.errors.extend(outcome.errors)
+            return result
         
-        try:
-            extractor = self.XMLExtractor(str(file_info.path))
-            extraction = extractor.extract()
-            
-            if extraction.success:
-                loader = self.XMLDatabaseLoader(self.db_path)
-                stats = loader.load(extraction, self.installation_id)
-                
-                result.status = ParseStatus.SUCCESS
-                result.records_extracted = (
-                    stats.get('configs_inserted', 0) + 
-                    stats.get('production_records', 0) +
-                    stats.get('alarms_inserted', 0) +
-                    stats.get('events_inserted', 0)
-                )
-                result.warnings = extraction.warnings
-            else:
-                result.status = ParseStatus.FAILED
-                result.errors = extraction.errors
-                
-        except Exception as e:
+        if not extraction.success:
             result.status = ParseStatus.FAILED
-            result.errors.append(str(e))
+            result.errors = extraction.errors
+            return result
         
-        return result
-    
-    def _process_pdf(self, file_info: FileInfo, staged_id: int) -> ProcessingResult:
-        """Processa arquivo PDF MPFM."""
-        result = ProcessingResult(file_info=file_info, staged_file_id=staged_id)
-        
-        # TODO: Implementar parser PDF específico para MPFM Hourly/Daily
-        # Por enquanto, usa o extrator genérico
         try:
-            from extractors.pdf_extractor import PDFExtractor, PDFDatabaseLoader
-            
-            extractor = PDFExtractor(str(file_info.path))
-            extraction = extractor.extract()
-            
-            if extraction.success:
-                loader = PDFDatabaseLoader(self.db_path)
-                stats = loader.load(extraction, self.installation_id)
-                
-                result.status = ParseStatus.SUCCESS
-                result.records_extracted = stats.get('data_points_stored', 0)
-                result.warnings = extraction.warnings
+            if file_info.file_type in EXCEL_FILE_TYPES:
+                result.records_extracted = self._load_excel(extraction)
+            elif file_info.file_type in XML_FILE_TYPES:
+                result.records_extracted = self._load_xml(extraction)
             else:
-                result.status = ParseStatus.FAILED
-                result.errors = extraction.errors
-                
-        except ImportError:
-            result.status = ParseStatus.FAILED
-            result.errors.append("pdfplumber não instalado")
+                result.records_extracted = self._load_pdf(extraction)
+            
+            result.status = ParseStatus.SUCCESS
+            result.warnings = extraction.warnings
+        
         except Exception as e:
             result.status = ParseStatus.FAILED
             result.errors.append(str(e))
         
         return result
     
+    def _load_excel(self, extraction) -> int:
+        """Carrega extração Excel e retorna registros inseridos."""
+        with self._connection() as conn:
+            loader = self.ExcelLoader(self.db_path, conn=conn)
+            stats = loader.load(extraction, self.installation_id)
+        return stats.get('values_inserted', 0) + stats.get('balance_lines_inserted', 0)
+    
+    def _load_xml(self, extraction) -> int:
+        """Carrega extração XML ANP e retorna registros inseridos."""
+        with self._connection() as conn:
+            loader = self.XMLDatabaseLoader(self.db_path, conn=conn)
+            stats = loader.load(extraction, self.installation_id)
+        return (
+            stats.get('configs_inserted', 0) + 
+            stats.get('production_records', 0) +
+            stats.get('alarms_inserted', 0) +
+            stats.get('events_inserted', 0)
+        )
+    
+    def _load_pdf(self, extraction) -> int:
+        """Carrega extração PDF MPFM e retorna registros inseridos."""
+        from extractors.pdf_extractor import PDFDatabaseLoader
+        
+        with self._connection() as conn:
+            loader = PDFDatabaseLoader(self.db_path, conn=conn)
+            stats = loader.load(extraction, self.installation_id)
+        return stats.get('data_points_stored', 0)
+    
     def _update_staged_file(self, staged_id: int, result: ProcessingResult) -> None:
         """Atualiza status do arquivo no banco."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
+        with self._connection() as conn:
+            conn.execute("""
                 UPDATE staged_file
                 SET parse_status = ?, records_extracted = ?,
                     parse_errors = ?, quality_flags = ?
@@ -575,9 +702,6 @@ class IngestionPipeline:
                 json.dumps(result.quality_flags) if result.quality_flags else None,
                 staged_id
             ))
-            conn.commit()
-        finally:
-            conn.close()
     
     def run(self, source: str) -> PipelineResult:
         """
@@ -585,7 +709,7 @@ class IngestionPipeline:
         
         Args:
             source: Caminho de arquivo ZIP ou diretório
-            
+        
         Returns:
             PipelineResult com resultados completos
         """
@@ -594,8 +718,12 @@ class IngestionPipeline:
         if not source_path.exists():
             raise FileNotFoundError(f"Fonte não encontrada: {source}")
         
+        timings = {}
+        pipeline_start = time.perf_counter()
+        
         # 1. Indexar arquivos
         logger.info("Passo 1: Indexando arquivos...")
+        stage_start = time.perf_counter()
         if source_path.suffix.lower() == '.zip':
             batch = self.process_zip(source_path)
         elif source_path.is_dir():
@@ -608,38 +736,67 @@ class IngestionPipeline:
                 files=[self.index_file(source_path)],
                 total_files=1
             )
+        timings['index'] = time.perf_counter() - stage_start
         
-        # 2. Registrar lote
-        logger.info("Passo 2: Registrando lote...")
-        batch_id = self.register_batch(batch)
-        batch.batch_id = batch_id
+        # Escritor único do lote: uma conexão, commits agrupados
+        writer_options = {}
+        if self.commit_rows:
+            writer_options['commit_rows'] = self.commit_rows
+        if self.commit_seconds:
+            writer_options['commit_seconds'] = self.commit_seconds
+        self.writer = self.BatchWriter(self.db_path, **writer_options).open()
         
-        # 3. Criar manifestos
-        logger.info("Passo 3: Criando manifestos...")
-        manifests = self.create_manifests(batch, batch_id)
-        
-        # 4. Processar arquivos
-        logger.info("Passo 4: Processando arquivos...")
-        results = []
-        for file_info in batch.files:
-            staged_id = self.register_file(file_info, batch_id)
-            result = self.process_file(file_info, staged_id)
-            results.append(result)
+        try:
+            # 2. Registrar lote
+            logger.info("Passo 2: Registrando lote...")
+            stage_start = time.perf_counter()
+            batch_id = self.register_batch(batch)
+            batch.batch_id = batch_id
+            timings['register'] = time.perf_counter() - stage_start
             
-            status_icon = '✅' if result.status == ParseStatus.SUCCESS else '❌'
-            logger.info(f"  {status_icon} {file_info.name}")
-        
-        # 5. Reconciliação (se houver Hourly e Daily)
-        logger.info("Passo 5: Reconciliação Hourly vs Daily...")
-        reconciliations = self._run_reconciliation(batch)
-        
-        # 6. Validação cruzada
-        logger.info("Passo 6: Validação cruzada...")
-        validations = self._run_cross_validation(batch)
+            # 3. Criar manifestos
+            logger.info("Passo 3: Criando manifestos...")
+            stage_start = time.perf_counter()
+            manifests = self.create_manifests(batch, batch_id)
+            timings['manifests'] = time.perf_counter() - stage_start
+            
+            # 4. Processar arquivos
+            logger.info(f"Passo 4: Processando arquivos (workers={self.workers})...")
+            stage_start = time.perf_counter()
+            results, extract_time, load_time = self._process_files(batch)
+            timings['process'] = time.perf_counter() - stage_start
+            timings['extract'] = extract_time
+            timings['load'] = load_time
+            
+            # Dados do lote visíveis para reconciliação e validação cruzada
+            self.writer.commit()
+            
+            # 5. Reconciliação (se houver Hourly e Daily)
+            logger.info("Passo 5: Reconciliação Hourly vs Daily...")
+            stage_start = time.perf_counter()
+            reconciliations = self._run_reconciliation(batch)
+            timings['reconciliation'] = time.perf_counter() - stage_start
+            
+            # 6. Validação cruzada
+            logger.info("Passo 6: Validação cruzada...")
+            stage_start = time.perf_counter()
+            validations = self._run_cross_validation(batch)
+            timings['cross_validation'] = time.perf_counter() - stage_start
+            
+            # 7. Finalizar lote
+            stage_start = time.perf_counter()
+            self._finalize_batch(batch_id)
+            timings['finalize'] = time.perf_counter() - stage_start
+            timings['total'] = time.perf_counter() - pipeline_start
         
-        # 7. Finalizar lote
-        self._finalize_batch(batch_id)
+        finally:
+            self.writer.close()
+            write_stats = self.writer.stats()
+            self.writer = None
         
+        logger.info(f"Escrita: {write_stats['rows_written']} linhas, "
+                    f"{write_stats['commits']} commits, "
+                    f"{write_stats['rows_per_sec']:.0f} linhas/s")
         logger.info("Pipeline concluído!")
         
         return PipelineResult(
@@ -647,9 +804,64 @@ class IngestionPipeline:
             results=results,
             manifests=manifests,
             reconciliations=reconciliations,
-            validations=validations
+            validations=validations,
+            timings=timings,
+            write_stats=write_stats
         )
     
+    def _process_files(self, batch: BatchInfo) -> Tuple[List[ProcessingResult], float, float]:
+        """
+        Extrai e carrega os arquivos do lote.
+        
+        Com workers > 1 a extração roda em um pool de processos; a carga
+        no banco continua em um único escritor (este processo), na mesma
+        ordem do modo serial.
+        
+        Returns:
+            (resultados, tempo de extração somado, tempo de carga)
+        """
+        results = []
+        extract_time = 0.0
+        load_time = 0.0
+        cache_hits = 0
+        
+        def handle(file_info: FileInfo, outcome: ExtractionOutcome) -> None:
+            nonlocal extract_time, load_time, cache_hits
+            extract_time += outcome.elapsed
+            cache_hits += outcome.cached
+            
+            load_start = time.perf_counter()
+            staged_id = self.register_file(file_info, batch.batch_id)
+            result = self.process_file(file_info, staged_id, outcome)
+            load_time += time.perf_counter() - load_start
+            results.append(result)
+            
+            status_icon = '✅' if result.status == ParseStatus.SUCCESS else '❌'
+            logger.info(f"  {status_icon} {file_info.name}")
+        
+        if self.workers > 1 and len(batch.files) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outcomes = executor.map(
+                    extract_file,
+                    [f.file_type for f in batch.files],
+                    [str(f.path) for f in batch.files],
+                    [f.hash for f in batch.files],
+                    [self.cache_dir] * len(batch.files),
+                    [self.cache_max_bytes] * len(batch.files)
+                )
+                for file_info, outcome in zip(batch.files, outcomes):
+                    handle(file_info, outcome)
+        else:
+            for file_info in batch.files:
+                handle(file_info, extract_file(file_info.file_type, str(file_info.path),
+                                               file_info.hash, self.cache_dir,
+                                               self.cache_max_bytes))
+        
+        if self.cache_dir:
+            logger.info(f"Cache de extração: {cache_hits}/{len(batch.files)} arquivos reaproveitados")
+        
+        return results, extract_time, load_time
+    
     def _run_reconciliation(self, batch: BatchInfo) -> List[Dict]:
         """Executa reconciliação Hourly vs Daily."""
         # TODO: Implementar reconciliação completa
@@ -677,7 +889,7 @@ class IngestionPipeline:
                     'total': len(validation_results),
                     'by_classification': dict(stats)
                 })
-                
+        
         except ImportError:
             logger.warning("Validador cruzado não disponível")
         except Exception as e:
@@ -687,18 +899,12 @@ class IngestionPipeline:
     
     def _finalize_batch(self, batch_id: int) -> None:
         """Finaliza processamento do lote."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
+        with self._connection() as conn:
+            conn.execute("""
                 UPDATE batch_package
                 SET status = 'COMPLETED'
                 WHERE id = ?
             """, (batch_id,))
-            conn.commit()
-        finally:
-            conn.close()
 
 
 # ============================================================================
@@ -714,10 +920,26 @@ def main():
                        help='Caminho do banco de dados')
     parser.add_argument('--installation', '-i', type=int, default=1,
                        help='ID da instalação')
+    parser.add_argument('--workers', '-w', type=int, default=1,
+                       help='Processos paralelos para extração (1 = serial)')
+    parser.add_argument('--commit-rows', type=int, default=None,
+                       help='Linhas por transação do escritor do lote')
+    parser.add_argument('--commit-seconds', type=float, default=None,
+                       help='Duração máxima (s) de uma transação do escritor do lote')
+    parser.add_argument('--cache-dir', default='data/parse_cache',
+                       help='Diretório do cache de resultados de extração')
+    parser.add_argument('--cache-max-bytes', type=int, default=None,
+                       help='Tamanho máximo do cache de extração (padrão: 512 MiB)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Desativa o cache de resultados de extração')
     
     args = parser.parse_args()
     
-    pipeline = IngestionPipeline(args.database, installation_id=args.installation)
+    pipeline = IngestionPipeline(args.database, installation_id=args.installation,
+                                 workers=args.workers, commit_rows=args.commit_rows,
+                                 commit_seconds=args.commit_seconds,
+                                 cache_dir=None if args.no_cache else args.cache_dir,
+                                 cache_max_bytes=args.cache_max_bytes)
     result = pipeline.run(args.source)
     
     # Resumo
@@ -744,6 +966,22 @@ def main():
         print(f"\n🔍 Validações cruzadas:")
         for v in result.validations:
             print(f"   {v['date']}: {v['total']} validações - {v['by_classification']}")
+    
+    if result.write_stats:
+        w = result.write_stats
+        print(f"\n💾 Escrita: {w['rows_written']} linhas em {w['commits']} commits "
+              f"({w['rows_per_sec']:.0f} linhas/s)")
+    
+    if result.timings:
+        t = result.timings
+        print(f"\n⏱️ Tempos por etapa (workers={args.workers}):")
+        for stage in ['index', 'register', 'manifests', 'process', 'reconciliation',
+                      'cross_validation', 'finalize', 'total']:
+            print(f"   {stage:<18} {t.get(stage, 0.0):8.2f}s")
+        print(f"   {'  extração (soma)':<18} {t.get('extract', 0.0):8.2f}s")
+        print(f"   {'  carga no banco':<18} {t.get('load', 0.0):8.2f}s")
+        if t.get('process'):
+            print(f"   Fator de paralelismo (extração/processamento): {t.get('extract', 0.0) / t['process']:.2f}x")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+"""
+SGM-FM - Kernel de Comparação de Métricas
+Compara somas horárias com valores diários para muitas combinações
+(asset/dia x métrica) de uma vez, retornando deltas, tolerâncias e
+códigos de status como matrizes.
+
+Usado pelo ReconciliationEngine (regra do PRD, tolerância
+max(abs, rel * daily)) e pelo ReconciliationValidatorV2 do backend
+(regra abs E pct). Usa NumPy quando disponível; sem ele, os mesmos
+cálculos rodam em laços Python com resultado idêntico.
+"""
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# ============================================================================
+# CÓDIGOS DE STATUS
+# ============================================================================
+
+STATUS_SKIPPED = -1     # diário e soma horária nulos (métrica ignorada)
+STATUS_OK = 0
+STATUS_WARN = 1
+STATUS_FAIL = 2
+STATUS_INCOMPLETE = 3   # apenas um dos lados presente
+
+# Limite abaixo do qual o diário é tratado como zero (regra V2)
+ZERO_EPSILON = 1e-6
+
+Tolerance = Union[float, Sequence[float]]
+Matrix = Sequence[Sequence[Optional[float]]]
+
+
+# ============================================================================
+# RESULTADO
+# ============================================================================
+
+@dataclass
+class ComparisonArrays:
+    """
+    Resultado colunar: uma linha por asset/dia, uma coluna por métrica.
+    
+    Com NumPy os campos são ndarrays (NaN para ausente); sem NumPy (ou
+    sem linhas), listas de listas (None para ausente).
+    """
+    delta_abs: Any
+    delta_pct: Any
+    tolerance: Any
+    status: Any
+    
+    def to_lists(self) -> Tuple[List[List[Optional[float]]], List[List[Optional[float]]],
+                                List[List[float]], List[List[int]]]:
+        """Converte para listas Python (NaN -> None)."""
+        if isinstance(self.status, list):
+            return self.delta_abs, self.delta_pct, self.tolerance, self.status
+        return (_nan_to_none(self.delta_abs), _nan_to_none(self.delta_pct),
+                self.tolerance.tolist(), self.status.tolist())
+
+
+def _nan_to_none(values) -> List[List[Optional[float]]]:
+    converted = values.astype(object)
+    converted[np.isnan(values)] = None
+    return converted.tolist()
+
+
+def _per_column(tol: Tolerance, columns: int) -> List[float]:
+    """Tolerância escalar ou por métrica -> lista por coluna."""
+    if isinstance(tol, (int, float)):
+        return [float(tol)] * columns
+    tol = [float(t) for t in tol]
+    if len(tol) != columns:
+        raise ValueError(f"Tolerância com {len(tol)} valores para {columns} métricas")
+    return tol
+
+
+def _as_matrix(values: Matrix, rows: int, cols: int):
+    return np.array(values, dtype=float).reshape(rows, cols)
+
+
+def _shape(values: Matrix) -> Tuple[int, int]:
+    return len(values), (len(values[0]) if len(values) else 0)
+
+
+# ============================================================================
+# REGRA PRD: |Σhourly - daily| <= max(abs, rel * |daily|)
+# ============================================================================
+
+def compare_tolerance_band(sum_hourly: Matrix, daily: Matrix, abs_tol: Tolerance,
+                           rel_tol: Tolerance, warn_factor: float = 2.0) -> ComparisonArrays:
+    """
+    Regra do ReconciliationEngine.
+    
+    - ambos nulos: OK, tolerância 0
+    - um nulo: INCOMPLETE, tolerância 0
+    - delta <= tol: OK; delta <= tol * warn_factor: WARN; senão FAIL
+    
+    delta_pct (%) é relativo ao diário, ou à soma horária se o diário
+    for zero.
+    """
+    rows, cols = _shape(sum_hourly)
+    abs_tol = _per_column(abs_tol, cols)
+    rel_tol = _per_column(rel_tol, cols)
+    
+    if np is None or rows == 0:
+        return _tolerance_band_python(sum_hourly, daily, abs_tol, rel_tol, warn_factor)
+    
+    s = _as_matrix(sum_hourly, rows, cols)
+    d = _as_matrix(daily, rows, cols)
+    s_nan = np.isnan(s)
+    d_nan = np.isnan(d)
+    valid = ~(s_nan | d_nan)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta_abs = np.abs(s - d)
+        base = np.where(d != 0, np.abs(d), np.abs(s))
+        delta_pct = np.where(base != 0, delta_abs / base * 100, 0.0)
+        tolerance = np.maximum(np.array(abs_tol), np.abs(d) * np.array(rel_tol))
+    
+    status = np.where(delta_abs <= tolerance, STATUS_OK,
+                      np.where(delta_abs <= tolerance * warn_factor, STATUS_WARN, STATUS_FAIL))
+    status = np.where(valid, status, np.where(s_nan & d_nan, STATUS_OK, STATUS_INCOMPLETE))
+    
+    return ComparisonArrays(
+        delta_abs=np.where(valid, delta_abs, np.nan),
+        delta_pct=np.where(valid, delta_pct, np.nan),
+        tolerance=np.where(valid, tolerance, 0.0),
+        status=status.astype(int)
+    )
+
+
+def _tolerance_band_python(sum_hourly: Matrix, daily: Matrix, abs_tol: List[float],
+                           rel_tol: List[float], warn_factor: float) -> ComparisonArrays:
+    out_abs, out_pct, out_tol, out_status = [], [], [], []
+    
+    for s_row, d_row in zip(sum_hourly, daily):
+        row_abs, row_pct, row_tol, row_status = [], [], [], []
+        
+        for j, (s, d) in enumerate(zip(s_row, d_row)):
+            if s is None or d is None:
+                row_abs.append(None)
+                row_pct.append(None)
+                row_tol.append(0.0)
+                row_status.append(STATUS_OK if s is None and d is None else STATUS_INCOMPLETE)
+                continue
+            
+            delta_abs = abs(s - d)
+            base = abs(d) if d != 0 else abs(s)
+            delta_pct = delta_abs / base * 100 if base != 0 else 0.0
+            tolerance = max(abs_tol[j], abs(d) * rel_tol[j])
+            
+            if delta_abs <= tolerance:
+                status = STATUS_OK
+            elif delta_abs <= tolerance * warn_factor:
+                status = STATUS_WARN
+            else:
+                status = STATUS_FAIL
+            
+            row_abs.append(delta_abs)
+            row_pct.append(delta_pct)
+            row_tol.append(tolerance)
+            row_status.append(status)
+        
+        out_abs.append(row_abs)
+        out_pct.append(row_pct)
+        out_tol.append(row_tol)
+        out_status.append(row_status)
+    
+    return ComparisonArrays(out_abs, out_pct, out_tol, out_status)
+
+
+# ============================================================================
+# REGRA V2: FAIL se diff > abs E diff/daily > pct
+# ============================================================================
+
+def compare_abs_and_pct(daily: Matrix, sum_hourly: Matrix, abs_tol: Tolerance,
+                        pct_tol: Tolerance, warn_fraction: float = 0.8) -> ComparisonArrays:
+    """
+    Regra do ReconciliationValidatorV2.
+    
+    - ambos nulos: SKIPPED
+    - nulo conta como 0
+    - diff > abs_tol e diff_pct > pct_tol: FAIL; diff > abs_tol * warn_fraction: WARN
+    
+    diff_pct é fração do diário (1.0/0.0 quando o diário é ~0).
+    """
+    rows, cols = _shape(daily)
+    abs_tol = _per_column(abs_tol, cols)
+    pct_tol = _per_column(pct_tol, cols)
+    
+    if np is None or rows == 0:
+        return _abs_and_pct_python(daily, sum_hourly, abs_tol, pct_tol, warn_fraction)
+    
+    d_raw = _as_matrix(daily, rows, cols)
+    h_raw = _as_matrix(sum_hourly, rows, cols)
+    skipped = np.isnan(d_raw) & np.isnan(h_raw)
+    d = np.nan_to_num(d_raw, nan=0.0)
+    h = np.nan_to_num(h_raw, nan=0.0)
+    abs_col = np.array(abs_tol)
+    pct_col = np.array(pct_tol)
+    
+    diff_abs = np.abs(d - h)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff_pct = np.where(np.abs(d) > ZERO_EPSILON, diff_abs / d,
+                            np.where(diff_abs > abs_col, 1.0, 0.0))
+    
+    status = np.where((diff_abs > abs_col) & (diff_pct > pct_col), STATUS_FAIL,
+                      np.where(diff_abs > abs_col * warn_fraction, STATUS_WARN, STATUS_OK))
+    
+    return ComparisonArrays(
+        delta_abs=np.where(skipped, np.nan, diff_abs),
+        delta_pct=np.where(skipped, np.nan, diff_pct),
+        tolerance=np.broadcast_to(abs_col, d.shape).copy(),
+        status=np.where(skipped, STATUS_SKIPPED, status).astype(int)
+    )
+
+
+def _abs_and_pct_python(daily: Matrix, sum_hourly: Matrix, abs_tol: List[float],
+                        pct_tol: List[float], warn_fraction: float) -> ComparisonArrays:
+    out_abs, out_pct, out_tol, out_status = [], [], [], []
+    
+    for d_row, h_row in zip(daily, sum_hourly):
+        row_abs, row_pct, row_status = [], [], []
+        
+        for j, (daily_val, sum_val) in enumerate(zip(d_row, h_row)):
+            if daily_val is None and sum_val is None:
+                row_abs.append(None)
+                row_pct.append(None)
+                row_status.append(STATUS_SKIPPED)
+                continue
+            
+            d = daily_val or 0.0
+            h = sum_val or 0.0
+            diff_abs = abs(d - h)
+            diff_pct = (diff_abs / d) if abs(d) > ZERO_EPSILON else (1.0 if diff_abs > abs_tol[j] else 0.0)
+            
+            if diff_abs > abs_tol[j] and diff_pct > pct_tol[j]:
+                status = STATUS_FAIL
+            elif diff_abs > abs_tol[j] * warn_fraction:
+                status = STATUS_WARN
+            else:
+                status = STATUS_OK
+            
+            row_abs.append(diff_abs)
+            row_pct.append(diff_pct)
+            row_status.append(status)
+        
+        out_abs.append(row_abs)
+        out_pct.append(row_pct)
+        out_tol.append(list(abs_tol))
+        out_status.append(row_status)
+    
+    return ComparisonArrays(out_abs, out_pct, out_tol, out_status)
@@ -3,16 +3,23 @@ SGM-FM - Cross Validator
 Validação cruzada diária multi-fonte (Excel, XML, PDF, TXT)
 Baseado no PRD de Validação Cruzada MultiFonte
 """
+import math
 import sqlite3
 import json
 import logging
+from array import array
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from enum import Enum
 from collections import defaultdict
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -55,6 +62,40 @@ DEFAULT_TOLERANCES = {
     'gross_volume_m3': {'abs': 0.1, 'pct': 0.5},
 }
 
+# Campos XML -> variáveis canônicas
+XML_MAPPINGS = [
+    ('gross_volume_observed', 'gross_volume_m3', 'm³'),
+    ('gross_volume_corrected', 'gross_std_volume_sm3', 'Sm³'),
+    ('net_volume', 'net_std_volume_sm3', 'Sm³'),
+    ('bsw_percent', 'bsw_pctvol', '%'),
+    ('meter_factor', 'meter_factor', '')
+]
+
+# Campos PDF (mpfm_daily) -> variáveis canônicas
+PDF_MAPPINGS = [
+    ('corr_mass_oil', 'mass_oil_t', 't'),
+    ('corr_mass_gas', 'mass_gas_t', 't'),
+    ('corr_mass_hc', 'mass_hc_t', 't'),
+    ('corr_mass_water', 'mass_water_t', 't'),
+    ('corr_mass_total', 'mass_total_t', 't'),
+    ('pvt_ref_vol_oil_sm3', 'pvt_ref_vol_oil_sm3', 'Sm³'),
+    ('pvt_ref_vol_gas_sm3', 'pvt_ref_vol_gas_sm3', 'Sm³')
+]
+
+# Índice da varredura por período em measurement_fact (também em schema.sql)
+MEASUREMENT_FACT_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_measurement_fact_date
+    ON measurement_fact(date_ref, asset_id, variable_code)
+"""
+
+# Dias consecutivos de inconsistência que disparam desenquadramento
+NONCONFORMANCE_DAYS = 10
+
+
+def _as_date(value) -> date:
+    """Data ISO do banco ('YYYY-MM-DD[...]') -> date."""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
 
 # ============================================================================
 # DATA CLASSES
@@ -106,6 +147,334 @@ class InconsistencyRecord:
     last_occurrence: date
     consecutive_days: int
     status: str  # ACTIVE, RESOLVED, ESCALATED
+    history_id: Optional[int] = None
+
+
+# ============================================================================
+# CLASSE: MeasurementFactStore
+# ============================================================================
+
+# Códigos inteiros das enums nos arrays do store
+SOURCE_TYPES = list(SourceType)
+TIME_WINDOWS = list(TimeWindow)
+_SOURCE_CODES = {source: code for code, source in enumerate(SOURCE_TYPES)}
+_WINDOW_CODES = {window: code for code, window in enumerate(TIME_WINDOWS)}
+_SOURCE_BY_VALUE = {source.value: source for source in SOURCE_TYPES}
+_WINDOW_BY_VALUE = {window.value: window for window in TIME_WINDOWS}
+
+
+class MeasurementFactStore:
+    """
+    Fatos de medição em arrays paralelos (um elemento por fato).
+    
+    asset_id, variável, data, fonte, janela e valor ficam em array.array;
+    variável, TAG, arquivo de origem e unidade são internados (código
+    inteiro -> string), de modo que cada fato ocupa ~30 bytes em vez de um
+    objeto MeasurementFact. Valor ausente é NaN.
+    
+    O agrupamento usa NumPy (sobre os mesmos buffers) quando disponível.
+    """
+    
+    def __init__(self):
+        self.asset_id = array('i')
+        self.variable = array('i')
+        self.day = array('i')           # date.toordinal()
+        self.source = array('b')
+        self.window = array('b')
+        self.value = array('d')
+        self.source_file = array('i')
+        self.unit = array('i')
+        
+        self.variable_codes: List[str] = []
+        self.file_names: List[str] = []
+        self.unit_names: List[str] = []
+        self.asset_tags: Dict[int, str] = {}
+        self._variable_ids: Dict[str, int] = {}
+        self._file_ids: Dict[str, int] = {}
+        self._unit_ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.value)
+    
+    @staticmethod
+    def _intern(names: List[str], codes: Dict[str, int], name: str) -> int:
+        code = codes.get(name)
+        if code is None:
+            code = codes[name] = len(names)
+            names.append(name)
+        return code
+    
+    def append(self, source_type: SourceType, source_file: str, asset_id: int, asset_tag: str,
+               variable_code: str, date_ref: date, time_window: TimeWindow,
+               value_num: Optional[float], unit: str) -> None:
+        """Acrescenta um fato (mesmos campos de MeasurementFact)."""
+        variable = self._variable_ids.get(variable_code)
+        if variable is None:
+            variable = self._intern(self.variable_codes, self._variable_ids, variable_code)
+        source_file_id = self._file_ids.get(source_file)
+        if source_file_id is None:
+            source_file_id = self._intern(self.file_names, self._file_ids, source_file)
+        unit_id = self._unit_ids.get(unit)
+        if unit_id is None:
+            unit_id = self._intern(self.unit_names, self._unit_ids, unit)
+        
+        self.asset_id.append(asset_id)
+        self.variable.append(variable)
+        self.day.append(date_ref.toordinal())
+        self.source.append(_SOURCE_CODES[source_type])
+        self.window.append(_WINDOW_CODES[time_window])
+        self.value.append(math.nan if value_num is None else value_num)
+        self.source_file.append(source_file_id)
+        self.unit.append(unit_id)
+        self.asset_tags[asset_id] = asset_tag
+    
+    @classmethod
+    def from_facts(cls, facts: List[MeasurementFact]) -> 'MeasurementFactStore':
+        store = cls()
+        for f in facts:
+            store.append(f.source_type, f.source_file, f.asset_id, f.asset_tag, f.variable_code,
+                         f.date_ref, f.time_window, f.value_num, f.unit)
+        return store
+    
+    def fact(self, i: int) -> MeasurementFact:
+        """Materializa o i-ésimo fato como MeasurementFact."""
+        value = self.value[i]
+        return MeasurementFact(
+            source_type=SOURCE_TYPES[self.source[i]],
+            source_file=self.file_names[self.source_file[i]],
+            asset_id=self.asset_id[i],
+            asset_tag=self.asset_tags[self.asset_id[i]],
+            variable_code=self.variable_codes[self.variable[i]],
+            date_ref=date.fromordinal(self.day[i]),
+            time_window=TIME_WINDOWS[self.window[i]],
+            value_num=None if math.isnan(value) else value,
+            unit=self.unit_names[self.unit[i]]
+        )
+    
+    def to_facts(self) -> List[MeasurementFact]:
+        return [self.fact(i) for i in range(len(self))]
+    
+    def db_rows(self) -> Iterator[tuple]:
+        """
+        Linhas (asset_id, source_type, source_file, date_ref, time_window,
+        variable_code, value_num, unit) para measurement_fact.
+        """
+        dates = {}
+        for asset_id, source, file_id, day, window, variable, value, unit in zip(
+                self.asset_id, self.source, self.source_file, self.day, self.window,
+                self.variable, self.value, self.unit):
+            if day not in dates:
+                dates[day] = date.fromordinal(day).isoformat()
+            yield (asset_id, SOURCE_TYPES[source].value, self.file_names[file_id], dates[day],
+                   TIME_WINDOWS[window].value, self.variable_codes[variable],
+                   None if value != value else value, self.unit_names[unit])
+    
+    def dates(self) -> List[date]:
+        return [date.fromordinal(d) for d in sorted(set(self.day))]
+    
+    def groups(self) -> Tuple[List[tuple], List[int], List[int]]:
+        """
+        Agrupa pela chave de comparação (asset_id, variable_code, date_ref,
+        time_window) sobre os códigos inteiros.
+        
+        Returns:
+            (chaves, ordem, limites): os fatos do grupo g são os índices
+            ordem[limites[g]:limites[g + 1]]. Grupos na ordem da primeira
+            ocorrência; dentro do grupo, a ordem de inserção.
+        """
+        if not len(self):
+            return [], [], [0]
+        if np is None:
+            firsts, order, bounds = self._groups_python()
+        else:
+            firsts, order, bounds = self._groups_numpy()
+        
+        dates = {}
+        keys = []
+        for i in firsts:
+            day = self.day[i]
+            if day not in dates:
+                dates[day] = date.fromordinal(day)
+            keys.append((self.asset_id[i], self.variable_codes[self.variable[i]], dates[day],
+                         TIME_WINDOWS[self.window[i]]))
+        return keys, order, bounds
+    
+    def _groups_python(self) -> Tuple[List[int], List[int], List[int]]:
+        group_of = {}
+        members = []
+        
+        for i, key in enumerate(zip(self.asset_id, self.variable, self.day, self.window)):
+            g = group_of.get(key)
+            if g is None:
+                group_of[key] = len(members)
+                members.append([i])
+            else:
+                members[g].append(i)
+        
+        order, bounds = [], [0]
+        for indices in members:
+            order.extend(indices)
+            bounds.append(len(order))
+        return [indices[0] for indices in members], order, bounds
+    
+    def _groups_numpy(self) -> Tuple[List[int], List[int], List[int]]:
+        # Chave composta int64 a partir de códigos densos de cada coluna
+        key = np.zeros(len(self), dtype=np.int64)
+        for column in (self.asset_id, self.variable, self.day, self.window):
+            values = np.frombuffer(column, dtype=np.int32 if column.itemsize == 4 else np.int8)
+            uniques, codes = np.unique(values, return_inverse=True)
+            key = key * len(uniques) + codes
+        
+        _, firsts, inverse = np.unique(key, return_index=True, return_inverse=True)
+        
+        # Renumerar grupos pela primeira ocorrência
+        by_first = np.argsort(firsts)
+        rank = np.empty_like(by_first)
+        rank[by_first] = np.arange(len(by_first))
+        group = rank[inverse.ravel()]
+        
+        order = np.argsort(group, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(group))))
+        return firsts[by_first].tolist(), order.tolist(), bounds.tolist()
+
+
+# ============================================================================
+# CLASSE: InconsistencyTracker
+# ============================================================================
+
+class InconsistencyTracker:
+    """
+    Estado em memória das sequências ACTIVE de inconsistency_history.
+    
+    Carregado uma vez por execução, indexado por (asset_id, variable_code).
+    Cada resultado é uma transição O(1); ao final, flush() grava apenas os
+    registros que mudaram.
+    
+    Transições:
+    - INCONSISTENTE sem sequência ativa: nova sequência (1 dia)
+    - INCONSISTENTE no dia seguinte ao último: +1 dia; ao atingir
+      NONCONFORMANCE_DAYS a sequência é escalada
+    - INCONSISTENTE após lacuna: contador volta a 1
+    - INCONSISTENTE em data já coberta pelo histórico (mesma data ou
+      anterior ao último dia, inclusive de sequências já encerradas):
+      sem efeito, de modo que reprocessar um dia não altera o histórico
+    - CONSISTENTE/ACEITAVEL: sequência ativa resolvida, exceto se a data
+      for anterior ao último dia da sequência (reprocessamento)
+    """
+    
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.active: Dict[Tuple[int, str], InconsistencyRecord] = {}
+        self.changed: Dict[int, InconsistencyRecord] = {}
+        # Registros ACTIVE duplicados da mesma chave (resolvidos junto com o principal)
+        self._duplicates: Dict[Tuple[int, str], List[InconsistencyRecord]] = defaultdict(list)
+        # Último dia coberto por sequências encerradas (RESOLVED/ESCALATED)
+        self.closed_until: Dict[Tuple[int, str], date] = {}
+        
+        cursor.execute("""
+            SELECT asset_id, variable_code, MAX(last_occurrence)
+            FROM inconsistency_history
+            WHERE status != 'ACTIVE'
+            GROUP BY asset_id, variable_code
+        """)
+        for asset_id, variable_code, last_occurrence in cursor.fetchall():
+            self.closed_until[(asset_id, variable_code)] = _as_date(last_occurrence)
+        
+        cursor.execute("""
+            SELECT id, asset_id, variable_code, first_occurrence, last_occurrence, consecutive_days
+            FROM inconsistency_history
+            WHERE status = 'ACTIVE'
+            ORDER BY id
+        """)
+        for row in cursor.fetchall():
+            record = InconsistencyRecord(
+                asset_id=row[1],
+                variable_code=row[2],
+                first_occurrence=_as_date(row[3]),
+                last_occurrence=_as_date(row[4]),
+                consecutive_days=row[5],
+                status='ACTIVE',
+                history_id=row[0]
+            )
+            key = (record.asset_id, record.variable_code)
+            if key in self.active:
+                self._duplicates[key].append(record)
+            else:
+                self.active[key] = record
+    
+    def inconsistent(self, asset_id: int, variable_code: str, date_ref: date) -> Optional[InconsistencyRecord]:
+        """
+        Aplica um dia INCONSISTENTE.
+        
+        Returns:
+            O registro, se a sequência acabou de atingir NONCONFORMANCE_DAYS
+        """
+        key = (asset_id, variable_code)
+        record = self.active.get(key)
+        
+        if record is None:
+            if key in self.closed_until and date_ref <= self.closed_until[key]:
+                return None
+            
+            # Criar novo registro
+            self.cursor.execute("""
+                INSERT INTO inconsistency_history
+                (asset_id, variable_code, first_occurrence, last_occurrence, consecutive_days, status)
+                VALUES (?, ?, ?, ?, 1, 'ACTIVE')
+            """, (asset_id, variable_code, date_ref.isoformat(), date_ref.isoformat()))
+            record = InconsistencyRecord(asset_id, variable_code, date_ref, date_ref, 1, 'ACTIVE',
+                                         self.cursor.lastrowid)
+            self.active[key] = record
+        
+        elif date_ref <= record.last_occurrence:
+            # Dia já contabilizado (reprocessamento ou outra janela de tempo)
+            return None
+        
+        else:
+            # Verificar se é dia consecutivo
+            if date_ref - record.last_occurrence == timedelta(days=1):
+                record.consecutive_days += 1
+            else:
+                record.consecutive_days = 1
+            record.last_occurrence = date_ref
+            self.changed[record.history_id] = record
+        
+        # Gatilho de desenquadramento
+        if record.consecutive_days == NONCONFORMANCE_DAYS:
+            record.status = 'ESCALATED'
+            self.changed[record.history_id] = record
+            self.closed_until[key] = date_ref
+            del self.active[key]
+            return record
+        
+        return None
+    
+    def resolved(self, asset_id: int, variable_code: str, date_ref: date) -> None:
+        """Aplica um resultado CONSISTENTE/ACEITAVEL."""
+        key = (asset_id, variable_code)
+        record = self.active.get(key)
+        if record is None or date_ref < record.last_occurrence:
+            return
+        
+        del self.active[key]
+        self.closed_until[key] = record.last_occurrence
+        for item in [record] + self._duplicates.pop(key, []):
+            item.status = 'RESOLVED'
+            self.changed[item.history_id] = item
+    
+    def flush(self) -> int:
+        """Grava os registros alterados; retorna quantos."""
+        self.cursor.executemany("""
+            UPDATE inconsistency_history
+            SET last_occurrence = ?, consecutive_days = ?, status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, [
+            (r.last_occurrence.isoformat(), r.consecutive_days, r.status, history_id)
+            for history_id, r in self.changed.items()
+        ])
+        count = len(self.changed)
+        self.changed = {}
+        return count
 
 
 # ============================================================================
@@ -120,9 +489,19 @@ class CrossValidator:
     (Excel, XML, PDF, TXT) e classifica a consistência.
     """
     
-    def __init__(self, db_path: str, installation_id: int = 1):
+    def __init__(self, db_path: str, installation_id: int = 1, materialized: bool = False):
+        """
+        Args:
+            db_path: Caminho do banco SQLite
+            installation_id: ID da instalação
+            materialized: Ler fatos de measurement_fact em vez de refazer os
+                joins nas tabelas de origem. Só vale para períodos já
+                materializados (materialize_facts): os loaders gravam
+                apenas nas tabelas de origem
+        """
         self.db_path = db_path
         self.installation_id = installation_id
+        self.materialized = materialized
         self.tolerances = self._load_tolerances()
     
     def _load_tolerances(self) -> Dict[str, Dict]:
@@ -152,7 +531,90 @@ class CrossValidator:
         Carrega todos os fatos de medição de uma data.
         Consolida dados de todas as fontes.
         """
-        facts = []
+        return self.load_fact_store(date_ref, date_ref).to_facts()
+    
+    def load_fact_store(self, start_date: date, end_date: date) -> MeasurementFactStore:
+        """
+        Carrega os fatos de medição de um período num MeasurementFactStore.
+        
+        Com materialized, uma varredura do índice de measurement_fact por
+        date_ref; senão, os joins nas tabelas de origem (load_source_facts).
+        """
+        if not self.materialized:
+            return self.load_source_facts(start_date, end_date)
+        
+        store = MeasurementFactStore()
+        conn = sqlite3.connect(self.db_path)
+        
+        try:
+            cursor = conn.execute("""
+                SELECT mf.source_type, mf.source_file, mf.asset_id, ar.asset_tag, mf.variable_code,
+                       mf.date_ref, mf.time_window, mf.value_num, mf.unit
+                FROM measurement_fact mf
+                LEFT JOIN asset_registry ar ON mf.asset_id = ar.id
+                WHERE mf.date_ref BETWEEN ? AND ?
+                ORDER BY mf.date_ref, mf.id
+            """, (start_date.isoformat(), end_date.isoformat()))
+            
+            dates = {}
+            for source_type, source_file, asset_id, asset_tag, variable_code, date_ref, \
+                    time_window, value_num, unit in cursor:
+                if date_ref not in dates:
+                    dates[date_ref] = _as_date(date_ref)
+                store.append(_SOURCE_BY_VALUE[source_type], source_file or '', asset_id, asset_tag or '',
+                             variable_code, dates[date_ref], _WINDOW_BY_VALUE[time_window], value_num, unit or '')
+        finally:
+            conn.close()
+        
+        return store
+    
+    def materialize_facts(self, start_date: date, end_date: date) -> int:
+        """
+        Regrava em measurement_fact os fatos Excel/XML/PDF de um período.
+        
+        Carga explícita (backfill) de um período já gravado nas tabelas de
+        origem; idempotente. Validadores com materialized=True passam a
+        ler apenas measurement_fact.
+        
+        Returns:
+            Quantidade de fatos gravados
+        """
+        store = self.load_source_facts(start_date, end_date)
+        sources = [source.value for source in (SourceType.EXCEL, SourceType.XML, SourceType.PDF)]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(MEASUREMENT_FACT_INDEX)
+            cursor.execute(f"""
+                DELETE FROM measurement_fact
+                WHERE date_ref BETWEEN ? AND ? AND source_type IN ({", ".join("?" for _ in sources)})
+            """, (start_date.isoformat(), end_date.isoformat(), *sources))
+            
+            cursor.executemany("""
+                INSERT INTO measurement_fact
+                (asset_id, source_type, source_file, date_ref, time_window, variable_code, value_num, unit)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, store.db_rows())
+            
+            conn.commit()
+        finally:
+            conn.close()
+        
+        logger.info(f"measurement_fact: {len(store)} fatos materializados ({start_date} a {end_date})")
+        return len(store)
+    
+    def load_source_facts(self, start_date: date, end_date: date) -> MeasurementFactStore:
+        """
+        Monta os fatos de um período a partir das tabelas de origem.
+        
+        Uma consulta por fonte para o período inteiro, na ordem Excel,
+        XML, PDF.
+        """
+        store = MeasurementFactStore()
+        period = (start_date.isoformat(), end_date.isoformat())
+        
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
@@ -161,23 +623,25 @@ class CrossValidator:
             # 1. Dados do Excel (daily_measurement)
             cursor.execute("""
                 SELECT 
+                    r.report_date AS date_ref,
                     dm.asset_id, ar.asset_tag, dm.variable_code, dm.value, dm.unit,
                     dm.block_type, sf.file_name
                 FROM daily_measurement dm
                 JOIN report r ON dm.report_id = r.id
                 JOIN asset_registry ar ON dm.asset_id = ar.id
                 LEFT JOIN staged_file sf ON r.staged_file_id = sf.id
-                WHERE r.report_date = ?
-            """, (date_ref.isoformat(),))
+                WHERE r.report_date BETWEEN ? AND ?
+            """, period)
             
             for row in cursor.fetchall():
+                date_ref = _as_date(row['date_ref'])
                 time_window = {
                     'DAY': TimeWindow.DAILY,
                     'CUMULATIVE': TimeWindow.CUMULATIVE,
                     'AVG': TimeWindow.DAILY
                 }.get(row['block_type'], TimeWindow.DAILY)
                 
-                facts.append(MeasurementFact(
+                store.append(
                     source_type=SourceType.EXCEL,
                     source_file=row['file_name'] or '',
                     asset_id=row['asset_id'],
@@ -187,38 +651,31 @@ class CrossValidator:
                     time_window=time_window,
                     value_num=row['value'],
                     unit=row['unit'] or ''
-                ))
+                )
             
             # 2. Dados do XML (xml_production)
             cursor.execute("""
                 SELECT 
+                    DATE(xp.period_start) AS date_ref,
                     xp.asset_id, ar.asset_tag, sf.file_name,
                     xp.gross_volume_observed, xp.gross_volume_corrected,
                     xp.net_volume, xp.bsw_percent, xp.meter_factor
                 FROM xml_production xp
                 JOIN asset_registry ar ON xp.asset_id = ar.id
                 LEFT JOIN staged_file sf ON xp.staged_file_id = sf.id
-                WHERE DATE(xp.period_start) = ?
-            """, (date_ref.isoformat(),))
+                WHERE xp.period_start >= ? AND xp.period_start < date(?, '+1 day')
+            """, period)
             
             for row in cursor.fetchall():
+                date_ref = _as_date(row['date_ref'])
                 asset_id = row['asset_id']
                 asset_tag = row['asset_tag']
                 source_file = row['file_name'] or ''
                 
-                # Mapear campos XML para variáveis canônicas
-                xml_mappings = [
-                    ('gross_volume_observed', 'gross_volume_m3', 'm³'),
-                    ('gross_volume_corrected', 'gross_std_volume_sm3', 'Sm³'),
-                    ('net_volume', 'net_std_volume_sm3', 'Sm³'),
-                    ('bsw_percent', 'bsw_pctvol', '%'),
-                    ('meter_factor', 'meter_factor', '')
-                ]
-                
-                for xml_field, var_code, unit in xml_mappings:
+                for xml_field, var_code, unit in XML_MAPPINGS:
                     value = row[xml_field]
                     if value is not None:
-                        facts.append(MeasurementFact(
+                        store.append(
                             source_type=SourceType.XML,
                             source_file=source_file,
                             asset_id=asset_id,
@@ -228,11 +685,12 @@ class CrossValidator:
                             time_window=TimeWindow.DAILY,
                             value_num=value,
                             unit=unit
-                        ))
+                        )
             
             # 3. Dados do PDF (mpfm_daily)
             cursor.execute("""
                 SELECT 
+                    md.report_date AS date_ref,
                     md.asset_id, ar.asset_tag, sf.file_name,
                     md.corr_mass_oil, md.corr_mass_gas, md.corr_mass_hc,
                     md.corr_mass_water, md.corr_mass_total,
@@ -240,28 +698,19 @@ class CrossValidator:
                 FROM mpfm_daily md
                 JOIN asset_registry ar ON md.asset_id = ar.id
                 LEFT JOIN staged_file sf ON md.staged_file_id = sf.id
-                WHERE md.report_date = ?
-            """, (date_ref.isoformat(),))
+                WHERE md.report_date BETWEEN ? AND ?
+            """, period)
             
             for row in cursor.fetchall():
+                date_ref = _as_date(row['date_ref'])
                 asset_id = row['asset_id']
                 asset_tag = row['asset_tag']
                 source_file = row['file_name'] or ''
                 
-                pdf_mappings = [
-                    ('corr_mass_oil', 'mass_oil_t', 't'),
-                    ('corr_mass_gas', 'mass_gas_t', 't'),
-                    ('corr_mass_hc', 'mass_hc_t', 't'),
-                    ('corr_mass_water', 'mass_water_t', 't'),
-                    ('corr_mass_total', 'mass_total_t', 't'),
-                    ('pvt_ref_vol_oil_sm3', 'pvt_ref_vol_oil_sm3', 'Sm³'),
-                    ('pvt_ref_vol_gas_sm3', 'pvt_ref_vol_gas_sm3', 'Sm³')
-                ]
-                
-                for pdf_field, var_code, unit in pdf_mappings:
+                for pdf_field, var_code, unit in PDF_MAPPINGS:
                     value = row[pdf_field]
                     if value is not None:
-                        facts.append(MeasurementFact(
+                        store.append(
                             source_type=SourceType.PDF,
                             source_file=source_file,
                             asset_id=asset_id,
@@ -271,12 +720,12 @@ class CrossValidator:
                             time_window=TimeWindow.DAILY,
                             value_num=value,
                             unit=unit
-                        ))
-            
+                        )
+        
         finally:
             conn.close()
         
-        return facts
+        return store
     
     def group_facts(self, facts: List[MeasurementFact]) -> Dict[tuple, List[MeasurementFact]]:
         """
@@ -298,12 +747,10 @@ class CrossValidator:
         Args:
             key: (asset_id, variable_code, date_ref, time_window)
             facts: Lista de fatos de diferentes fontes
-            
+        
         Returns:
             ValidationResult com classificação
         """
-        asset_id, variable_code, date_ref, time_window = key
-        
         # Coletar valores por fonte
         values_by_source = {}
         sources_available = []
@@ -314,6 +761,42 @@ class CrossValidator:
                 if fact.source_type not in sources_available:
                     sources_available.append(fact.source_type)
         
+        return self._classify(key, values_by_source, sources_available)
+    
+    def validate_store(self, store: MeasurementFactStore) -> List[ValidationResult]:
+        """
+        Agrupa e valida os fatos de um MeasurementFactStore (sem persistir).
+        
+        Mesmo resultado de validate_group sobre group_facts, lendo os
+        valores direto dos arrays de cada grupo.
+        """
+        keys, order, bounds = store.groups()
+        sources = [SOURCE_TYPES[store.source[i]] for i in order]
+        values = [store.value[i] for i in order]
+        results = []
+        
+        for g, key in enumerate(keys):
+            # Coletar valores por fonte
+            values_by_source = {}
+            sources_available = []
+            
+            for j in range(bounds[g], bounds[g + 1]):
+                v = values[j]
+                if v == v:  # não-NaN
+                    source_type = sources[j]
+                    values_by_source[source_type] = v
+                    if source_type not in sources_available:
+                        sources_available.append(source_type)
+            
+            results.append(self._classify(key, values_by_source, sources_available))
+        
+        return results
+    
+    def _classify(self, key: tuple, values_by_source: Dict[SourceType, float],
+                  sources_available: List[SourceType]) -> ValidationResult:
+        """Classifica os valores por fonte de uma chave de comparação."""
+        asset_id, variable_code, date_ref, time_window = key
+        
         # Classificar
         classification = ValidationClassification.INCOMPLETO
         max_deviation_abs = None
@@ -379,40 +862,37 @@ class CrossValidator:
             comparison_details=comparison_details
         )
     
+    def validate_facts(self, facts: List[MeasurementFact]) -> List[ValidationResult]:
+        """Agrupa e valida fatos já carregados (sem persistir)."""
+        return self.validate_store(MeasurementFactStore.from_facts(facts))
+    
     def validate_date(self, date_ref: date) -> List[ValidationResult]:
         """
         Executa validação cruzada para uma data.
         
         Args:
             date_ref: Data de referência
-            
+        
         Returns:
             Lista de resultados de validação
         """
         logger.info(f"Iniciando validação cruzada para {date_ref}")
         
         # 1. Carregar fatos
-        facts = self.load_measurement_facts(date_ref)
-        logger.info(f"Carregados {len(facts)} fatos de medição")
+        store = self.load_fact_store(date_ref, date_ref)
+        logger.info(f"Carregados {len(store)} fatos de medição")
         
-        if not facts:
+        if not len(store):
             logger.warning("Nenhum fato encontrado para validação")
             return []
         
-        # 2. Agrupar por chave
-        groups = self.group_facts(facts)
-        logger.info(f"Agrupados em {len(groups)} grupos")
-        
-        # 3. Validar cada grupo
-        results = []
-        for key, group_facts in groups.items():
-            result = self.validate_group(key, group_facts)
-            results.append(result)
+        # 2. Agrupar e validar
+        results = self.validate_store(store)
         
-        # 4. Persistir resultados
+        # 3. Persistir resultados
         self._save_results(results)
         
-        # 5. Atualizar histórico de inconsistências
+        # 4. Atualizar histórico de inconsistências
         self._update_inconsistency_history(date_ref, results)
         
         # Estatísticas
@@ -424,38 +904,77 @@ class CrossValidator:
         
         return results
     
+    def validate_range(self, start_date: date, end_date: date) -> Dict[date, List[ValidationResult]]:
+        """
+        Executa validação cruzada para um período.
+        
+        Os fatos do período são carregados de uma vez (uma consulta por
+        fonte), os resultados gravados numa única transação e o histórico
+        de inconsistências atualizado em ordem cronológica numa só
+        passada.
+        
+        Returns:
+            Resultados por data (lista vazia para datas sem fatos)
+        """
+        logger.info(f"Iniciando validação cruzada para {start_date} a {end_date}")
+        
+        store = self.load_fact_store(start_date, end_date)
+        logger.info(f"Carregados {len(store)} fatos em {len(store.dates())} datas")
+        
+        results_by_date = {}
+        current = start_date
+        while current <= end_date:
+            results_by_date[current] = []
+            current += timedelta(days=1)
+        
+        # Grupos incluem a data: uma validação para o período inteiro
+        for result in self.validate_store(store):
+            results_by_date[result.date_ref].append(result)
+        
+        all_results = [r for results in results_by_date.values() for r in results]
+        if all_results:
+            self._save_results(all_results)
+            self._update_inconsistency_history_range(results_by_date)
+        
+        stats = defaultdict(int)
+        for r in all_results:
+            stats[r.classification.value] += 1
+        
+        logger.info(f"Validação concluída: {dict(stats)}")
+        
+        return results_by_date
+    
     def _save_results(self, results: List[ValidationResult]) -> None:
         """Persiste resultados no banco."""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            for result in results:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO cross_validation_result
-                    (asset_id, date_ref, time_window, variable_code,
-                     value_excel, value_xml, value_pdf, value_txt,
-                     sources_available, sources_count, classification,
-                     max_deviation_abs, max_deviation_pct, tolerance_applied,
-                     comparison_details)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    result.asset_id,
-                    result.date_ref.isoformat(),
-                    result.time_window.value,
-                    result.variable_code,
-                    result.values_by_source.get(SourceType.EXCEL),
-                    result.values_by_source.get(SourceType.XML),
-                    result.values_by_source.get(SourceType.PDF),
-                    result.values_by_source.get(SourceType.TXT),
-                    json.dumps([s.value for s in result.sources_available]),
-                    len(result.sources_available),
-                    result.classification.value,
-                    result.max_deviation_abs,
-                    result.max_deviation_pct,
-                    result.tolerance_applied,
-                    json.dumps(result.comparison_details)
-                ))
+            cursor.executemany("""
+                INSERT OR REPLACE INTO cross_validation_result
+                (asset_id, date_ref, time_window, variable_code,
+                 value_excel, value_xml, value_pdf, value_txt,
+                 sources_available, sources_count, classification,
+                 max_deviation_abs, max_deviation_pct, tolerance_applied,
+                 comparison_details)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                result.asset_id,
+                result.date_ref.isoformat(),
+                result.time_window.value,
+                result.variable_code,
+                result.values_by_source.get(SourceType.EXCEL),
+                result.values_by_source.get(SourceType.XML),
+                result.values_by_source.get(SourceType.PDF),
+                result.values_by_source.get(SourceType.TXT),
+                json.dumps([s.value for s in result.sources_available]),
+                len(result.sources_available),
+                result.classification.value,
+                result.max_deviation_abs,
+                result.max_deviation_pct,
+                result.tolerance_applied,
+                json.dumps(result.comparison_details)
+            ) for result in results])
             
             conn.commit()
         finally:
@@ -463,56 +982,31 @@ class CrossValidator:
     
     def _update_inconsistency_history(self, date_ref: date, results: List[ValidationResult]) -> None:
         """Atualiza histórico de inconsistências para gatilho de desenquadramento."""
+        self._update_inconsistency_history_range({date_ref: results})
+    
+    def _update_inconsistency_history_range(self, results_by_date: Dict[date, List[ValidationResult]]) -> None:
+        """
+        Atualiza o histórico de inconsistências para várias datas, em
+        ordem crescente, numa única transação (ver InconsistencyTracker).
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            for result in results:
-                if result.classification == ValidationClassification.INCONSISTENTE:
-                    # Verificar se já existe histórico
-                    cursor.execute("""
-                        SELECT id, first_occurrence, last_occurrence, consecutive_days
-                        FROM inconsistency_history
-                        WHERE asset_id = ? AND variable_code = ? AND status = 'ACTIVE'
-                    """, (result.asset_id, result.variable_code))
-                    
-                    row = cursor.fetchone()
+            tracker = InconsistencyTracker(cursor)
+            
+            for date_ref in sorted(results_by_date):
+                for result in results_by_date[date_ref]:
+                    if result.classification == ValidationClassification.INCONSISTENTE:
+                        escalated = tracker.inconsistent(result.asset_id, result.variable_code, date_ref)
+                        if escalated:
+                            self._trigger_nonconformance(cursor, result, escalated.history_id)
                     
-                    if row:
-                        # Atualizar existente
-                        last_date = datetime.strptime(row[2], "%Y-%m-%d").date()
-                        
-                        # Verificar se é dia consecutivo
-                        if date_ref - last_date == timedelta(days=1):
-                            new_consecutive = row[3] + 1
-                        else:
-                            new_consecutive = 1
-                        
-                        cursor.execute("""
-                            UPDATE inconsistency_history
-                            SET last_occurrence = ?, consecutive_days = ?, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (date_ref.isoformat(), new_consecutive, row[0]))
-                        
-                        # Verificar gatilho de desenquadramento (10 dias)
-                        if new_consecutive >= 10:
-                            self._trigger_nonconformance(cursor, result, row[0])
-                    else:
-                        # Criar novo registro
-                        cursor.execute("""
-                            INSERT INTO inconsistency_history
-                            (asset_id, variable_code, first_occurrence, last_occurrence, consecutive_days, status)
-                            VALUES (?, ?, ?, ?, 1, 'ACTIVE')
-                        """, (result.asset_id, result.variable_code, date_ref.isoformat(), date_ref.isoformat()))
-                
-                elif result.classification in [ValidationClassification.CONSISTENTE, ValidationClassification.ACEITAVEL]:
-                    # Resolver inconsistências ativas se agora está OK
-                    cursor.execute("""
-                        UPDATE inconsistency_history
-                        SET status = 'RESOLVED', updated_at = CURRENT_TIMESTAMP
-                        WHERE asset_id = ? AND variable_code = ? AND status = 'ACTIVE'
-                    """, (result.asset_id, result.variable_code))
+                    elif result.classification in [ValidationClassification.CONSISTENTE, ValidationClassification.ACEITAVEL]:
+                        # Resolver inconsistências ativas se agora está OK
+                        tracker.resolved(result.asset_id, result.variable_code, date_ref)
             
+            tracker.flush()
             conn.commit()
         finally:
             conn.close()
@@ -535,18 +1029,11 @@ class CrossValidator:
             result.date_ref.isoformat(),
             datetime.now().isoformat(),
             result.variable_code,
-            f"Inconsistência persistente por 10+ dias. Desvio: {result.max_deviation_pct:.2f}%",
+            f"Inconsistência persistente por {NONCONFORMANCE_DAYS}+ dias. Desvio: {result.max_deviation_pct:.2f}%",
             (result.date_ref + timedelta(days=10)).isoformat(),
             (result.date_ref + timedelta(days=30)).isoformat()
         ))
         
-        # Atualizar histórico
-        cursor.execute("""
-            UPDATE inconsistency_history
-            SET status = 'ESCALATED', updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (history_id,))
-        
         logger.warning(f"DESENQUADRAMENTO: {unique_id} - {result.variable_code}")
     
     def get_validation_summary(self, days: int = 7) -> Dict:
@@ -587,7 +1074,7 @@ class CrossValidator:
                 SELECT COUNT(*) FROM inconsistency_history WHERE status = 'ESCALATED'
             """)
             summary['desenquadramentos'] = cursor.fetchone()[0]
-            
+        
         finally:
             conn.close()
         
@@ -608,29 +1095,20 @@ def validate_date_range(db_path: str, start_date: date, end_date: date,
                         installation_id: int = 1) -> Dict[date, List[ValidationResult]]:
     """Valida range de datas."""
     validator = CrossValidator(db_path, installation_id)
-    results = {}
-    
-    current = start_date
-    while current <= end_date:
-        results[current] = validator.validate_date(current)
-        current += timedelta(days=1)
-    
-    return results
+    return validator.validate_range(start_date, end_date)
 
 
 def reprocess_validation(db_path: str, days: int = 30, installation_id: int = 1) -> Dict:
-    """Reprocessa validações dos últimos N dias."""
+    """Reprocessa validações dos últimos N dias (em ordem cronológica)."""
     validator = CrossValidator(db_path, installation_id)
     
-    stats = {'processed': 0, 'results': 0}
+    today = date.today()
+    results = validator.validate_range(today - timedelta(days=days - 1), today)
     
-    for i in range(days):
-        d = date.today() - timedelta(days=i)
-        results = validator.validate_date(d)
-        stats['processed'] += 1
-        stats['results'] += len(results)
-    
-    return stats
+    return {
+        'processed': len(results),
+        'results': sum(len(r) for r in results.values())
+    }
 
 
 # ============================================================================
@@ -4,6 +4,7 @@ Reconciliação Σ(24 Hourly) ↔ Daily
 
 Baseado no PRD Pipeline Diário SGM-FM v6 - Passo 4
 """
+import sys
 import sqlite3
 import json
 import logging
@@ -14,6 +15,12 @@ from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from validators.comparison_kernel import (
+    compare_tolerance_band, STATUS_OK, STATUS_WARN, STATUS_FAIL, STATUS_INCOMPLETE
+)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -44,6 +51,14 @@ RECONCILIATION_METRICS = [
     ('pvt_ref_vol_oil_sm3', 'PVT reference volume - Oil'),
 ]
 
+# Código do kernel de comparação -> status
+KERNEL_STATUS = {
+    STATUS_OK: ReconciliationStatus.OK,
+    STATUS_WARN: ReconciliationStatus.WARN,
+    STATUS_FAIL: ReconciliationStatus.FAIL,
+    STATUS_INCOMPLETE: ReconciliationStatus.INCOMPLETE,
+}
+
 # Tolerâncias padrão (PRD: max(0.01 t, 0.0005 * daily) = 0.05%)
 DEFAULT_TOLERANCE = {
     'absolute': 0.01,      # 0.01 t (10 kg)
@@ -107,6 +122,9 @@ class ReconciliationEngine:
         self.db_path = db_path
         self.installation_id = installation_id
         self.tolerance = self._load_tolerance()
+        
+        # asset_id -> asset_tag (carregado uma vez por engine)
+        self._asset_tags: Optional[Dict[int, str]] = None
     
     def _load_tolerance(self) -> Dict[str, float]:
         """Carrega tolerância do banco ou usa padrão."""
@@ -153,12 +171,7 @@ class ReconciliationEngine:
             
             records = [dict(row) for row in cursor.fetchall()]
             
-            # Identificar horas faltantes
-            found_hours = {r['hour_of_day'] for r in records}
-            expected_hours = set(range(24))
-            missing_hours = sorted(expected_hours - found_hours)
-            
-            return records, missing_hours
+            return records, self._missing_hours(records)
             
         finally:
             conn.close()
@@ -182,6 +195,61 @@ class ReconciliationEngine:
         finally:
             conn.close()
     
+    @staticmethod
+    def _missing_hours(hourly_records: List[Dict]) -> List[int]:
+        """Horas (0-23) sem registro hourly."""
+        found_hours = {r['hour_of_day'] for r in hourly_records}
+        expected_hours = set(range(24))
+        return sorted(expected_hours - found_hours)
+    
+    def _get_asset_tags(self) -> Dict[int, str]:
+        """Mapa asset_id -> asset_tag do asset_registry (cacheado)."""
+        if self._asset_tags is None:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                self._asset_tags = dict(conn.execute("SELECT id, asset_tag FROM asset_registry"))
+            finally:
+                conn.close()
+        return self._asset_tags
+    
+    def _asset_tag(self, asset_id: int) -> str:
+        return self._get_asset_tags().get(asset_id, f"ASSET_{asset_id}")
+    
+    def _load_range(self, start_date: date, end_date: date
+                    ) -> Tuple[Dict[Tuple[int, str], List[Dict]], Dict[Tuple[int, str], Dict]]:
+        """
+        Carrega hourly e daily do período em duas consultas.
+        
+        Returns:
+            (hourly por (asset_id, report_date), daily por (asset_id, report_date))
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        
+        try:
+            hourly = defaultdict(list)
+            cursor.execute("""
+                SELECT *
+                FROM mpfm_hourly
+                WHERE report_date BETWEEN ? AND ?
+                ORDER BY asset_id, report_date, hour_of_day
+            """, (start_date.isoformat(), end_date.isoformat()))
+            for row in cursor:
+                hourly[(row['asset_id'], row['report_date'])].append(dict(row))
+            
+            cursor.execute("""
+                SELECT *
+                FROM mpfm_daily
+                WHERE report_date BETWEEN ? AND ?
+            """, (start_date.isoformat(), end_date.isoformat()))
+            daily = {(row['asset_id'], row['report_date']): dict(row) for row in cursor}
+            
+            return hourly, daily
+            
+        finally:
+            conn.close()
+    
     def _sum_hourly_metrics(self, hourly_records: List[Dict]) -> Dict[str, float]:
         """Soma métricas dos registros hourly."""
         sums = {}
@@ -200,179 +268,163 @@ class ReconciliationEngine:
         
         return sums
     
+    def compare_metrics(self, hourly_sums: List[Dict[str, Optional[float]]],
+                        daily_records: List[Dict]) -> List[List[MetricComparison]]:
+        """
+        Compara todas as métricas de vários asset/dia de uma vez.
+        
+        Args:
+            hourly_sums: Somas hourly por asset/dia (ver _sum_hourly_metrics)
+            daily_records: Registros daily na mesma ordem
+            
+        Returns:
+            Uma lista de MetricComparison (ordem de RECONCILIATION_METRICS)
+            por asset/dia
+        """
+        names = [metric for metric, _ in RECONCILIATION_METRICS]
+        sums = [[row.get(metric) for metric in names] for row in hourly_sums]
+        daily = [[row.get(metric) for metric in names] for row in daily_records]
+        
+        arrays = compare_tolerance_band(sums, daily, self.tolerance['absolute'],
+                                        self.tolerance['relative'])
+        delta_abs, delta_pct, tolerance, status = arrays.to_lists()
+        
+        return [
+            [
+                MetricComparison(
+                    metric_name=metric,
+                    sum_hourly=sums[i][j],
+                    daily_value=daily[i][j],
+                    delta_abs=delta_abs[i][j],
+                    delta_pct=delta_pct[i][j],
+                    tolerance_applied=tolerance[i][j],
+                    status=KERNEL_STATUS[status[i][j]]
+                )
+                for j, metric in enumerate(names)
+            ]
+            for i in range(len(sums))
+        ]
+    
     def _compare_metric(self, metric_name: str, sum_hourly: Optional[float], 
                         daily_value: Optional[float]) -> MetricComparison:
         """Compara uma métrica específica."""
-        
-        # Casos especiais
-        if sum_hourly is None and daily_value is None:
-            return MetricComparison(
-                metric_name=metric_name,
-                sum_hourly=None,
-                daily_value=None,
-                delta_abs=None,
-                delta_pct=None,
-                tolerance_applied=0,
-                status=ReconciliationStatus.OK
-            )
-        
-        if sum_hourly is None or daily_value is None:
-            return MetricComparison(
-                metric_name=metric_name,
-                sum_hourly=sum_hourly,
-                daily_value=daily_value,
-                delta_abs=None,
-                delta_pct=None,
-                tolerance_applied=0,
-                status=ReconciliationStatus.INCOMPLETE
-            )
-        
-        # Calcular delta
-        delta_abs = abs(sum_hourly - daily_value)
-        
-        if daily_value != 0:
-            delta_pct = delta_abs / abs(daily_value) * 100
-        elif sum_hourly != 0:
-            delta_pct = delta_abs / abs(sum_hourly) * 100
-        else:
-            delta_pct = 0
-        
-        # Calcular tolerância: max(0.01 t, 0.05% do daily)
-        tolerance = max(
-            self.tolerance['absolute'],
-            abs(daily_value) * self.tolerance['relative']
-        )
-        
-        # Determinar status
-        if delta_abs <= tolerance:
-            status = ReconciliationStatus.OK
-        elif delta_abs <= tolerance * 2:
-            status = ReconciliationStatus.WARN
-        else:
-            status = ReconciliationStatus.FAIL
+        arrays = compare_tolerance_band([[sum_hourly]], [[daily_value]],
+                                        self.tolerance['absolute'], self.tolerance['relative'])
+        delta_abs, delta_pct, tolerance, status = arrays.to_lists()
         
         return MetricComparison(
             metric_name=metric_name,
             sum_hourly=sum_hourly,
             daily_value=daily_value,
-            delta_abs=delta_abs,
-            delta_pct=delta_pct,
-            tolerance_applied=tolerance,
-            status=status
+            delta_abs=delta_abs[0][0],
+            delta_pct=delta_pct[0][0],
+            tolerance_applied=tolerance[0][0],
+            status=KERNEL_STATUS[status[0][0]]
         )
     
-    def reconcile(self, asset_id: int, report_date: date) -> ReconciliationResult:
+    def _build_results(self, items: List[Tuple[int, date, List[Dict], Optional[Dict]]]
+                       ) -> List[ReconciliationResult]:
         """
-        Executa reconciliação para um asset/dia.
+        Reconcilia em memória vários asset/dia já carregados.
         
         Args:
-            asset_id: ID do asset
-            report_date: Data do relatório
+            items: (asset_id, report_date, registros hourly, registro daily)
             
         Returns:
-            ReconciliationResult com detalhes da reconciliação
+            Um ReconciliationResult por item, na mesma ordem
         """
-        # Obter asset_tag
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT asset_tag FROM asset_registry WHERE id = ?", (asset_id,))
-        row = cursor.fetchone()
-        asset_tag = row[0] if row else f"ASSET_{asset_id}"
-        conn.close()
-        
-        # Obter dados
-        hourly_records, missing_hours = self._get_hourly_data(asset_id, report_date)
-        daily_record = self._get_daily_data(asset_id, report_date)
-        
-        # Inicializar resultado
-        quality_flags = []
-        
-        # Verificar completude
-        if len(hourly_records) < 24:
-            quality_flags.append('batch_incomplete')
-        
-        if not daily_record:
-            quality_flags.append('daily_missing')
-        
-        # Se não há dados suficientes
-        if len(hourly_records) == 0 or not daily_record:
-            return ReconciliationResult(
+        results = []
+        comparable = []
+        
+        for asset_id, report_date, hourly_records, daily_record in items:
+            # Verificar completude
+            quality_flags = []
+            if len(hourly_records) < 24:
+                quality_flags.append('batch_incomplete')
+            if not daily_record:
+                quality_flags.append('daily_missing')
+            
+            result = ReconciliationResult(
                 asset_id=asset_id,
-                asset_tag=asset_tag,
+                asset_tag=self._asset_tag(asset_id),
                 report_date=report_date,
                 hourly_count=len(hourly_records),
                 daily_count=1 if daily_record else 0,
-                missing_hours=missing_hours,
+                missing_hours=self._missing_hours(hourly_records),
                 overall_status=ReconciliationStatus.INCOMPLETE,
                 metrics=[],
                 failed_metrics=[],
                 quality_flags=quality_flags
             )
+            results.append(result)
+            
+            # Se não há dados suficientes, fica INCOMPLETE
+            if len(hourly_records) > 0 and daily_record:
+                comparable.append((result, self._sum_hourly_metrics(hourly_records), daily_record))
         
-        # Somar métricas hourly
-        hourly_sums = self._sum_hourly_metrics(hourly_records)
+        if not comparable:
+            return results
         
-        # Comparar cada métrica
-        metrics = []
-        failed_metrics = []
+        # Comparar todas as métricas de todos os asset/dia (kernel colunar)
+        all_metrics = self.compare_metrics([c[1] for c in comparable], [c[2] for c in comparable])
         
-        for metric_name, description in RECONCILIATION_METRICS:
-            comparison = self._compare_metric(
-                metric_name,
-                hourly_sums.get(metric_name),
-                daily_record.get(metric_name)
-            )
-            metrics.append(comparison)
-            
-            if comparison.status == ReconciliationStatus.FAIL:
-                failed_metrics.append(metric_name)
-        
-        # Determinar status geral
-        if failed_metrics:
-            overall_status = ReconciliationStatus.FAIL
-            quality_flags.append('reconciliation_mismatch')
-        elif any(m.status == ReconciliationStatus.WARN for m in metrics):
-            overall_status = ReconciliationStatus.WARN
-        elif missing_hours:
-            overall_status = ReconciliationStatus.WARN
-        else:
-            overall_status = ReconciliationStatus.OK
-        
-        return ReconciliationResult(
-            asset_id=asset_id,
-            asset_tag=asset_tag,
-            report_date=report_date,
-            hourly_count=len(hourly_records),
-            daily_count=1,
-            missing_hours=missing_hours,
-            overall_status=overall_status,
-            metrics=metrics,
-            failed_metrics=failed_metrics,
-            quality_flags=quality_flags
-        )
+        for (result, _, _), metrics in zip(comparable, all_metrics):
+            result.metrics = metrics
+            result.failed_metrics = [m.metric_name for m in metrics if m.status == ReconciliationStatus.FAIL]
+            
+            # Determinar status geral
+            if result.failed_metrics:
+                result.overall_status = ReconciliationStatus.FAIL
+                result.quality_flags.append('reconciliation_mismatch')
+            elif any(m.status == ReconciliationStatus.WARN for m in metrics):
+                result.overall_status = ReconciliationStatus.WARN
+            elif result.missing_hours:
+                result.overall_status = ReconciliationStatus.WARN
+            else:
+                result.overall_status = ReconciliationStatus.OK
+        
+        return results
     
-    def reconcile_all_assets(self, report_date: date) -> List[ReconciliationResult]:
-        """Reconcilia todos os assets para uma data."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def reconcile(self, asset_id: int, report_date: date) -> ReconciliationResult:
+        """
+        Executa reconciliação para um asset/dia.
         
-        # Encontrar todos os assets com dados hourly ou daily nessa data
-        cursor.execute("""
-            SELECT DISTINCT asset_id FROM (
-                SELECT asset_id FROM mpfm_hourly WHERE report_date = ?
-                UNION
-                SELECT asset_id FROM mpfm_daily WHERE report_date = ?
-            )
-        """, (report_date.isoformat(), report_date.isoformat()))
+        Args:
+            asset_id: ID do asset
+            report_date: Data do relatório
+            
+        Returns:
+            ReconciliationResult com detalhes da reconciliação
+        """
+        hourly_records, _ = self._get_hourly_data(asset_id, report_date)
+        daily_record = self._get_daily_data(asset_id, report_date)
         
-        asset_ids = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        return self._build_results([(asset_id, report_date, hourly_records, daily_record)])[0]
+    
+    def reconcile_range(self, start_date: date, end_date: date) -> List[ReconciliationResult]:
+        """
+        Reconcilia todos os assets de um período.
         
-        results = []
-        for asset_id in asset_ids:
-            result = self.reconcile(asset_id, report_date)
-            results.append(result)
-            
+        Hourly e daily do período inteiro vêm em duas consultas; a
+        reconciliação roda em memória. Resultados ordenados por data e
+        asset_id.
+        """
+        hourly, daily = self._load_range(start_date, end_date)
+        
+        keys = sorted(set(hourly) | set(daily), key=lambda k: (k[1], k[0]))
+        items = [
+            (asset_id, date.fromisoformat(report_date), hourly.get((asset_id, report_date), []),
+             daily.get((asset_id, report_date)))
+            for asset_id, report_date in keys
+        ]
+        
+        return self._build_results(items)
+    
+    def reconcile_all_assets(self, report_date: date) -> List[ReconciliationResult]:
+        """Reconcilia todos os assets para uma data."""
+        results = self.reconcile_range(report_date, report_date)
+        
+        for result in results:
             logger.info(
                 f"Reconciliação {result.asset_tag} @ {report_date}: "
                 f"{result.overall_status.value} ({result.hourly_count}/24 hourly)"
@@ -382,25 +434,57 @@ class ReconciliationEngine:
     
     def save_result(self, result: ReconciliationResult) -> int:
         """Salva resultado no banco."""
+        return self.save_results([result])
+    
+    def save_results(self, results: List[ReconciliationResult]) -> int:
+        """
+        Salva vários resultados em uma única transação.
+        
+        Returns:
+            rowid do último resultado gravado
+        """
+        if not results:
+            return 0
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            # Encontrar mpfm_daily_id se existir
+            # mpfm_daily_id por (asset_id, report_date) no período dos resultados
+            dates = [r.report_date.isoformat() for r in results]
             cursor.execute("""
-                SELECT id FROM mpfm_daily WHERE asset_id = ? AND report_date = ?
-            """, (result.asset_id, result.report_date.isoformat()))
-            row = cursor.fetchone()
-            mpfm_daily_id = row[0] if row else None
+                SELECT asset_id, report_date, id FROM mpfm_daily WHERE report_date BETWEEN ? AND ?
+            """, (min(dates), max(dates)))
+            daily_ids = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
             
-            # Calcular somatórios dos hourly
-            sums = {}
-            for metric in result.metrics:
-                if metric.sum_hourly is not None:
-                    sums[f"sum_hourly_{metric.metric_name}"] = metric.sum_hourly
+            rows = []
+            for result in results:
+                # Somatórios e deltas dos hourly por métrica
+                by_name = {m.metric_name: m for m in result.metrics}
+                sums = {name: m.sum_hourly for name, m in by_name.items()}
+                uncorr_hc = by_name.get('uncorr_mass_hc')
+                corr_hc = by_name.get('corr_mass_hc')
+                
+                rows.append((
+                    result.asset_id,
+                    daily_ids.get((result.asset_id, result.report_date.isoformat())),
+                    result.report_date.isoformat(),
+                    sums.get('uncorr_mass_gas'),
+                    sums.get('uncorr_mass_oil'),
+                    sums.get('uncorr_mass_hc'),
+                    sums.get('corr_mass_gas'),
+                    sums.get('corr_mass_oil'),
+                    sums.get('corr_mass_hc'),
+                    uncorr_hc.delta_abs if uncorr_hc else None,
+                    uncorr_hc.delta_pct if uncorr_hc else None,
+                    corr_hc.delta_abs if corr_hc else None,
+                    corr_hc.delta_pct if corr_hc else None,
+                    result.overall_status.value,
+                    json.dumps(result.failed_metrics) if result.failed_metrics else None
+                ))
             
-            # Inserir/atualizar resultado
-            cursor.execute("""
+            # Inserir/atualizar resultados
+            cursor.executemany("""
                 INSERT OR REPLACE INTO reconciliation_result
                 (asset_id, mpfm_daily_id, report_date,
                  sum_hourly_uncorr_gas, sum_hourly_uncorr_oil, sum_hourly_uncorr_hc,
@@ -408,23 +492,7 @@ class ReconciliationEngine:
                  delta_uncorr_hc_abs, delta_uncorr_hc_pct, delta_corr_hc_abs, delta_corr_hc_pct,
                  status, failed_metrics)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                result.asset_id,
-                mpfm_daily_id,
-                result.report_date.isoformat(),
-                sums.get('sum_hourly_uncorr_mass_gas'),
-                sums.get('sum_hourly_uncorr_mass_oil'),
-                sums.get('sum_hourly_uncorr_mass_hc'),
-                sums.get('sum_hourly_corr_mass_gas'),
-                sums.get('sum_hourly_corr_mass_oil'),
-                sums.get('sum_hourly_corr_mass_hc'),
-                next((m.delta_abs for m in result.metrics if m.metric_name == 'uncorr_mass_hc'), None),
-                next((m.delta_pct for m in result.metrics if m.metric_name == 'uncorr_mass_hc'), None),
-                next((m.delta_abs for m in result.metrics if m.metric_name == 'corr_mass_hc'), None),
-                next((m.delta_pct for m in result.metrics if m.metric_name == 'corr_mass_hc'), None),
-                result.overall_status.value,
-                json.dumps(result.failed_metrics) if result.failed_metrics else None
-            ))
+            """, rows)
             
             conn.commit()
             return cursor.lastrowid
@@ -490,8 +558,7 @@ def reconcile_date(db_path: str, report_date: date, save: bool = True) -> List[R
     results = engine.reconcile_all_assets(report_date)
     
     if save:
-        for result in results:
-            engine.save_result(result)
+        engine.save_results(results)
     
     return results
 
@@ -500,15 +567,9 @@ def reconcile_date_range(db_path: str, start_date: date, end_date: date) -> Dict
     """Reconcilia um range de datas."""
     engine = ReconciliationEngine(db_path)
     
-    all_results = []
-    current = start_date
-    
-    while current <= end_date:
-        results = engine.reconcile_all_assets(current)
-        for result in results:
-            engine.save_result(result)
-        all_results.extend(results)
-        current += timedelta(days=1)
+    results = engine.reconcile_range(start_date, end_date)
+    engine.save_results(results)
+    logger.info(f"Reconciliação {start_date} a {end_date}: {len(results)} asset/dia")
     
     return engine.get_summary(start_date, end_date)
 
@@ -388,6 +388,34 @@ export const backendApi = {
     dailyReport: (date_ref: string, format: 'json' | 'csv' | 'excel' = 'json') =>
       backendClient<Record<string, unknown>>(`/api/export/daily-report?date_ref=${date_ref}&format=${format}`),
   },
+
+  // Eventos (SSE) - substitui o polling de alertas ativos e de jobs
+  events: {
+    subscribe: (handlers: BackendEventHandlers): EventSource => {
+      const source = new EventSource(`${BACKEND_URL}/api/events`)
+      const listen = <T>(type: string, handler?: (data: T) => void) => {
+        if (handler) source.addEventListener(type, (e) => handler(JSON.parse((e as MessageEvent).data)))
+      }
+      listen('snapshot', handlers.onSnapshot)
+      listen('alert', handlers.onAlert)
+      listen('job', handlers.onJob)
+      return source
+    },
+  },
+}
+
+/**
+ * Eventos de /api/events (aplicar por id: um evento pode repetir o snapshot)
+ */
+export interface BackendAlertEvent {
+  action: 'created' | 'acknowledged' | 'resolved'
+  alert: BackendAlert
+}
+
+export interface BackendEventHandlers {
+  onSnapshot?: (data: { alerts: BackendAlert[]; jobs: Record<string, unknown>[] }) => void
+  onAlert?: (data: BackendAlertEvent) => void
+  onJob?: (data: Record<string, unknown>) => void
 }
 
 /**